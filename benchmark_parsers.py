@@ -0,0 +1,977 @@
+# benchmark_parsers.py
+# Mikro-Benchmarks für die Log-Parser auf synthetischen Logs.
+# Aufruf: python benchmark_parsers.py [benchmark ...] [--lines N]
+#         (ohne Namen laufen alle Benchmarks)
+
+import os
+import sys
+import gzip
+import time
+import random
+import re
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+import concurrent.futures
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import log_parser
+import oms_log_parser
+import data_processor
+from sample_logs import MONTHS, WEEKDAYS, MV3D_TIMESTAMP_EDGE_FILES, generate_scanner_log, generate_oms_log
+
+# Spitzen-RSS: 'resource' gibt es nur unter Unix, unter Windows optional über psutil
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Registriert eine Benchmark-Funktion unter 'name'."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def _report(label, n_lines, seconds):
+    rate = n_lines / seconds if seconds > 0 else float('inf')
+    print(f"    {label:<28} {seconds:8.2f} s   {rate:12,.0f} Zeilen/s".replace(",", "."))
+    return rate
+
+
+# =============================================================================
+# --- Synthetische Logs ---
+# =============================================================================
+
+# Erzeuger und Grenzfälle liegen in sample_logs.py (auch für die Tests)
+
+
+# =============================================================================
+# --- Scanner: Muster-Dispatcher (user-002) ---
+# =============================================================================
+
+def _legacy_scanner_line(line):
+    """Per-Zeile-Logik VOR dem Schlüsselwort-Index (alle Regex laufen auf jeder Zeile)."""
+    if not log_parser.TS_PATTERN.search(line):
+        return None
+    bag_id_match = log_parser.BAG_ID_PATTERN.search(line)
+    iata_match = log_parser.IATA_PATTERN.search(line)
+    bag_id = bag_id_match.group(1) if bag_id_match else "N/A"
+    raw_iata = "N/A"
+    if iata_match:
+        raw_iata = iata_match.group(1) or iata_match.group(3) or iata_match.group(4)
+    iata = log_parser._normalize_iata(raw_iata)
+    cct_match = log_parser.CCT_PATTERN.search(line)
+    device = cct_match.group(1) if cct_match else "N/A"
+    if bag_id == "N/A" and iata == "N/A":
+        return None
+    ident = iata if iata not in ["N/A", "NO_READ"] else bag_id
+    for pattern, handler in log_parser.SCANNER_PATTERNS:
+        if m := pattern.search(line):
+            return handler(m, ident, bag_id, iata, device)
+    return None
+
+def _dispatched_scanner_line(line):
+    """Per-Zeile-Logik MIT Schlüsselwort-Index (wie in log_parser.iter_scanner_batches)."""
+    if not log_parser.TS_PATTERN.search(line):
+        return None
+    event = log_parser.match_scanner_event(line)
+    if event is None:
+        return None
+    bag_id_match = log_parser.BAG_ID_PATTERN.search(line) if '"0' in line else None
+    iata_match = log_parser.IATA_PATTERN.search(line)
+    bag_id = bag_id_match.group(1) if bag_id_match else "N/A"
+    raw_iata = "N/A"
+    if iata_match:
+        raw_iata = iata_match.group(1) or iata_match.group(3) or iata_match.group(4)
+    iata = log_parser._normalize_iata(raw_iata)
+    cct_match = log_parser.CCT_PATTERN.search(line) if '@CCT' in line else None
+    device = cct_match.group(1) if cct_match else "N/A"
+    if bag_id == "N/A" and iata == "N/A":
+        return None
+    handler, m = event
+    ident = iata if iata not in ["N/A", "NO_READ"] else bag_id
+    return handler(m, ident, bag_id, iata, device)
+
+@benchmark("scanner_dispatch")
+def bench_scanner_dispatch(n_lines, work_dir):
+    path = os.path.join(work_dir, "scanner_bag.log")
+    generate_scanner_log(path, n_lines)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    legacy, t_legacy = _timed(lambda: [_legacy_scanner_line(l) for l in lines])
+    dispatched, t_new = _timed(lambda: [_dispatched_scanner_line(l) for l in lines])
+    assert legacy == dispatched, "Dispatcher liefert andere Klartexte als die alte Logik!"
+
+    r_old = _report("vorher (Regex-Kette)", len(lines), t_legacy)
+    r_new = _report("nachher (Schlüsselwort-Index)", len(lines), t_new)
+    print(f"    Faktor: {r_new / r_old:.2f}x")
+
+
+# =============================================================================
+# --- Spaltenweise ID-Extraktion (user-006) ---
+# =============================================================================
+
+@benchmark("batch_extract")
+def bench_batch_extract(n_lines, work_dir):
+    scanner_path = os.path.join(work_dir, "scanner_bag.log")
+    generate_scanner_log(scanner_path, n_lines)
+    per_line, t_line = _timed(log_parser.parse_log_file, scanner_path)
+    batched, t_batch = _timed(log_parser.parse_log_file, scanner_path, batch_extract=True)
+    assert per_line.equals(batched), "Scanner: Batch-Modus liefert andere Daten!"
+    print("  Scanner:")
+    r_old = _report("Zeile für Zeile", n_lines, t_line)
+    r_new = _report("Batch (str.extract)", n_lines, t_batch)
+    print(f"    Faktor: {r_new / r_old:.2f}x")
+
+    oms_path = os.path.join(work_dir, "OMS.log")
+    generate_oms_log(oms_path, n_lines)
+    per_line, t_line = _timed(oms_log_parser.parse_oms_log, oms_path)
+    batched, t_batch = _timed(oms_log_parser.parse_oms_log, oms_path, batch_extract=True)
+    assert per_line.equals(batched), "OMS: Batch-Modus liefert andere Daten!"
+    print("  OMS:")
+    r_old = _report("Zeile für Zeile", n_lines, t_line)
+    r_new = _report("Batch (str.extract)", n_lines, t_batch)
+    print(f"    Faktor: {r_new / r_old:.2f}x")
+
+
+# =============================================================================
+# --- Journey-Sessions (user-009) ---
+# =============================================================================
+
+TRAY_STEPS = [
+    "Plausibilitätsprüfung OK",
+    "Wanne zur System-Warteschlange hinzugefügt",
+    "[PLC] Wanne am Zulauf erkannt (Reader 1/2)",
+    "Entscheidung vom Scanner empfangen: Decision {decision} ({result})",
+    "[PLC] Wanne an der Weiche erkannt (Reader 3/4)",
+    "Wanne ist in Position (Step 250)",
+    "[PLC] Wanne wird aus Warteschlange gelöscht",
+]
+
+def generate_tray_stream(n_rows, n_trays=400, days=3, seed=1):
+    """
+    Synthetischer SPS-Ereignisstrom über mehrere Tage: Wannen laufen mehrfach um,
+    Journeys verschiedener Wannen überlappen sich, vereinzelt gibt es FEHLER-Zeilen.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2025, 3, 1)
+    journey_interval = days * 86400 / max(1, n_rows // len(TRAY_STEPS))
+    timestamps, iatas, texts = [], [], []
+    clock = 0.0
+    while len(timestamps) < n_rows:
+        clock += rnd.expovariate(1 / journey_interval)
+        iata = f"{rnd.randrange(1, n_trays + 1)}"
+        result = rnd.choice(["CLEAR", "REJECT"])
+        t = clock
+        for step in TRAY_STEPS:
+            t += rnd.uniform(1, 20)
+            text = step.format(decision=1 if result == "CLEAR" else 2, result=result)
+            if rnd.random() < 0.002:
+                text = f"FEHLER: Wanne {iata} nicht gefunden"
+            timestamps.append(start + timedelta(seconds=t))
+            iatas.append(iata)
+            texts.append(text)
+    df = pd.DataFrame({"Timestamp": pd.to_datetime(timestamps[:n_rows]).tz_localize("UTC"),
+                       "IATA": iatas[:n_rows], "Klartext": texts[:n_rows]})
+    return df.sort_values(by="Timestamp").reset_index(drop=True)
+
+def _legacy_plc_journeys(raw_plc_df):
+    """SPS-Konsolidierung VOR dem JourneySessionizer (Listen pro Journey + Python-Funktionen)."""
+    def find_decision(text_list):
+        for text in reversed(text_list):
+            if "FEHLER:" in text:
+                return "ERROR"
+            match = re.search(r"Entscheidung vom Scanner empfangen: Decision \d \((CLEAR|REJECT)\)", text)
+            if match:
+                return match.group(1)
+        return "N/A"
+
+    def find_first_step(text_list):
+        for text in text_list:
+            if "Plausibilitätsprüfung" in text:
+                return text
+        return text_list[0] if text_list else "N/A"
+
+    raw_plc_df = raw_plc_df.sort_values(by=['IATA', 'Timestamp']).reset_index(drop=True)
+    time_diff = raw_plc_df.groupby('IATA')['Timestamp'].diff()
+    is_new_journey = ((time_diff > timedelta(minutes=5)) | (raw_plc_df['IATA'] != raw_plc_df['IATA'].shift())
+                      | raw_plc_df['Klartext'].str.contains("FEHLER:", na=False))
+    raw_plc_df['JourneyID'] = is_new_journey.cumsum()
+    summary_df = raw_plc_df.groupby('JourneyID').agg(
+        Timestamp=('Timestamp', 'first'), IATA=('IATA', 'first'), _KlartextList=('Klartext', list)
+    ).reset_index()
+    summary_df['Decision'] = summary_df['_KlartextList'].apply(find_decision)
+    summary_df['Klartext'] = summary_df['_KlartextList'].apply(find_first_step)
+    summary_df = summary_df.drop(columns=['_KlartextList'])
+    return summary_df.sort_values(by="Timestamp").reset_index(drop=True), raw_plc_df
+
+def _same_partition(ids_a, ids_b):
+    """True, wenn beide ID-Spalten dieselben Zeilen zu Journeys zusammenfassen (Nummerierung egal)."""
+    pairs = pd.DataFrame({"a": ids_a.to_numpy(), "b": ids_b.to_numpy()}).drop_duplicates()
+    return pairs["a"].is_unique and pairs["b"].is_unique
+
+@benchmark("sessionize")
+def bench_sessionize(n_lines, work_dir):
+    stream = generate_tray_stream(n_lines)
+
+    legacy, t_legacy = _timed(_legacy_plc_journeys, stream.copy())
+    engine, t_engine = _timed(data_processor.consolidate_plc_journeys, stream.copy())
+    assert legacy[0].equals(engine[0]), "SPS: JourneySessionizer liefert andere Journeys!"
+    print(f"  SPS-Konsolidierung ({len(engine[0]):,} Journeys):".replace(",", "."))
+    r_old = _report("vorher (Listen + apply)", n_lines, t_legacy)
+    r_new = _report("nachher (Sessionizer)", n_lines, t_engine)
+    print(f"    Faktor: {r_new / r_old:.2f}x")
+
+    # Inkrementell: Tag für Tag anhängen statt jedes Mal alles neu zu sortieren
+    days = [day for _, day in stream.groupby(stream["Timestamp"].dt.date)]
+    full, t_full = _timed(data_processor.JourneySessionizer().assign, stream)
+    sessionizer = data_processor.JourneySessionizer()
+    parts = [sessionizer.assign(day) for day in days[:-1]]
+    last_day, t_last_day = _timed(sessionizer.assign, days[-1])
+    parts.append(last_day)
+    incremental = pd.concat(parts).sort_index()
+    assert _same_partition(full.sort_index()["JourneyID"], incremental["JourneyID"]), \
+        "Inkrementelle Sessions weichen von der Gesamtberechnung ab!"
+    print(f"  Inkrementell ({len(days)} Tage):")
+    _report("alles neu zuordnen", n_lines, t_full)
+    _report("nur letzten Tag anhängen", len(days[-1]), t_last_day)
+
+
+# =============================================================================
+# --- OMS: Klassifizierung (user-011) ---
+# =============================================================================
+
+def _legacy_oms_klartext(line, ident):
+    """Klartext-Logik VOR classify_oms_line (alle Muster, Ignorier-Prüfung in drei Zweigen)."""
+    klartext = None
+    for pattern, translation_func in oms_log_parser.EVENT_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            klartext = translation_func(match, ident) if translation_func else None
+            break
+    if klartext is None:
+        # Die Ignorier-Muster waren Lambdas, 'func is None' traf nie zu: Fallback-Text auch für sie
+        message_match = oms_log_parser.OMS_MESSAGE_PATTERN.search(line)
+        if message_match:
+            klartext = f"[OMS] {message_match.group(1).strip()}"
+        else:
+            ts_prefix_match = re.match(r'([A-Z][a-z]{2}\s+[A-Z][a-z]{2}\s+\d{2}\s+\d{2}:\d{2}:\d{2})\.\d+\s+(.*)', line)
+            if ts_prefix_match:
+                klartext = f"[OMS-RAW] {ts_prefix_match.group(2).strip()}"
+            else:
+                klartext = f"[OMS-RAW] {line.strip()}"
+    return klartext
+
+@benchmark("oms_classify")
+def bench_oms_classify(n_lines, work_dir):
+    path = os.path.join(work_dir, "OMS.log")
+    generate_oms_log(path, n_lines)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    legacy, t_legacy = _timed(lambda: [_legacy_oms_klartext(l, "0123") for l in lines])
+    classified, t_new = _timed(lambda: [oms_log_parser.classify_oms_line(l, "0123") for l in lines])
+    ignored = 0
+    for old_text, (outcome, new_text) in zip(legacy, classified):
+        if outcome == oms_log_parser.OMS_IGNORED:
+            ignored += 1
+        else:
+            assert old_text == new_text, f"Klassifizierung weicht ab: {old_text!r} != {new_text!r}"
+
+    r_old = _report("vorher (Regex-Kette)", len(lines), t_legacy)
+    r_new = _report("nachher (Klassifizierung)", len(lines), t_new)
+    print(f"    Faktor: {r_new / r_old:.2f}x")
+    print(f"    Ignoriert: {ignored:,} Zeilen (bisher als Fallback-Text übernommen)".replace(",", "."))
+
+
+@benchmark("oms_filters")
+def bench_oms_filters(n_lines, work_dir):
+    path = os.path.join(work_dir, "OMS.log")
+    generate_oms_log(path, n_lines)
+    stats = oms_log_parser.OmsFilterStats()
+    _, seconds = _timed(oms_log_parser.parse_oms_log, path, stats=stats)
+    _report("gestufte Filter", n_lines, seconds)
+    for stage in oms_log_parser.FILTER_STAGES:
+        print(f"    {stage:<12} erreicht {stats.reached(stage):>10,}   verworfen {stats.rejected[stage]:>10,}".replace(",", "."))
+    print(f"    Einträge: {stats.records:,}".replace(",", "."))
+
+
+@benchmark("oms_parallel")
+def bench_oms_parallel(n_lines, work_dir):
+    path = os.path.join(work_dir, "OMS.log")
+    generate_oms_log(path, n_lines)
+    workers = os.cpu_count() or 1
+    sequential, t_seq = _timed(oms_log_parser.parse_oms_log, path)
+    parallel, t_par = _timed(oms_log_parser.parse_oms_log, path, workers=max(2, workers))
+    assert sequential.equals(parallel), "OMS: Paralleler Modus liefert andere Daten!"
+    r_old = _report("sequentiell", n_lines, t_seq)
+    r_new = _report(f"{max(2, workers)} Prozesse", n_lines, t_par)
+    print(f"    Faktor: {r_new / r_old:.2f}x (CPU-Kerne: {workers})")
+
+
+# =============================================================================
+# --- SPS: Streaming-Journey-Parser (user-014) ---
+# =============================================================================
+
+PLC_JOURNEY_LINES = [
+    "Tray with RFID: {rfid} added to queue, key: {key}",
+    "RFID READER 1 data ready, ID {rfid}",
+    "New tray INFEED -0 ID: {rfid}",
+    "NEW_INFO_RFID=1, EXAMINED: {rfid}, key: {key}, decision: {decision}",
+    "RFID READER 3 data ready, ID {rfid}",
+    "NEW_TRAY_DIVERTER, key: {key}",
+    "Diverter {result_lower} -0 Step 250, key: {key}",
+    "Diverter {result_lower} -0 Step 700, key: {key}",
+    "Result {result} for tray: {rfid}",
+    "Diverter {result_lower} -0 Step 2000, key: {key}",
+    "Deleting tray with key{key}",
+    "CLEARSCAN_BELT_STOP",
+]
+PLC_NOISE_LINES = [
+    "Diverter clear -0 Step 0",
+    "Diverter reject -0 Step 50",
+    "Heartbeat OK; Cycle 12",
+    "Belt speed; 0.35",
+    "CLEARSCAN_BELT_FORWARD",
+]
+
+def generate_plc_log(path, n_lines, n_trays=400, seed=1):
+    """
+    Synthetische PlcLog.csv (Zeitstempel;Level;Text): überlappende Wannen-Durchläufe mit
+    fortlaufenden Keys, viel Rauschen und vereinzelt Key-Zeilen VOR der 'added to queue'-Zeile.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2025, 3, 1)
+    events = []
+    clock, key = 0.0, 17000
+    while len(events) < n_lines:
+        clock += rnd.uniform(2, 8)
+        key += 1
+        iata = rnd.randrange(1, n_trays + 1)
+        result = rnd.choice(["CLEAR", "REJECT"])
+        fields = dict(rfid=f"000L{iata:04d}", key=key, decision=1 if result == "CLEAR" else 2,
+                      result=result, result_lower=result.lower())
+        # Vereinzelt kommt 'added to queue' erst nach den ersten Key-Zeilen
+        late_queue = rnd.uniform(4, 12) if rnd.random() < 0.05 else 0
+        t = clock
+        for step, template in enumerate(PLC_JOURNEY_LINES):
+            t += rnd.uniform(0.5, 4) if step else 0
+            events.append((t + (late_queue if step == 0 else 0), template.format(**fields)))
+            for _ in range(rnd.randrange(0, 4)):
+                events.append((t + rnd.uniform(0, 1), rnd.choice(PLC_NOISE_LINES)))
+    events.sort(key=lambda event: event[0])
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for t, text in events[:n_lines]:
+            ts = start + timedelta(seconds=t)
+            millis = f".{ts.microsecond // 1000:03d}" if rnd.random() < 0.9 else ""
+            f.write(f"{ts:%Y-%m-%dT%H:%M:%S}{millis}Z;INFO;{text}\n")
+
+def _legacy_plc_parse_log(file_path):
+    """plclog_journey_parser.parse_log VOR dem Streaming (2 Phasen, alle Zeilen im Speicher)."""
+    import plclog_journey_parser as plc
+    preliminary_events = []
+    key_to_iata_map = {}
+    with open(file_path, 'rb') as f:
+        for raw_line in f:
+            original_log = raw_line.decode('utf-8', errors='ignore').strip()
+            if not original_log: continue
+            normalized_line = original_log.replace(',', ' ').replace(';', ' ').replace('\t', ' ')
+            infotext = re.sub(r'\s+', ' ', normalized_line).strip()
+            timestamp_match = plc.TIMESTAMP_PATTERN.search(infotext)
+            if not timestamp_match:
+                continue
+            timestamp = pd.to_datetime(timestamp_match.group(1)).tz_localize(None)
+            iata = plc._find_iata_in_line(infotext)
+            key = plc._find_key_in_line(infotext)
+            preliminary_events.append((timestamp, iata, key, infotext, original_log))
+            if key and iata and iata != "N/A" and re.search(r'added\s+to\s+queue', infotext):
+                key_to_iata_map[key] = iata
+
+    final_records = []
+    for timestamp, final_iata, key, infotext, original_log in preliminary_events:
+        if (final_iata is None or final_iata == "N/A") and key:
+            final_iata = key_to_iata_map.get(key, "N/A")
+        if final_iata is None or final_iata == "N/A":
+            continue
+        klartext = plc._get_klartext_for_event(infotext)
+        if not klartext:
+            continue
+        final_records.append({"Timestamp": timestamp, "Source": "PLC", "IATA": final_iata,
+                              "Klartext": klartext, "OriginalLog": original_log})
+    df = pd.DataFrame(final_records).drop_duplicates(subset=["IATA", "Klartext"])
+    return df.sort_values(by="Timestamp", kind="stable").reset_index(drop=True)
+
+@benchmark("plc_stream")
+def bench_plc_stream(n_lines, work_dir):
+    import plclog_journey_parser
+    path = os.path.join(work_dir, "PlcLog.csv")
+    generate_plc_log(path, n_lines)
+    legacy, t_legacy = _timed(_legacy_plc_parse_log, path)
+    streamed, t_stream = _timed(plclog_journey_parser.parse_log, path)
+    legacy["Timestamp"] = legacy["Timestamp"].astype(streamed["Timestamp"].dtype)
+    pd.testing.assert_frame_equal(legacy, streamed)
+    r_old = _report("vorher (2 Phasen)", n_lines, t_legacy)
+    r_new = _report("nachher (Streaming)", n_lines, t_stream)
+    print(f"    Faktor: {r_new / r_old:.2f}x   ({len(streamed):,} Events)".replace(",", "."))
+
+
+# =============================================================================
+# --- SPS: Regel-Profile der Journey-Engine (user-017) ---
+# =============================================================================
+
+def _peak_rss_mb():
+    """Spitzen-RSS des aktuellen Prozesses in MB (None, wenn nicht ermittelbar)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024 # macOS: Bytes, Linux: KB
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+def _run_plc_profile(path, profile):
+    """Läuft in einem frischen Prozess, damit der Spitzen-RSS nur zu diesem Profil gehört."""
+    import plclog_journey_parser
+    rss_start = _peak_rss_mb()
+    df, seconds = _timed(plclog_journey_parser.parse_log, path, profile=profile)
+    rss_peak = _peak_rss_mb()
+    resolved = 0
+    if not df.empty:
+        journeys, _ = data_processor.consolidate_plc_journeys(df)
+        resolved = int((~journeys["IATA"].isin(["N/A", "ERROR"]) & journeys["IATA"].notna()).sum())
+    return seconds, rss_start, rss_peak, len(df), resolved
+
+@benchmark("plc_profiles")
+def bench_plc_profiles(n_lines, work_dir):
+    import plclog_journey_parser
+    path = os.path.join(work_dir, "PlcLog.csv")
+    generate_plc_log(path, n_lines)
+    results = {}
+    for profile, rules in plclog_journey_parser.PLC_PROFILES.items():
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            seconds, rss_start, rss_peak, n_events, resolved = pool.submit(_run_plc_profile, path, profile).result()
+        rate = _report(f"{profile} ({rules['version']})", n_lines, seconds)
+        rss = (f"{rss_peak:,.0f} MB (+{rss_peak - rss_start:,.0f} MB beim Parsen)" if rss_peak is not None
+               else "n/a (weder resource noch psutil)")
+        print(f"      Spitzen-RSS: {rss}".replace(",", "."))
+        print(f"      {n_events:,} Events / {resolved:,} Journeys mit IATA".replace(",", "."))
+        results[profile] = rate
+    fastest = max(results, key=results.get)
+    print(f"    Schnellstes Profil: {fastest} (Standard: {plclog_journey_parser.DEFAULT_PROFILE})")
+
+
+# =============================================================================
+# --- ISO-Zeitstempel (user-015) ---
+# =============================================================================
+
+@benchmark("iso_timestamps")
+def bench_iso_timestamps(n_lines, work_dir):
+    import log_timestamps
+    start = datetime(2025, 3, 1)
+    raw = [f"{start + timedelta(milliseconds=37 * i):%Y-%m-%dT%H:%M:%S.%f}"[:23] + "Z" for i in range(n_lines)]
+    scalar, t_scalar = _timed(lambda: [pd.to_datetime(r).tz_localize(None) for r in raw[:n_lines // 10]])
+    sliced, t_sliced = _timed(lambda: [log_timestamps.parse_iso_fixed(r) for r in raw])
+    column, t_column = _timed(log_timestamps.iso_series_to_datetime, raw)
+    assert list(column) == sliced, "ISO: Spalten-Umwandlung weicht vom Schnellweg ab!"
+    assert [ts.to_pydatetime() for ts in scalar] == sliced[:len(scalar)], "ISO: Schnellweg weicht ab!"
+    r_old = _report("pd.to_datetime pro Zeile", len(scalar), t_scalar)
+    r_slice = _report("parse_iso_fixed", n_lines, t_sliced)
+    r_column = _report("iso_series_to_datetime", n_lines, t_column)
+    print(f"    Faktor: {r_slice / r_old:.1f}x (Slicing), {r_column / r_old:.1f}x (Spalte)")
+
+
+# =============================================================================
+# --- SPS-Fehler-CSV: Blockweiser Leser (user-016) ---
+# =============================================================================
+
+PLC_ERROR_TEXTS = ['"Motor M12 overload, belt stopped"', 'Light curtain blocked', '"E-Stop pressed"',
+                   'Timeout waiting for tray, position 4', 'Heartbeat']
+
+def generate_plc_error_log(path, n_rows, seed=1):
+    """Synthetische PlcLog_0.csv: Vorspann, Header-Zeile, dann Fehlerzeilen (InfoText teils mit Kommas)."""
+    rnd = random.Random(seed)
+    start = datetime(2025, 3, 1)
+    with open(path, 'w', encoding='utf-8', newline='\r\n') as f:
+        f.write(";Export PlcLog_0\n;Device, CX-5140\n;Timestamp, CmpId, ClassId, ErrorId, InfoId, InfoText\n")
+        for i in range(n_rows):
+            ts = start + timedelta(milliseconds=250 * i)
+            f.write(f"{ts:%Y-%m-%dT%H:%M:%S}Z,{rnd.randrange(1, 40)},{rnd.choice((1, 2, 4, 8, 16))},"
+                    f"{rnd.randrange(1000)},{rnd.randrange(100)},{rnd.choice(PLC_ERROR_TEXTS)}\n")
+
+@benchmark("plc_error_csv")
+def bench_plc_error_csv(n_lines, work_dir):
+    import plclog_csv_parser
+    n_rows = 5 * n_lines # Standard: 5 Mio. Zeilen
+    path = os.path.join(work_dir, "PlcLog_0.csv")
+    generate_plc_error_log(path, n_rows)
+    print(f"    {n_rows:,} CSV-Zeilen".replace(",", "."))
+    header_idx = plclog_csv_parser.find_header_row_error_log(path)
+    per_line, t_line = _timed(plclog_csv_parser._parse_error_lines, path, header_idx, None)
+    columnar, t_columnar = _timed(plclog_csv_parser.parse_error_log, path, header_idx, None)
+    pd.testing.assert_frame_equal(per_line, columnar)
+    r_old = _report("Zeile für Zeile", n_rows, t_line)
+    r_new = _report("blockweise + ClassId-Tabelle", n_rows, t_columnar)
+    print(f"    Faktor: {r_new / r_old:.2f}x   ({len(columnar):,} Fehler-Einträge)".replace(",", "."))
+
+
+# =============================================================================
+# --- BRAVA: Streaming + TRAY_ID-Index (user-019) ---
+# =============================================================================
+
+BRAVA_MESSAGES = [
+    "[TRAY_ID={tray}] Tray entered tunnel",
+    "[TRAY_ID={tray}] Image acquired, 412 slices",
+    "[TRAY_ID={tray}] Final Decision is {decision}",
+    "[TRAY_ID={tray}] Tray left tunnel",
+    "HMI heartbeat ok",
+    "Conveyor speed 0.35 m/s",
+]
+
+def generate_brava_log(path, n_lines, n_trays=2000, seed=1):
+    """Synthetisches BRAVA-TRS-Log: '2025-03-01T00:00:00.123Z <Text>' mit TRAY_IDs und Rauschen."""
+    rnd = random.Random(seed)
+    start = datetime(2025, 3, 1)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for i in range(n_lines):
+            ts = start + timedelta(milliseconds=137 * i)
+            text = rnd.choice(BRAVA_MESSAGES).format(tray=rnd.randrange(1, n_trays + 1),
+                                                    decision=rnd.choice(["CLEAR", "REJECT"]))
+            f.write(f"{ts:%Y-%m-%dT%H:%M:%S}.{ts.microsecond // 1000:03d}Z {text}\n")
+
+def _legacy_brava_parse_log(file_path):
+    """brava_log_parser.parse_log VOR V17 (readlines, re.search pro Zeile)."""
+    from log_timestamps import iso_series_to_datetime
+    records = []
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+    for line in lines:
+        timestamp_match = re.match(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z)', line)
+        if not timestamp_match:
+            continue
+        infotext = line[timestamp_match.end(1):].strip()
+        tray_id_match = re.search(r'\[TRAY_ID=(\d+)\]', infotext)
+        klartext = infotext.strip()
+        decision_match = re.search(r'Final Decision is (\w+)', infotext)
+        if decision_match:
+            klartext = f"Finale Entscheidung: {decision_match.group(1)}"
+        records.append({"Timestamp": timestamp_match.group(1), "Source": "BRAVA",
+                        "IATA": tray_id_match.group(1) if tray_id_match else None,
+                        "Klartext": klartext, "OriginalLog": line.strip()})
+    df = pd.DataFrame(records)
+    df["Timestamp"] = iso_series_to_datetime(df["Timestamp"], utc=True)
+    return df
+
+@benchmark("brava_stream")
+def bench_brava_stream(n_lines, work_dir):
+    import brava_log_parser
+    path = os.path.join(work_dir, "brava_trs.log")
+    generate_brava_log(path, n_lines)
+    legacy, t_legacy = _timed(_legacy_brava_parse_log, path)
+    (streamed, _), t_stream = _timed(brava_log_parser.parse_log, path)
+    pd.testing.assert_frame_equal(legacy, streamed)
+    (lazy, index), t_lazy = _timed(brava_log_parser.load_indexed, path)
+    r_old = _report("vorher (readlines)", n_lines, t_legacy)
+    r_new = _report("nachher (blockweise)", n_lines, t_stream)
+    _report("load_indexed (lazy + kompakt)", n_lines, t_lazy)
+    mb = lambda df: df.memory_usage(deep=True).sum() / (1024 * 1024)
+    print(f"    Faktor: {r_new / r_old:.2f}x   Speicher: {mb(legacy):.1f} MB -> {mb(lazy):.1f} MB (load_indexed)")
+
+    trays = list(index.ranges)[:500]
+    scanned, t_scan = _timed(lambda: [lazy[lazy["IATA"] == tray] for tray in trays])
+    indexed, t_index = _timed(lambda: [index.history(lazy, tray) for tray in trays])
+    assert all(a.equals(b) for a, b in zip(scanned, indexed)), "BRAVA: Index liefert andere Historie!"
+    print(f"    Historie von {len(trays)} Wannen: Spalten-Scan {t_scan:.2f} s, Index {t_index:.3f} s "
+          f"({t_scan / t_index if t_index > 0 else float('inf'):.0f}x)")
+
+
+# =============================================================================
+# --- Parse-Cache (user-018) ---
+# =============================================================================
+
+@benchmark("parse_cache")
+def bench_parse_cache(n_lines, work_dir):
+    import parse_cache
+    path = os.path.join(work_dir, "scanner_bag.log")
+    generate_scanner_log(path, n_lines)
+    parse_cache._default_cache = parse_cache.ParseCache(os.path.join(work_dir, "parse_cache"))
+    cold, t_cold = _timed(log_parser.parse_log_file, path, lazy_log=True, use_cache=True)
+    hits_before = parse_cache.get_default_cache().hits
+    warm, t_warm = _timed(log_parser.parse_log_file, path, lazy_log=True, use_cache=True)
+    pd.testing.assert_frame_equal(cold, warm)
+    assert parse_cache.get_default_cache().hits == hits_before + 1, "zweiter Lauf kam nicht aus dem Cache"
+    r_old = _report("erster Lauf (parsen)", n_lines, t_cold)
+    r_new = _report("aus dem Cache", n_lines, t_warm)
+    size_mb = parse_cache.get_default_cache().total_size() / (1024 * 1024)
+    format_name = "Feather" if parse_cache.FEATHER_AVAILABLE else "Pickle"
+    print(f"    Faktor: {r_new / r_old:.1f}x   (Cache: {size_mb:.1f} MB, {format_name})")
+
+
+# =============================================================================
+# --- Parser-Registry: BHS/BMS/DPP/SCS/FSM/IQTK (user-020) ---
+# =============================================================================
+
+# Pro Format: Dateiname, Zeitstempel (aus datetime), Ereignis-Zeilen, Rausch-Zeilen
+REGISTRY_SAMPLES = {
+    "bhs": ("bhs.log", lambda ts: f"{ts:%Y-%m-%d %H:%M:%S},{ts.microsecond // 1000:03d}",
+            ["BHS in state 'Running'", "Command successful for element 'CV-{n}' : 'START'",
+             "ERROR: Element 'CV-{n}' failed to respond", "PlcWrite - ERROR!!! PLC not connected"],
+            ["PlcRead - element 'CV-{n}' ok", "Heartbeat sent to BHS controller", "Queue length {n}"]),
+    "bms": ("bms.log", None,
+            ["FSM:input=Faulted(systemFaulted=1, conveyorEStopped=0, conveyorStopped=1, scsReadyForBags=0, timers=0)",
+             "UpdateScannerStatus - scs_fault_cause = {n}", "UpdateScannerStatus - got SCS Opstate = 0",
+             "Destroying bag {n}"],
+            ["BagTracker::Update bag {n} position 4", "UpdateScannerStatus - heartbeat", "Sending status to HMI"]),
+    "dpp": ("dpp.log", None,
+            ["Client::read() -- exiting(3)", "Client::read() -- exiting(0)"],
+            ["Client::read() -- received {n} bytes", "Server::accept() -- new client", "DPP queue depth {n}"]),
+    "scs": ("scs.log", None,
+            ["SetOpState OP_RUN", "SetFaultState {n}", "HVPS state changed to ON", "Seasoning State changed to DONE"],
+            ["Gantry speed {n} rpm", "Detector temperature 31.{n} C", "Slice {n} reconstructed"]),
+    "fsm": ("fsm.log", None,
+            ["FSM:next(PROCESSING)", "FSM:input=BAG_ENTERING(bag={n})",
+             "FSM:input=Ready(systemFaulted=0, conveyorEStopped=0, conveyorStopped=0, scsReadyForBags=1, timers=0)"],
+            ["FSM:timer tick {n}", "BagQueue size {n}", "Heartbeat from BMS"]),
+    "iqtk": ("iqtk_results.log", lambda ts: f"{ts:%Y%m%d%H%M%S}:",
+             ["Nylon Sphere: {{value={n}, pass}} Aluminum Sphere: {{value={n}, fail}}"],
+             ["Test piece position {n}", "Acquiring reference image", "Calibration table loaded"]),
+}
+
+def _syslog_ts(ts):
+    return f"{WEEKDAYS[ts.weekday()]} {MONTHS[ts.month - 1]} {ts.day:02d} {ts:%H:%M:%S}.{ts.microsecond:06d}"
+
+def generate_registry_log(path, fmt_name, n_lines, event_share=0.05, seed=1):
+    """Synthetisches Log für ein Registry-Format: 'event_share' Ereignis-Zeilen, Rest Rauschen."""
+    _, ts_func, events, noise = REGISTRY_SAMPLES[fmt_name]
+    ts_func = ts_func or _syslog_ts
+    rnd = random.Random(seed)
+    start = datetime(2025, 3, 1)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for i in range(n_lines):
+            ts = start + timedelta(milliseconds=250 * i)
+            text = rnd.choice(events if rnd.random() < event_share else noise).format(n=rnd.randrange(1, 1000))
+            f.write(f"{ts_func(ts)} {text}\n")
+
+def _legacy_registry_parse_log(module, file_path):
+    """parse_log der Einzel-Parser VOR V2-REG (Zeile für Zeile, Regex + parse_line auf jeder Zeile)."""
+    from log_timestamps import TimestampDecoder
+    ts_format = module.LOG_FORMAT.ts_format
+    decoder = TimestampDecoder(start_year=2025)
+    records = []
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if ts_match := module.TS_PATTERN.search(line):
+                raw = ts_match.group(1)
+                try:
+                    if ts_format == "syslog":
+                        dt = decoder.parse_syslog(raw)
+                    else:
+                        dt = datetime.strptime(raw, "%Y-%m-%d %H:%M:%S,%f" if ts_format == "iso" else "%Y%m%d%H%M%S")
+                except ValueError:
+                    continue
+                if dt is None:
+                    continue
+                if klartext := module.parse_line(line):
+                    records.append({"Timestamp": dt, "Quelle": module.LOG_FORMAT.source, "Ereignis": klartext,
+                                    "OriginalLog": line.strip()})
+    return pd.DataFrame(records)
+
+@benchmark("parser_registry")
+def bench_parser_registry(n_lines, work_dir):
+    import importlib
+    import parser_registry
+    paths = []
+    for fmt_name, (file_name, _, _, _) in REGISTRY_SAMPLES.items():
+        module = importlib.import_module(f"{fmt_name}_log_parser")
+        path = os.path.join(work_dir, file_name)
+        generate_registry_log(path, fmt_name, n_lines)
+        paths.append(path)
+        assert parser_registry.find_format(path) is module.LOG_FORMAT, f"{fmt_name}: Format nicht am Dateinamen erkannt"
+        legacy, t_legacy = _timed(_legacy_registry_parse_log, module, path)
+        registry, t_registry = _timed(module.parse_log, path)
+        pd.testing.assert_frame_equal(legacy, registry)
+        print(f"  {fmt_name}: {len(registry):,} Ereignisse".replace(",", "."))
+        r_old = _report("vorher (Zeile für Zeile)", n_lines, t_legacy)
+        r_new = _report("Registry (Vorfilter)", n_lines, t_registry)
+        print(f"    Faktor: {r_new / r_old:.2f}x")
+
+    print("  parse_files (alle Formate):")
+    for workers in sorted({1, min(len(paths), os.cpu_count() or 1)}):
+        (_, metrics), seconds = _timed(parser_registry.parse_files, paths, workers=workers)
+        _report(f"{workers} Prozess(e)", n_lines * len(paths), seconds)
+    for m in metrics.values():
+        print(f"    {m.name:<5} {m.lines_per_s:12,.0f} Zeilen/s   Vorfilter {m.prefilter_rate:6.1%}   "
+              f"Treffer {m.match_rate:6.2%}".replace(",", "."))
+
+
+# =============================================================================
+# --- MV3D: Dateien parallel parsen (user-021) ---
+# =============================================================================
+
+MV3D_MESSAGES = [
+    "BagTracker bag {bag} [TRAY_ID={tray}] position update",
+    "Heartbeat from {system} ok",
+    "Conveyor motor fault detected on CV-{n}",
+    "E-STOP pressed at station {n}",
+    "HVPS Arc count {n}",
+    "Connection to PLC disconnected",
+    "Bag Jam detected at entrance",
+    "Image {n} reconstructed in 412 ms",
+]
+
+# Dateiname, Anteil an den Zeilen, Zeitstempel-Format
+MV3D_BUNDLE = [("scs.log", 0.30, "iso"), ("scs.log.1", 0.15, "iso"), ("dpp.log", 0.20, "syslog"),
+               ("bhs.log", 0.10, "iso"), ("plc.log", 0.10, "iso"), ("messages", 0.10, "syslog"),
+               ("diagserv_1-2-3_4", 0.05, "iso")]
+
+def generate_mv3d_bundle(work_dir, n_lines, seed=1):
+    """Synthetisches MV3D-Log-Bündel (mehrere rotierte Dateien, zusammen ca. 'n_lines' Zeilen)."""
+    rnd = random.Random(seed)
+    bundle_dir = os.path.join(work_dir, "mv3d")
+    os.makedirs(bundle_dir, exist_ok=True)
+    start = datetime(2025, 3, 1)
+    paths = []
+    for file_name, share, ts_format in MV3D_BUNDLE:
+        path = os.path.join(bundle_dir, file_name)
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            for i in range(int(n_lines * share)):
+                ts = start + timedelta(milliseconds=97 * i)
+                if ts_format == "iso":
+                    stamp = f"{ts:%Y-%m-%d %H:%M:%S}.{ts.microsecond // 1000:03d}"
+                else:
+                    stamp = f"{WEEKDAYS[ts.weekday()]} {MONTHS[ts.month - 1]} {ts.day:02d} {ts:%H:%M:%S}.{ts.microsecond:06d}"
+                text = rnd.choice(MV3D_MESSAGES).format(bag=f"0{rnd.randrange(10**9):09d}", tray=rnd.randrange(1, 500),
+                                                        system=file_name.split('.')[0], n=rnd.randrange(1, 100))
+                f.write(f"{stamp} {text}\n")
+        paths.append(path)
+    return paths
+
+@benchmark("mv3d_parallel")
+def bench_mv3d_parallel(n_lines, work_dir):
+    import mv3d_log_parser
+    paths = generate_mv3d_bundle(work_dir, n_lines)
+    parser = mv3d_log_parser.MV3DLogParser()
+    progress = lambda percent, text: None
+    (incidents, raw), t_serial = _timed(parser.run_full_analysis, paths, progress, is_local=True)
+    workers = os.cpu_count() or 1
+    (incidents_par, raw_par), t_parallel = _timed(parser.run_full_analysis, paths, progress, is_local=True,
+                                                  workers=workers)
+    pd.testing.assert_frame_equal(incidents, incidents_par)
+    pd.testing.assert_frame_equal(raw, raw_par)
+    r_old = _report("seriell", n_lines, t_serial)
+    r_new = _report(f"{workers} Prozess(e)", n_lines, t_parallel)
+    print(f"    Faktor: {r_new / r_old:.2f}x   ({len(paths)} Dateien / {len(incidents):,} Vorfälle)".replace(",", "."))
+
+
+# =============================================================================
+# --- MV3D: Literal-Vorfilter für die Fehlermuster (user-022) ---
+# =============================================================================
+
+# Aufgezeichnetes MV3D-Bündel (--mv3d-bundle); ohne Angabe: generate_mv3d_bundle
+MV3D_BUNDLE_DIR = None
+
+def _mv3d_bundle_files(parser, n_lines, work_dir):
+    """Pro vom MV3D-Parser erkannter Datei die Liste ihrer Zeilen (ungekürzt)."""
+    if MV3D_BUNDLE_DIR:
+        paths = [os.path.join(MV3D_BUNDLE_DIR, name) for name in sorted(os.listdir(MV3D_BUNDLE_DIR))]
+    else:
+        paths = generate_mv3d_bundle(work_dir, n_lines)
+    file_lines = []
+    for files in parser._build_log_map_from_list(paths).values():
+        for path in files:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, 'rt', encoding='utf-8', errors='ignore') as f:
+                file_lines.append(f.readlines())
+    return file_lines
+
+def _mv3d_bundle_lines(parser, n_lines, work_dir):
+    """Alle Zeilen (gestrippt, kleingeschrieben wie in _parse_line) der vom MV3D-Parser erkannten Dateien."""
+    return [line.strip().lower() for lines in _mv3d_bundle_files(parser, n_lines, work_dir) for line in lines]
+
+def _legacy_mv3d_first_match(error_patterns, lines):
+    """MV3DLogParser._parse_line VOR 2.7: alle Muster der Reihe nach, bis eines passt."""
+    hits = []
+    for line in lines:
+        hit = None
+        for index, (pattern, details, category) in enumerate(error_patterns):
+            match = pattern.search(line)
+            if match:
+                hit = (index, match.group(0))
+                break
+        hits.append(hit)
+    return hits
+
+@benchmark("mv3d_matcher")
+def bench_mv3d_matcher(n_lines, work_dir):
+    import mv3d_log_parser
+    parser = mv3d_log_parser.MV3DLogParser()
+    lines = _mv3d_bundle_lines(parser, n_lines, work_dir)
+    matcher = parser.error_matcher
+    legacy, t_legacy = _timed(_legacy_mv3d_first_match, parser.ERROR_PATTERNS, lines)
+    hits, t_matcher = _timed(lambda: [(hit[0], hit[1].group(0)) if hit else None
+                                      for hit in map(matcher.search, lines)])
+    assert legacy == hits, "MV3D: Vorfilter liefert andere Treffer!"
+    gated = sum(1 for line in lines if not matcher._candidates(line))
+    r_old = _report("alle Muster pro Zeile", len(lines), t_legacy)
+    r_new = _report("Literal-Vorfilter", len(lines), t_matcher)
+    print(f"    Faktor: {r_new / r_old:.2f}x   ({matcher.prefiltered_count}/{len(matcher.patterns)} Muster mit Literal / "
+          f"{gated / max(1, len(lines)):.0%} der Zeilen ohne Kandidaten / {sum(1 for hit in hits if hit)} Treffer)")
+
+
+# =============================================================================
+# --- .gz als Strom statt entpackter Kopie (user-023) ---
+# =============================================================================
+
+def _legacy_gunzip_copy_and_read(gz_path, work_dir):
+    """_copy_files_to_analysis_dir VOR 2.8: entpackte Kopie schreiben, danach die Kopie lesen."""
+    copy_path = os.path.join(work_dir, os.path.basename(gz_path)[:-3])
+    with gzip.open(gz_path, 'rb') as f_in, open(copy_path, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    with open(copy_path, 'r', encoding='utf-8', errors='ignore') as f:
+        n_lines = sum(1 for _ in f)
+    copied = os.path.getsize(copy_path)
+    os.remove(copy_path)
+    return n_lines, copied
+
+@benchmark("gzip_stream")
+def bench_gzip_stream(n_lines, work_dir, n_members=8):
+    import log_stream
+    plain_path = os.path.join(work_dir, "scanner_bag.log")
+    generate_scanner_log(plain_path, n_lines)
+    with open(plain_path, 'rb') as f:
+        lines = f.readlines()
+    # Mehrteilige .gz (wie aneinandergehängte Rotationen): 'n_members' Member an Zeilengrenzen
+    gz_path = plain_path + ".1.gz"
+    step = -(-len(lines) // n_members)
+    with open(gz_path, 'wb') as f:
+        for i in range(0, len(lines), step):
+            f.write(gzip.compress(b''.join(lines[i:i + step]), compresslevel=6))
+
+    (expected, copied), t_copy = _timed(_legacy_gunzip_copy_and_read, gz_path, work_dir)
+    _report("entpackte Kopie + lesen", n_lines, t_copy)
+    for gzip_mode in ("python", "parallel", "pipe"):
+        if gzip_mode == "pipe" and not log_stream.find_gzip_tool():
+            print("    pipe: kein pigz/zcat installiert")
+            continue
+        def read_stream():
+            with log_stream.open_log(gz_path, gzip_mode) as f:
+                return sum(1 for _ in f)
+        counted, seconds = _timed(read_stream)
+        assert counted == expected, f"gzip ({gzip_mode}): {counted} statt {expected} Zeilen"
+        _report(f"Strom ({gzip_mode})", n_lines, seconds)
+    print(f"    Ohne Kopie: {copied / (1024 * 1024):.1f} MB weniger auf der Platte geschrieben")
+
+
+# =============================================================================
+# --- MV3D: Zeitstempel-Format pro Datei, spaltenweise Umwandlung (user-024) ---
+# =============================================================================
+
+def _mv3d_timestamps_per_line(parser, lines):
+    """_generic_parser VOR 2.9: TS_REGEX.search + strptime/parse_iso_fixed für jede Zeile."""
+    stamps = (parser._get_timestamp(line) for line in lines)
+    return [ts for ts in stamps if ts is not None]
+
+def _mv3d_timestamps_per_file(parser, lines):
+    import mv3d_log_parser
+    timestamps = mv3d_log_parser.FileTimestamps(parser)
+    for line in lines:
+        timestamps.add(line)
+    decoded = timestamps.decode()
+    return decoded[~np.isnat(decoded)]
+
+@benchmark("mv3d_timestamps")
+def bench_mv3d_timestamps(n_lines, work_dir):
+    import mv3d_log_parser
+    parser = mv3d_log_parser.MV3DLogParser()
+    file_lines = _mv3d_bundle_files(parser, n_lines, work_dir) + MV3D_TIMESTAMP_EDGE_FILES
+    total = sum(len(lines) for lines in file_lines)
+    legacy, t_legacy = _timed(lambda: [_mv3d_timestamps_per_line(parser, lines) for lines in file_lines])
+    fast, t_fast = _timed(lambda: [_mv3d_timestamps_per_file(parser, lines) for lines in file_lines])
+    for old, new in zip(legacy, fast):
+        assert np.array_equal(np.array(old, dtype='datetime64[us]'), new), "MV3D: Zeitstempel weichen ab!"
+    r_old = _report("TS_REGEX + strptime pro Zeile", total, t_legacy)
+    r_new = _report("Format pro Datei + Spalte", total, t_fast)
+    print(f"    Faktor: {r_new / r_old:.2f}x   ({len(file_lines)} Dateien / {sum(len(ts) for ts in fast):,} Zeitstempel)"
+          .replace(",", "."))
+
+
+# =============================================================================
+# --- MV3D: raw_df mit Zeilen-Verweisen statt Text (user-025) ---
+# =============================================================================
+
+@benchmark("mv3d_lazy_raw")
+def bench_mv3d_lazy_raw(n_lines, work_dir, n_windows=200):
+    import mv3d_log_parser
+    import raw_schema
+    paths = generate_mv3d_bundle(work_dir, n_lines)
+    progress = lambda percent, text: None
+    (_, raw), t_text = _timed(mv3d_log_parser.MV3DLogParser().run_full_analysis, paths, progress, is_local=True)
+    (_, lazy), t_lazy = _timed(mv3d_log_parser.MV3DLogParser().run_full_analysis, paths, progress, is_local=True,
+                               lazy_log=True)
+    assert len(raw) == len(lazy), "MV3D: lazy_log liefert andere Zeilen!"
+    _report("raw_df mit OriginalLog", n_lines, t_text)
+    _report("raw_df mit Zeilen-Verweisen", n_lines, t_lazy)
+    mb = lambda df: df.memory_usage(deep=True).sum() / (1024 * 1024)
+    print(f"    Speicher raw_df: {mb(raw):.1f} MB -> {mb(lazy):.1f} MB")
+
+    # Detailfenster: je 41 Zeilen Kontext um eine zufällige Zeile (per Memory-Map nachgelesen)
+    rnd = random.Random(1)
+    rows = [rnd.randrange(len(lazy)) for _ in range(n_windows)]
+    windows = lambda df: [df.loc[max(0, row - 20): row + 20] for row in rows]
+    texts, t_read = _timed(lambda: [raw_schema.with_original_log(window)["OriginalLog"].tolist()
+                                    for window in windows(lazy)])
+    assert texts == [window["OriginalLog"].tolist() for window in windows(raw)], "MV3D: nachgelesener Text weicht ab!"
+    print(f"    {n_windows} Kontext-Fenster nachgelesen: {t_read * 1000 / n_windows:.2f} ms pro Fenster")
+
+    # Rotiertes .gz: Fenster am Dateiende (Einstiegspunkte statt Entpacken ab dem Dateianfang)
+    gz_dir = os.path.join(work_dir, "mv3d_gz")
+    os.makedirs(gz_dir, exist_ok=True)
+    gz_paths = []
+    for path in paths:
+        if os.path.basename(path) == "scs.log.1":
+            gz_path = os.path.join(gz_dir, "scs.log.1.gz")
+            with open(path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            path = gz_path
+        gz_paths.append(path)
+    _, lazy_gz = mv3d_log_parser.MV3DLogParser().run_full_analysis(gz_paths, progress, is_local=True, lazy_log=True)
+    assert len(raw) == len(lazy_gz), "MV3D: .gz liefert andere Zeilen!"
+    gz_rows = np.flatnonzero(lazy_gz["LogFile"].astype(str).str.endswith(".gz").to_numpy())
+    rows = [int(row) for row in gz_rows[-n_windows:]]
+    texts, t_read = _timed(lambda: [raw_schema.with_original_log(window)["OriginalLog"].tolist()
+                                    for window in windows(lazy_gz)])
+    assert texts == [window["OriginalLog"].tolist() for window in windows(raw)], "MV3D: nachgelesener .gz-Text weicht ab!"
+    print(f"    {len(rows)} Kontext-Fenster am Ende von scs.log.1.gz: {t_read * 1000 / max(1, len(rows)):.2f} ms pro Fenster")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmarks für die Log-Parser")
+    arg_parser.add_argument("names", nargs="*", help=f"Benchmarks ({', '.join(BENCHMARKS)})")
+    arg_parser.add_argument("--lines", type=int, default=1_000_000, help="Zeilen pro synthetischem Log")
+    arg_parser.add_argument("--mv3d-bundle", help="Verzeichnis mit aufgezeichneten MV3D-Logs (mv3d_matcher)")
+    args = arg_parser.parse_args()
+    MV3D_BUNDLE_DIR = args.mv3d_bundle
+
+    selected = args.names or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unbekannte Benchmarks: {', '.join(unknown)}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix="gateview_bench_") as work_dir:
+        for name in selected:
+            print(f"\n--- Benchmark: {name} ({args.lines:,} Zeilen) ---".replace(",", "."))
+            BENCHMARKS[name](args.lines, work_dir)
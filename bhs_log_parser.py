@@ -1,7 +1,6 @@
 # bhs_log_parser.py
 import re
-import pandas as pd
-from datetime import datetime
+from parser_registry import LogFormat, register_format, parse_file
 
 TS_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2},\d{3})")
 BHS_STATE_PATTERN = re.compile(r"BHS in state '(\w+)'")
@@ -27,13 +26,16 @@ def parse_line(line):
 
     return None
 
+# NEU (V2-REG): Format-Beschreibung für den gemeinsamen Treiber (parser_registry.py)
+LOG_FORMAT = register_format(LogFormat(
+    name="bhs", source="BHS",
+    file_patterns=[r'^bhs\.log(\.\d+)?$'],
+    prefilter=["BHS in state '",
+               "Command successful for element '",
+               "ERROR: Element '",
+               "PlcWrite - ERROR!!! PLC not connected"],
+    ts_pattern=TS_PATTERN, ts_format="iso",
+    parse_line=parse_line))
+
 def parse_log(file_path):
-    records = []
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            if ts_match := TS_PATTERN.search(line):
-                try: dt = datetime.strptime(ts_match.group(1), "%Y-%m-%d %H:%M:%S,%f")
-                except ValueError: continue
-                if klartext := parse_line(line):
-                    records.append({"Timestamp": dt, "Quelle": "BHS", "Ereignis": klartext, "OriginalLog": line.strip()})
-    return pd.DataFrame(records)
\ No newline at end of file
+    return parse_file(file_path, LOG_FORMAT)
@@ -1,8 +1,7 @@
 # bms_log_parser.py
 import re
-import pandas as pd
-from datetime import datetime
 from fault_translator import translate_fault_code
+from parser_registry import LogFormat, register_format, parse_file
 
 TS_PATTERN = re.compile(r"^([A-Z][a-z]{2}\s+[A-Z][a-z]{2}\s+\d{2}\s+\d{2}:\d{2}:\d{2}\.\d+)")
 BAG_DESTROY_PATTERN = re.compile(r'Destroying bag (\d+)')
@@ -34,26 +33,16 @@ def parse_line(line):
     if m := BAG_DESTROY_PATTERN.search(line): return f"[BMS] Gepäckstück '{m.group(1)}' wird aus dem aktiven Speicher entfernt."
     return None
 
-def parse_log(file_path):
-    records = []
-    last_month = None
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            if ts_match := TS_PATTERN.search(line):
-                try:
-                    # **KORRIGIERTE DATUMS-LOGIK**
-                    ts_str_no_year = ts_match.group(1).split('.')[0]
-                    dt_no_year = datetime.strptime(ts_str_no_year, "%a %b %d %H:%M:%S")
-                    
-                    year_to_use = 2025 # Festes Jahr wie besprochen
-                    if last_month and dt_no_year.month < last_month:
-                        year_to_use += 1
-                    
-                    dt_object = dt_no_year.replace(year=year_to_use)
-                    last_month = dt_object.month
+# NEU (V2-REG): Format-Beschreibung für den gemeinsamen Treiber (parser_registry.py)
+LOG_FORMAT = register_format(LogFormat(
+    name="bms", source="BMS",
+    file_patterns=[r'^bms\.log(\.\d+)?$'],
+    prefilter=["FSM:input=Faulted(",
+               "scs_fault_cause = ",
+               "got SCS Opstate = ",
+               "Destroying bag "],
+    ts_pattern=TS_PATTERN, ts_format="syslog",
+    parse_line=parse_line))
 
-                except ValueError: continue
-                
-                if klartext := parse_line(line):
-                    records.append({"Timestamp": dt_object, "Quelle": "BMS", "Ereignis": klartext, "OriginalLog": line.strip()})
-    return pd.DataFrame(records)
\ No newline at end of file
+def parse_log(file_path):
+    return parse_file(file_path, LOG_FORMAT)
@@ -1,69 +1,163 @@
 # brava_log_parser.py
 # HINWEIS: Zurückgesetzt auf V1. Diese Datei ist NICHT für CSV-Dateien.
-print("--- [V15-FIX] brava_log_parser.py wird geladen (Original V1) ... ---")
+print("--- [V17-STREAM] brava_log_parser.py wird geladen (Original V1, blockweise, TRAY_ID-Index) ... ---")
 
 import pandas as pd
+import numpy as np
 import re
 import os
+from itertools import repeat
+
+from log_timestamps import iso_series_to_datetime
+from log_stream import iter_line_blocks, line_offsets, file_size, DEFAULT_BLOCK_SIZE
+from raw_schema import LOG_REF_COLUMNS, line_crc, compact_raw_df
+
+# NEU (V17): Einmal kompiliert (vorher zwei re.search pro Zeile)
+TIMESTAMP_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z)')
+TRAY_ID_PATTERN = re.compile(r'\[TRAY_ID=(\d+)\]')
+DECISION_PATTERN = re.compile(r'Final Decision is (\w+)')
+
+BRAVA_COLUMNS = ["Timestamp", "Source", "IATA", "Klartext", "OriginalLog"]
+# NEU (V17): Ohne OriginalLog - der Text steht schon in Klartext, die Zeile bei Bedarf per Verweis (raw_schema.py)
+BRAVA_LAZY_COLUMNS = [col for col in BRAVA_COLUMNS if col != "OriginalLog"] + LOG_REF_COLUMNS
 
 def parse_brava_line(line):
     """
     Parst eine einzelne Zeile aus dem Brava-Log.
     Sucht nach Mustern, um Tray-ID und eine Klartext-Nachricht zu extrahieren.
     """
-    tray_id_match = re.search(r'\[TRAY_ID=(\d+)\]', line)
+    tray_id_match = TRAY_ID_PATTERN.search(line)
     tray_id = tray_id_match.group(1) if tray_id_match else None
-    
+
     klartext = line.strip()
-    
-    decision_match = re.search(r'Final Decision is (\w+)', line)
+
+    decision_match = DECISION_PATTERN.search(line)
     if decision_match:
         klartext = f"Finale Entscheidung: {decision_match.group(1)}"
-        
+
     return tray_id, klartext
 
-def parse_log(file_path, progress_callback=None):
+def iter_brava_batches(file_path, progress_callback=None, lazy_log=False, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    NEU (V17): Streaming-Modus. Liest die Datei blockweise (binär) statt readlines() und gibt pro
+    Block einen spaltenorientierten Batch (dict: Spaltenname -> Liste) zurück.
+    Zeitstempel bleiben Roh-Strings (werden in parse_log spaltenweise umgewandelt).
+    'lazy_log' speichert statt OriginalLog nur LogFile/LogOffset/LogLength/LogCRC.
+    """
+    filename = os.path.basename(file_path)
+    total_size = file_size(file_path) or 1
+
+    for block_offset, raw_lines, bytes_consumed in iter_line_blocks(file_path, block_size):
+        batch = {col: [] for col in (BRAVA_LAZY_COLUMNS if lazy_log else BRAVA_COLUMNS)}
+        offsets = line_offsets(block_offset, raw_lines) if lazy_log else repeat(None)
+
+        for line_start, raw_line in zip(offsets, raw_lines):
+            line = raw_line.decode('utf-8', errors='ignore')
+            timestamp_match = TIMESTAMP_PATTERN.match(line)
+            if not timestamp_match:
+                continue
+
+            infotext = line[timestamp_match.end(1):].strip()
+            tray_id, klartext = parse_brava_line(infotext)
+
+            batch["Timestamp"].append(timestamp_match.group(1))
+            batch["Source"].append("BRAVA") # Quelle ist BRAVA
+            batch["IATA"].append(tray_id)
+            batch["Klartext"].append(klartext)
+            if lazy_log:
+                batch["LogFile"].append(file_path)
+                batch["LogOffset"].append(line_start)
+                batch["LogLength"].append(len(raw_line))
+                batch["LogCRC"].append(line_crc(line.strip()))
+            else:
+                batch["OriginalLog"].append(line.strip())
+
+        if progress_callback:
+            progress_callback(min(100, int(bytes_consumed / total_size * 100)), f"Analysiere {filename}...")
+
+        if batch["Timestamp"]:
+            yield batch
+
+def parse_log(file_path, progress_callback=None, lazy_log=False, block_size=DEFAULT_BLOCK_SIZE):
     """
     Liest eine gesamte Brava-Log-Datei (NICHT CSV) und wandelt sie in einen DataFrame um.
-    
+    NEU (V17): Blockweise (iter_brava_batches) statt readlines(); 'lazy_log' ersetzt OriginalLog
+    durch Zeilen-Verweise (raw_schema.with_original_log liest nach).
+
     GIBT ZURÜCK:
     (df, None) - Gibt ein Tupel zurück, um mit dem neuen plclog_csv_parser kompatibel zu sein.
                  Der zweite Wert (Errors) ist immer None.
     """
-    records = []
     filename = os.path.basename(file_path)
-    
+
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
-        total_lines = len(lines)
-        for i, line in enumerate(lines):
-            if progress_callback and i % 100 == 0:
-                progress_callback(int((i / total_lines) * 100), f"Analysiere {filename}...")
-
-            timestamp_match = re.match(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z)', line)
-            if not timestamp_match:
-                continue
-                
-            timestamp = pd.to_datetime(timestamp_match.group(1)) # Erzeugt TZ-aware (UTC)
-            infotext = line[timestamp_match.end(1):].strip()
-            
-            tray_id, klartext = parse_brava_line(infotext)
-            
-            records.append({
-                "Timestamp": timestamp,
-                "Source": "BRAVA", # Quelle ist BRAVA
-                "IATA": tray_id,
-                "Klartext": klartext,
-                "OriginalLog": line.strip()
-            })
-            
-        df = pd.DataFrame(records)
+        columns = {col: [] for col in (BRAVA_LAZY_COLUMNS if lazy_log else BRAVA_COLUMNS)}
+        for batch in iter_brava_batches(file_path, progress_callback, lazy_log, block_size):
+            for col, values in batch.items():
+                columns[col].extend(values)
+
+        df = pd.DataFrame(columns) if columns["Timestamp"] else pd.DataFrame()
+        if not df.empty:
+            df["Timestamp"] = iso_series_to_datetime(df["Timestamp"], utc=True) # TZ-aware (UTC)
         print(f"--- brava_log_parser: {len(df)} BRAVA-Einträge gefunden.")
         # Gebe (df, None) zurück, um kompatibel zu sein
         return df, pd.DataFrame()
-        
+
     except Exception as e:
         print(f"Fehler beim Parsen von {filename}: {e}")
-        return pd.DataFrame(), pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame(), pd.DataFrame()
+
+
+class TrayIndex:
+    """
+    NEU (V17): TRAY_ID -> Zeilen eines BRAVA-DataFrames.
+
+    Die Zeilenpositionen werden einmal stabil nach TRAY_ID sortiert; pro TRAY_ID wird nur der
+    Bereich (start, ende) in dieser Liste gespeichert. Die Historie einer Wanne kostet damit
+    eine Dictionary-Abfrage statt eines Vergleichs über die ganze IATA-Spalte.
+    """
+
+    def __init__(self, order, ranges):
+        self.order = order   # Zeilenpositionen, nach TRAY_ID gruppiert (innerhalb: Datei-Reihenfolge)
+        self.ranges = ranges # TRAY_ID -> (start, ende) in 'order'
+
+    @classmethod
+    def build(cls, df, column="IATA"):
+        if df.empty or column not in df.columns:
+            return cls(np.array([], dtype=np.int64), {})
+        keys = df[column]
+        valid = keys.notna().to_numpy()
+        positions = np.flatnonzero(valid)
+        values = keys.to_numpy()[valid].astype(str)
+        by_key = np.argsort(values, kind='stable')
+        sorted_values = values[by_key]
+        uniques, starts = np.unique(sorted_values, return_index=True)
+        ends = np.append(starts[1:], len(sorted_values))
+        return cls(positions[by_key], dict(zip(uniques.tolist(), zip(starts.tolist(), ends.tolist()))))
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def __contains__(self, tray_id):
+        return str(tray_id) in self.ranges
+
+    def rows(self, tray_id):
+        """Zeilenpositionen (iloc) der Wanne, in Datei-Reihenfolge."""
+        start, end = self.ranges.get(str(tray_id), (0, 0))
+        return self.order[start:end]
+
+    def history(self, df, tray_id):
+        """Alle Zeilen der Wanne aus 'df' (dem DataFrame, aus dem der Index gebaut wurde)."""
+        return df.iloc[self.rows(tray_id)]
+
+
+def load_indexed(file_path, progress_callback=None, lazy_log=True, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    NEU (V17): Streaming-Einlesen für große BRAVA-Verzeichnisse: ohne doppelte Textkopie
+    (lazy_log), im kompakten Schema (raw_schema.compact_raw_df) und mit TRAY_ID-Index
+    für die Historie einzelner Wannen.
+    GIBT ZURÜCK: (df, TrayIndex)
+    """
+    df, _ = parse_log(file_path, progress_callback, lazy_log, block_size)
+    df = compact_raw_df(df)
+    return df, TrayIndex.build(df)
@@ -1,64 +1,99 @@
 # data_processor.py
-print("--- [V19-FIX-User] data_processor.py wird geladen (JourneyID an OMS-Tab übergeben) ... ---")
+print("--- [V20-VEC] data_processor.py wird geladen (Spaltenweise Entscheidungs-Extraktion) ... ---")
 
+import numpy as np
 import pandas as pd
-import re
 import traceback
 from datetime import timedelta # Import für PLC-Logik
 
+from raw_schema import compact_raw_df, concat_raw_frames, drop_known_rows, expand_raw_df
+
 # --- Spalten-Definitionen (Unverändert) ---
 FINAL_JOURNEY_COLS_SCANNER = ['Timestamp', 'BagID', 'IATA', 'Machine', 'EDS', 'Operator', 'Final', 'OperatorName']
 # --- KORREKTUR (V19): JourneyID hinzugefügt ---
 FINAL_JOURNEY_COLS_OMS = ['Timestamp', 'IATA', 'EDS', 'Operator', 'Final', 'JourneyID']
 
 
-# --- Extraktions-Logik (Unverändert) ---
-def _extract_decisions(df_group):
-    """Extrahiert Entscheidungen aus einer gruppierten Klartext-Liste."""
-    
-    klartext_str = ' '.join(df_group['KlartextList'])
-    
-    # 1. EDS (Maschinentscheidung)
-    eds_decision = "N/A"
-    if "Maschinelle Entscheidung (EDS): **ALARM**" in klartext_str:
-        eds_decision = "ALARM"
-    elif "Maschinelle Entscheidung (EDS): **CLEAR**" in klartext_str:
-        eds_decision = "CLEAR"
-    elif "Maschinelle Entscheidung (LTR): **ALARM**" in klartext_str: # Fallback LTR
-        eds_decision = "ALARM"
-    elif "Maschinelle Entscheidung (LTR): **CLEAR**" in klartext_str: # Fallback LTR
-        eds_decision = "CLEAR"
-        
-    # 2. Operator (V16/V15 Logik: Priorisiert Op 3/4)
-    operator_decision = "N/A"
-    operator_name = "N/A"
-    
-    op_match_priority = list(re.finditer(r"Operator-Entscheidung von '(operator3|operator4)': \*\*(CLEAR|ALARM)\*\*", klartext_str))
-    
-    if op_match_priority:
-        last_match = op_match_priority[-1]
-        operator_name = last_match.group(1)
-        operator_decision = last_match.group(2)
-    else:
-        op_match_fallback = list(re.finditer(r"Operator-Entscheidung von '([^']+)': \*\*(CLEAR|ALARM)\*\*", klartext_str))
-        if op_match_fallback:
-            last_match = op_match_fallback[-1]
-            operator_name = last_match.group(1)
-            operator_decision = last_match.group(2)
-        
-    # 3. Final (OMS-Befehl)
-    final_decision = "N/A"
-    if "Finaler Befehl an Förderanlage gesendet: **Alarm (ALARM)**" in klartext_str:
-        final_decision = "ALARM"
-    elif "Finaler Befehl an Förderanlage gesendet: **Freigabe (CLEAR)**" in klartext_str:
-        final_decision = "CLEAR"
-        
-    # 4. Fallback-Logik für 'Final' (Regel: Nur Op 3/4)
-    if final_decision == 'N/A':
-        if operator_name in ['operator3', 'operator4']:
-            final_decision = operator_decision
-            
-    return eds_decision, operator_decision, operator_name, final_decision
+# --- Extraktions-Logik (V20: spaltenweise statt pro Journey) ---
+# Maschinen-Entscheidung: der erste Marker in der Liste hat Vorrang (EDS vor LTR, ALARM vor CLEAR)
+EDS_MARKERS = [
+    ("Maschinelle Entscheidung (EDS): **ALARM**", "ALARM"),
+    ("Maschinelle Entscheidung (EDS): **CLEAR**", "CLEAR"),
+    ("Maschinelle Entscheidung (LTR): **ALARM**", "ALARM"), # Fallback LTR
+    ("Maschinelle Entscheidung (LTR): **CLEAR**", "CLEAR"), # Fallback LTR
+]
+# Final (OMS-Befehl)
+FINAL_MARKERS = [
+    ("Finaler Befehl an Förderanlage gesendet: **Alarm (ALARM)**", "ALARM"),
+    ("Finaler Befehl an Förderanlage gesendet: **Freigabe (CLEAR)**", "CLEAR"),
+]
+# Operator (V16/V15 Logik: Priorisiert Op 3/4). Das gierige '.*' liefert den LETZTEN Treffer der Zeile.
+OPERATOR_HINT = "Operator-Entscheidung von '"
+OPERATOR_PRIORITY_PATTERN = r"(?s).*Operator-Entscheidung von '(operator3|operator4)': \*\*(CLEAR|ALARM)\*\*"
+OPERATOR_FALLBACK_PATTERN = r"(?s).*Operator-Entscheidung von '([^']+)': \*\*(CLEAR|ALARM)\*\*"
+PRIORITY_OPERATORS = ['operator3', 'operator4']
+
+# Entscheidungs-Codes pro Roh-Zeile und wie sie pro Journey zusammengefasst werden
+DECISION_TAG_AGG = {
+    'EDSRank': 'max', 'FinalRank': 'max',
+    'OpPrioName': 'last', 'OpPrioDecision': 'last',
+    'OpName': 'last', 'OpDecision': 'last',
+}
+
+
+def _marker_rank(text, markers):
+    """Rang des wichtigsten enthaltenen Markers pro Zeile (0 = keiner)."""
+    rank = pd.Series(0, index=text.index, dtype='int8')
+    for value, (marker, _) in enumerate(reversed(markers), start=1):
+        rank = rank.mask(text.str.contains(marker, regex=False), value)
+    return rank
+
+
+def _rank_to_decision(rank, markers):
+    decisions = {len(markers) - i: decision for i, (_, decision) in enumerate(markers)}
+    return rank.map(decisions).fillna("N/A")
+
+
+def _tag_decisions(klartext):
+    """
+    Markiert jede Roh-Zeile mit ihren Entscheidungs-Codes (EDS, Operator, Final).
+    Die Journeys fassen diese Codes danach per groupby (max / last) zusammen.
+    """
+    text = klartext.astype(object).fillna('').astype(str).reset_index(drop=True)
+    tags = pd.DataFrame({
+        'EDSRank': _marker_rank(text, EDS_MARKERS),
+        'FinalRank': _marker_rank(text, FINAL_MARKERS),
+    }, index=text.index)
+
+    # Regex nur auf Zeilen, die überhaupt eine Operator-Entscheidung enthalten
+    op_text = text[text.str.contains(OPERATOR_HINT, regex=False)]
+    priority = op_text.str.extract(OPERATOR_PRIORITY_PATTERN).reindex(text.index)
+    fallback = op_text.str.extract(OPERATOR_FALLBACK_PATTERN).reindex(text.index)
+    tags['OpPrioName'], tags['OpPrioDecision'] = priority[0], priority[1]
+    tags['OpName'], tags['OpDecision'] = fallback[0], fallback[1]
+    return tags
+
+
+def _resolve_decisions(reduced):
+    """
+    Leitet aus den zusammengefassten Codes (eine Zeile pro Journey) die Entscheidungen ab.
+    GIBT ZURÜCK: DataFrame mit EDS, Operator, OperatorName, Final.
+    """
+    has_priority = reduced['OpPrioName'].notna()
+    operator_name = reduced['OpPrioName'].where(has_priority, reduced['OpName']).fillna("N/A")
+    operator_decision = reduced['OpPrioDecision'].where(has_priority, reduced['OpDecision']).fillna("N/A")
+
+    final_decision = _rank_to_decision(reduced['FinalRank'], FINAL_MARKERS)
+    # Fallback-Logik für 'Final' (Regel: Nur Op 3/4)
+    use_operator = (final_decision == "N/A") & operator_name.isin(PRIORITY_OPERATORS)
+    final_decision = final_decision.mask(use_operator, operator_decision)
+
+    return pd.DataFrame({
+        'EDS': _rank_to_decision(reduced['EDSRank'], EDS_MARKERS),
+        'Operator': operator_decision,
+        'OperatorName': operator_name,
+        'Final': final_decision,
+    }, index=reduced.index)
 # --- Ende Extraktions-Logik ---
 
 
@@ -79,16 +114,14 @@ def consolidate_scanner_journeys(raw_df):
         return pd.DataFrame(columns=FINAL_JOURNEY_COLS_SCANNER), raw_df
     raw_df.sort_values(by=['BagID', 'Timestamp'], inplace=True)
     try:
-        raw_df['IATA'] = raw_df.groupby('BagID')['IATA'].transform(lambda x: x.ffill().bfill())
+        # Gruppenweises ffill/bfill (statt transform mit lambda pro BagID)
+        raw_df['IATA'] = raw_df.groupby('BagID')['IATA'].ffill()
+        raw_df['IATA'] = raw_df.groupby('BagID')['IATA'].bfill()
     except Exception as e:
         print(f"--- FEHLER bei IATA-Propagation (V15): {e} ---")
         traceback.print_exc()
 
-    def set_no_read(row):
-        if row['IATA'] is pd.NA:
-            return 'NO_READ'
-        return row['IATA']
-    raw_df['IATA'] = raw_df.apply(set_no_read, axis=1)
+    raw_df['IATA'] = raw_df['IATA'].astype(object).where(raw_df['IATA'].notna(), 'NO_READ')
     raw_df = raw_df.fillna('N/A') 
 
     grouping_keys = ['BagID', 'IATA']
@@ -100,17 +133,17 @@ def consolidate_scanner_journeys(raw_df):
     raw_df.sort_values(by=grouping_keys + ['Timestamp'], inplace=True)
 
     try:
-        journeys = raw_df.groupby(grouping_keys).agg(
-            Timestamp=('Timestamp', 'first'),
-            Machine=('Device', lambda x: x[x != 'N/A'].iloc[0] if not x[x != 'N/A'].empty else 'N/A'),
-            KlartextList=('Klartext', list)
-        ).reset_index() 
+        work = raw_df[grouping_keys + ['Timestamp']].reset_index(drop=True)
+        work['Machine'] = raw_df['Device'].where(raw_df['Device'] != 'N/A').reset_index(drop=True)
+        work = work.join(_tag_decisions(raw_df['Klartext']))
 
-        decisions = journeys.apply(_extract_decisions, axis=1, result_type='expand')
-        journeys['EDS'] = decisions[0]
-        journeys['Operator'] = decisions[1]
-        journeys['OperatorName'] = decisions[2]
-        journeys['Final'] = decisions[3]
+        journeys = work.groupby(grouping_keys).agg(
+            Timestamp=('Timestamp', 'first'),
+            Machine=('Machine', 'first'),
+            **{col: (col, func) for col, func in DECISION_TAG_AGG.items()}
+        )
+        journeys['Machine'] = journeys['Machine'].fillna('N/A')
+        journeys = journeys.join(_resolve_decisions(journeys)).reset_index()
 
         return journeys[FINAL_JOURNEY_COLS_SCANNER].sort_values(by="Timestamp"), raw_df
 
@@ -121,11 +154,127 @@ def consolidate_scanner_journeys(raw_df):
 # --- ENDE SCANNER-ANALYSE ---
 
 
+# --- JOURNEY-SESSIONS (V20): gemeinsame 5-Minuten-Regel für OMS und SPS ---
+JOURNEY_GAP = timedelta(minutes=5)
+
+
+class JourneySessionizer:
+    """
+    Teilt Roh-Zeilen in Journeys: Eine neue Journey beginnt bei einem neuen Schlüssel
+    (z.B. IATA), bei einer Lücke > 'gap' oder wenn eines der 'split_predicates'
+    (Funktion DataFrame -> bool-Series) für die Zeile zutrifft.
+
+    Der Sessionizer merkt sich pro Schlüssel die letzte Journey (Zeitstempel und ID).
+    Weitere Aufrufe von assign() mit NEUEREN Zeilen setzen offene Journeys fort und
+    vergeben fortlaufende IDs, ohne die bereits verarbeiteten Zeilen neu zu sortieren.
+    """
+
+    def __init__(self, key='IATA', gap=JOURNEY_GAP, split_predicates=()):
+        self.key = key
+        self.gap = gap
+        self.split_predicates = list(split_predicates)
+        self.reset()
+
+    def reset(self):
+        """Vergisst alle Journeys (nächste ID wieder 1)."""
+        self.last_id = 0
+        self.open_journeys = pd.DataFrame(columns=['Timestamp', 'JourneyID'])
+
+    def is_newer(self, df):
+        """True, wenn keine Zeile von 'df' älter ist als die letzte bekannte Zeile ihres Schlüssels."""
+        if self.open_journeys.empty or df.empty:
+            return True
+        previous = df[self.key].map(self.open_journeys['Timestamp'])
+        return not (df['Timestamp'] < previous).any()
+
+    def assign(self, df):
+        """
+        Sortiert 'df' nach (Schlüssel, Timestamp) und vergibt die JourneyID.
+        GIBT ZURÜCK: das sortierte DataFrame (Original-Index bleibt erhalten) mit Spalte 'JourneyID'.
+        """
+        df = df.sort_values(by=[self.key, 'Timestamp'])
+        if df.empty:
+            return df.assign(JourneyID=pd.Series(dtype='int64'))
+
+        keys, timestamps = df[self.key], df['Timestamp']
+        key_change = keys != keys.shift()
+        is_split = pd.Series(False, index=df.index)
+        for predicate in self.split_predicates:
+            is_split |= predicate(df).astype("boolean").fillna(False).astype(bool)
+        is_new = key_change | (timestamps.groupby(keys).diff() > self.gap) | is_split
+
+        # Erste Zeile eines Schlüssels: offene Journey aus einem früheren Aufruf fortsetzen?
+        continues = pd.Series(False, index=df.index)
+        if not self.open_journeys.empty:
+            candidates = key_change & keys.notna() & keys.isin(self.open_journeys.index) & ~is_split
+            previous = keys[candidates].map(self.open_journeys['Timestamp'])
+            continues[candidates] = ((timestamps[candidates] - previous) <= self.gap).to_numpy()
+
+        # Eine ID pro Segment: fortgesetzte Segmente behalten ihre alte ID, alle anderen zählen weiter
+        segment = is_new.cumsum().to_numpy() - 1
+        continued = continues[is_new].to_numpy()
+        new_ids = self.last_id + np.cumsum(~continued)
+        segment_ids = new_ids
+        if continued.any():
+            old_ids = keys[is_new].map(self.open_journeys['JourneyID']).fillna(0).to_numpy()
+            segment_ids = np.where(continued, old_ids, new_ids)
+        df['JourneyID'] = segment_ids.astype('int64')[segment]
+
+        self.last_id = int(new_ids[-1])
+        self._remember(df)
+        return df
+
+    def _remember(self, df):
+        """Merkt sich pro Schlüssel die letzte Zeile (Zeitstempel und JourneyID)."""
+        last_rows = df.groupby(self.key)[['Timestamp', 'JourneyID']].last()
+        if self.open_journeys.empty:
+            self.open_journeys = last_rows
+        else:
+            self.open_journeys = pd.concat([self.open_journeys[~self.open_journeys.index.isin(last_rows.index)], last_rows])
+
+    @staticmethod
+    def summarize(df, **reducers):
+        """Fasst die Journeys spaltenweise zusammen: summarize(df, Timestamp=('Timestamp', 'first'), ...)."""
+        return df.groupby('JourneyID').agg(**reducers).reset_index()
+
+
+def _per_unique(values, func):
+    """
+    Wendet die Spalten-Funktion 'func' nur auf die unterschiedlichen Werte an und verteilt
+    das Ergebnis zurück auf alle Zeilen (SPS-Klartexte wiederholen sich sehr oft).
+    """
+    codes, uniques = pd.factorize(values)
+    result = func(pd.Series(uniques)).reindex(range(-1, len(uniques))).iloc[codes + 1]
+    result.index = values.index
+    return result
+
+
+def _plc_error_rows(df):
+    """SPS: Jede FEHLER-Zeile beginnt eine eigene Journey."""
+    return _per_unique(df['Klartext'], lambda text: text.str.contains("FEHLER:", na=False)).astype("boolean").fillna(False).astype(bool)
+
+
 # --- OMS-ANALYSE (Tab 4) - KORRIGIERT (V19) ---
-def consolidate_oms_journeys(raw_df):
+def _summarize_oms_journeys(raw_df):
+    """Eine Zeile pro OMS-JourneyID (Roh-Zeilen nach IATA/Timestamp sortiert)."""
+    work = raw_df[['JourneyID', 'Timestamp', 'IATA']].reset_index(drop=True).join(_tag_decisions(raw_df['Klartext']))
+    journeys = JourneySessionizer.summarize(
+        work,
+        Timestamp=('Timestamp', 'first'),
+        IATA=('IATA', 'first'), 
+        **{col: (col, func) for col, func in DECISION_TAG_AGG.items()}
+    ).set_index('JourneyID')
+
+    # Wende die Entscheidungslogik an
+    journeys = journeys.join(_resolve_decisions(journeys)).reset_index() # V19: Behält JourneyID
+    return journeys[FINAL_JOURNEY_COLS_OMS].sort_values(by="Timestamp")
+
+
+def consolidate_oms_journeys(raw_df, sessionizer=None):
     """
     NEU (V13): Konsolidiert NUR OMS-Logs.
     KORRIGIERT (V18): Wendet die 5-Minuten-Trennungsregel an.
+    'sessionizer': optional ein JourneySessionizer, der danach für update_oms_journeys() weiterverwendet wird.
     """
     if raw_df.empty:
         return pd.DataFrame(columns=FINAL_JOURNEY_COLS_OMS), raw_df
@@ -136,39 +285,16 @@ def consolidate_oms_journeys(raw_df):
     if raw_df.empty:
         return pd.DataFrame(columns=FINAL_JOURNEY_COLS_OMS), raw_df
 
-    # --- START KORREKTUR (V18): 5-Minuten-Regel für OMS ---
-    
-    raw_df.sort_values(by=['IATA', 'Timestamp'], inplace=True)
-    raw_df['TimeDiff'] = raw_df.groupby('IATA')['Timestamp'].diff()
-    raw_df['IATADiff'] = (raw_df['IATA'] != raw_df['IATA'].shift())
-    
-    time_threshold = timedelta(minutes=5)
-    
-    is_new_journey = (
-        (raw_df['TimeDiff'] > time_threshold) |
-        (raw_df['IATADiff'] == True)
-    )
-    
-    raw_df['JourneyID'] = is_new_journey.cumsum()
-    # --- ENDE KORREKTUR (V18) ---
+    # (V18) 5-Minuten-Regel für OMS
+    sessionizer = sessionizer or JourneySessionizer(key='IATA')
+    sessionizer.reset()
+    raw_df = sessionizer.assign(raw_df)
 
     print(f"--- DEBUG (consolidate_oms_journeys V18): {raw_df['JourneyID'].nunique()} OMS-Journeys (5-Min-Regel) identifiziert.")
 
     try:
         # Gruppiere nach der neuen JourneyID
-        journeys = raw_df.groupby('JourneyID').agg(
-            Timestamp=('Timestamp', 'first'),
-            IATA=('IATA', 'first'), 
-            KlartextList=('Klartext', list)
-        ).reset_index() # V19: Behält JourneyID
-
-        # Wende die Entscheidungslogik an
-        decisions = journeys.apply(_extract_decisions, axis=1, result_type='expand')
-        journeys['EDS'] = decisions[0]
-        journeys['Operator'] = decisions[1]
-        journeys['Final'] = decisions[3] 
-
-        return journeys[FINAL_JOURNEY_COLS_OMS].sort_values(by="Timestamp"), raw_df
+        return _summarize_oms_journeys(raw_df), raw_df
 
     except Exception as e:
         print(f"--- FEHLER bei consolidate_oms_journeys: {e} ---")
@@ -181,62 +307,67 @@ def consolidate_oms_journeys(raw_df):
 # --- START: SPS-LOGIK (V17 - KORRIGIERT mit 5-Minuten-Regel) ---
 # =============================================================================
 
-def _find_decision_plc(text_list): # (Umbenannt, um Konflikt zu vermeiden)
-    """Sucht in einer Liste von Klartext-Einträgen nach der finalen Entscheidung."""
-    for text in reversed(text_list): 
-        if "FEHLER:" in text:
-            return "ERROR"
-        match = re.search(r"Entscheidung vom Scanner empfangen: Decision \d \((CLEAR|REJECT)\)", text)
-        if match:
-            return match.group(1)
-    return "N/A"
+PLC_DECISION_PATTERN = r"Entscheidung vom Scanner empfangen: Decision \d \((CLEAR|REJECT)\)"
+PLC_FIRST_STEP_MARKER = "Plausibilitätsprüfung"
 
-def _find_first_step_plc(text_list): # (Umbenannt)
-    """Sucht den ersten Schritt (normalerweise 'Plausibilitätsprüfung')."""
-    for text in text_list:
-        if "Plausibilitätsprüfung" in text:
-            return text
-    return text_list[0] if text_list else "N/A"
+
+def _tag_plc_rows(klartext):
+    """
+    Pro Roh-Zeile: _Decision (ERROR / CLEAR / REJECT, sonst leer) und _FirstStep
+    (der Klartext, falls die Zeile der erste Schritt 'Plausibilitätsprüfung' sein kann).
+    """
+    def tag(text):
+        decision = text.str.extract(PLC_DECISION_PATTERN, expand=False)
+        return pd.DataFrame({
+            '_Decision': decision.mask(text.str.contains("FEHLER:", na=False), "ERROR"),
+            '_FirstStep': text.where(text.str.contains(PLC_FIRST_STEP_MARKER, na=False, regex=False)),
+        })
+
+    return _per_unique(klartext, tag)
+
+
+def plc_sessionizer():
+    """JourneySessionizer mit den SPS-Regeln (5 Minuten, FEHLER-Zeilen trennen)."""
+    return JourneySessionizer(key='IATA', split_predicates=[_plc_error_rows])
+
+
+def _summarize_plc_journeys(raw_plc_df):
+    """Eine Zeile pro SPS-JourneyID (Roh-Zeilen nach IATA/Timestamp sortiert)."""
+    work = raw_plc_df[['JourneyID', 'Timestamp', 'IATA', 'Klartext']].join(_tag_plc_rows(raw_plc_df['Klartext']))
+    summary_df = JourneySessionizer.summarize(
+        work,
+        Timestamp=('Timestamp', 'first'),
+        IATA=('IATA', 'first'),
+        Decision=('_Decision', 'last'), # letzte Entscheidung der Journey
+        _FirstStep=('_FirstStep', 'first'),
+        _FirstText=('Klartext', 'first')
+    )
+    summary_df['Decision'] = summary_df['Decision'].fillna("N/A")
+    summary_df['Klartext'] = summary_df['_FirstStep'].fillna(summary_df['_FirstText'])
+    summary_df = summary_df.drop(columns=['_FirstStep', '_FirstText'])
+    return summary_df.sort_values(by="Timestamp").reset_index(drop=True)
 
 
-def consolidate_plc_journeys(raw_plc_df):
+def consolidate_plc_journeys(raw_plc_df, sessionizer=None):
     """
     Fasst rohe SPS-Log-Einträge zu "Journeys" zusammen.
     KORRIGIERT (V17): 5-Minuten-Regel
+    V20: Gemeinsamer JourneySessionizer, Entscheidung/erster Schritt spaltenweise.
+    'sessionizer': optional (siehe plc_sessionizer()), für update_plc_journeys() weiterverwendbar.
     """
     
     if raw_plc_df.empty:
         print("--- DEBUG (consolidate_plc_journeys): Leeres DataFrame übergeben.")
         return pd.DataFrame(), raw_plc_df
 
-    raw_plc_df = raw_plc_df.sort_values(by=['IATA', 'Timestamp']).reset_index(drop=True)
-
-    raw_plc_df['TimeDiff'] = raw_plc_df.groupby('IATA')['Timestamp'].diff()
-    raw_plc_df['IATADiff'] = (raw_plc_df['IATA'] != raw_plc_df['IATA'].shift())
-    
-    time_threshold = timedelta(minutes=5) # V17-Regel
-    
-    is_new_journey = (
-        (raw_plc_df['TimeDiff'] > time_threshold) |
-        (raw_plc_df['IATADiff'] == True) |
-        (raw_plc_df['Klartext'].str.contains("FEHLER:", na=False))
-    )
-    
-    raw_plc_df['JourneyID'] = is_new_journey.cumsum()
+    sessionizer = sessionizer or plc_sessionizer()
+    sessionizer.reset()
+    raw_plc_df = sessionizer.assign(raw_plc_df).reset_index(drop=True)
 
     print(f"--- DEBUG (consolidate_plc_journeys V17): {raw_plc_df['JourneyID'].nunique()} SPS-Journeys (5-Min-Regel) identifiziert.")
 
     try:
-        summary_df = raw_plc_df.groupby('JourneyID').agg(
-            Timestamp=('Timestamp', 'first'),
-            IATA=('IATA', 'first'),
-            _KlartextList=('Klartext', list)
-        ).reset_index() 
-        
-        summary_df['Decision'] = summary_df['_KlartextList'].apply(_find_decision_plc)
-        summary_df['Klartext'] = summary_df['_KlartextList'].apply(_find_first_step_plc)
-        summary_df = summary_df.drop(columns=['_KlartextList'])
-        summary_df = summary_df.sort_values(by="Timestamp").reset_index(drop=True)
+        summary_df = _summarize_plc_journeys(raw_plc_df)
 
         print(f"--- DEBUG (consolidate_plc_journeys): Zusammenfassung mit {len(summary_df)} Zeilen erstellt.")
         
@@ -249,4 +380,105 @@ def consolidate_plc_journeys(raw_plc_df):
 
 # =============================================================================
 # --- ENDE: SPS-LOGIK ---
-# =============================================================================
\ No newline at end of file
+# =============================================================================
+
+# =============================================================================
+# --- START: INKREMENTELLE KONSOLIDIERUNG (V21) ---
+# Neue Roh-Zeilen (z.B. die nächste Rotation von scanner.log / OMS.log) werden an eine
+# bestehende Sitzung angehängt. Neu berechnet werden nur die Journeys, die neue Zeilen
+# bekommen; abgeschlossene Journeys bleiben unverändert.
+# Voraussetzung: Die neuen Zeilen sind NICHT älter als die bisherigen Zeilen derselben
+# BagID / IATA. Sonst wird (wie bisher) alles neu konsolidiert.
+# =============================================================================
+
+def _merge_journeys(journeys_df, affected_mask, new_journeys_df):
+    """Ersetzt die betroffenen Journeys; der Index bleibt eindeutig (Treeview-iid)."""
+    merged = pd.concat([journeys_df[~affected_mask], new_journeys_df])
+    return merged.sort_values(by="Timestamp").reset_index(drop=True)
+
+
+def update_scanner_journeys(journeys_df, raw_df, new_raw_df):
+    """
+    Hängt neue Scanner-Rohdaten an eine bestehende Konsolidierung an.
+    GIBT ZURÜCK: (journeys_df, raw_df) wie consolidate_scanner_journeys (raw_df kompakt).
+    """
+    if raw_df.empty or journeys_df.empty:
+        journeys_df, raw_df = consolidate_scanner_journeys(new_raw_df)
+        return journeys_df, compact_raw_df(raw_df)
+
+    new_rows = new_raw_df[new_raw_df['BagID'].notna() & (new_raw_df['BagID'] != 'N/A')]
+    new_rows = drop_known_rows(new_rows, raw_df, ignore_columns=('IATA',))
+    if new_rows.empty:
+        return journeys_df, raw_df
+
+    affected_bags = new_rows['BagID'].unique()
+    affected = raw_df['BagID'].isin(affected_bags).to_numpy()
+    old_rows = expand_raw_df(raw_df[affected])
+    # 'NO_READ' stammt aus der Konsolidierung (der Parser liefert nur 'N/A'): wieder offen machen
+    old_rows['IATA'] = old_rows['IATA'].replace('NO_READ', 'N/A')
+
+    last_seen = old_rows.groupby('BagID')['Timestamp'].max()
+    if not last_seen.empty and (new_rows['Timestamp'] < new_rows['BagID'].map(last_seen)).any():
+        print("--- INFO (update_scanner_journeys): Neue Zeilen liegen vor bekannten Zeilen, konsolidiere alles neu. ---")
+        all_rows = expand_raw_df(raw_df)
+        all_rows['IATA'] = all_rows['IATA'].replace('NO_READ', 'N/A')
+        journeys_df, raw_df = consolidate_scanner_journeys(pd.concat([all_rows, new_rows], ignore_index=True))
+        return journeys_df, compact_raw_df(raw_df)
+
+    sub_journeys, sub_raw = consolidate_scanner_journeys(pd.concat([old_rows, new_rows], ignore_index=True))
+    print(f"--- INFO (update_scanner_journeys): {len(affected_bags)} BagIDs neu berechnet, "
+          f"{len(new_rows)} neue Zeilen. ---")
+    journeys_df = _merge_journeys(journeys_df, journeys_df['BagID'].isin(affected_bags).to_numpy(), sub_journeys)
+    return journeys_df, concat_raw_frames([raw_df[~affected], compact_raw_df(sub_raw)])
+
+
+def _update_sessionized(journeys_df, raw_df, new_rows, sessionizer, consolidate, summarize):
+    """Gemeinsamer Ablauf für OMS und SPS (JourneySessionizer mit gemerkten offenen Journeys)."""
+    new_rows = drop_known_rows(new_rows, raw_df, ignore_columns=('JourneyID',))
+    if new_rows.empty:
+        return journeys_df, raw_df
+
+    if not sessionizer.is_newer(new_rows):
+        print("--- INFO: Neue Zeilen liegen vor bekannten Zeilen, konsolidiere alles neu. ---")
+        all_rows = pd.concat([expand_raw_df(raw_df).drop(columns=['JourneyID']), new_rows], ignore_index=True)
+        journeys_df, raw_df = consolidate(all_rows, sessionizer)
+        return journeys_df, compact_raw_df(raw_df)
+
+    new_rows = sessionizer.assign(new_rows)
+    affected_ids = new_rows['JourneyID'].unique()
+    affected = raw_df['JourneyID'].isin(affected_ids).to_numpy()
+    # Alte Zeilen zuerst: die neuen Zeilen einer fortgesetzten Journey sind jünger
+    rows = pd.concat([expand_raw_df(raw_df[affected]), new_rows], ignore_index=True)
+    rows = rows.sort_values(by=['JourneyID'], kind='stable')
+    print(f"--- INFO: {len(affected_ids)} Journeys neu berechnet, {len(new_rows)} neue Zeilen. ---")
+    journeys_df = _merge_journeys(journeys_df, journeys_df['JourneyID'].isin(affected_ids).to_numpy(), summarize(rows))
+    return journeys_df, concat_raw_frames([raw_df, compact_raw_df(new_rows.reset_index(drop=True))])
+
+
+def update_oms_journeys(journeys_df, raw_df, new_raw_df, sessionizer):
+    """
+    Hängt neue OMS-Rohdaten an. 'sessionizer' ist derselbe, der bei consolidate_oms_journeys()
+    übergeben wurde. GIBT ZURÜCK: (journeys_df, raw_df).
+    """
+    if raw_df.empty or journeys_df.empty:
+        journeys_df, raw_df = consolidate_oms_journeys(new_raw_df, sessionizer)
+        return journeys_df, compact_raw_df(raw_df)
+    new_rows = new_raw_df[new_raw_df['IATA'].notna() & (new_raw_df['IATA'] != 'N/A')]
+    return _update_sessionized(journeys_df, raw_df, new_rows, sessionizer,
+                               consolidate_oms_journeys, _summarize_oms_journeys)
+
+
+def update_plc_journeys(journeys_df, raw_plc_df, new_raw_df, sessionizer):
+    """
+    Hängt neue SPS-Rohdaten an. 'sessionizer' ist derselbe, der bei consolidate_plc_journeys()
+    übergeben wurde. GIBT ZURÜCK: (journeys_df, raw_df).
+    """
+    if raw_plc_df.empty or journeys_df.empty:
+        journeys_df, raw_plc_df = consolidate_plc_journeys(new_raw_df, sessionizer)
+        return journeys_df, compact_raw_df(raw_plc_df)
+    return _update_sessionized(journeys_df, raw_plc_df, new_raw_df, sessionizer,
+                               consolidate_plc_journeys, _summarize_plc_journeys)
+
+# =============================================================================
+# --- ENDE: INKREMENTELLE KONSOLIDIERUNG ---
+# =============================================================================
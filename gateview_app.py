@@ -19,7 +19,11 @@ try:
     from tkcalendar import DateEntry
     
     from log_parser import parse_log_file         # Für Scanner (.log)
+    from log_index import LogTimeIndex            # Zeit-Index (Sprung an Zeitfenster)
+    from timespan_dialog import TimespanDialog
     from oms_log_parser import parse_oms_log      # NEU: Für OMS (.log)
+    from parallel_loader import load_files_parallel # Paralleles Laden mehrerer Dateien
+    from raw_schema import compact_raw_df, drop_duplicate_rows, with_original_log # Kompaktes Roh-Schema
     
     import plclog_journey_parser                  
     import plclog_csv_parser                      
@@ -27,7 +31,11 @@ try:
     from data_processor import (
         consolidate_scanner_journeys, 
         consolidate_oms_journeys,
-        consolidate_plc_journeys, 
+        update_scanner_journeys,    # Inkrementell: neue Dateien anhängen
+        update_oms_journeys,
+        update_plc_journeys,
+        JourneySessionizer,
+        plc_sessionizer,
         FINAL_JOURNEY_COLS_SCANNER, # Für Tab 1
         FINAL_JOURNEY_COLS_OMS      # Für Tab 4
     )
@@ -68,6 +76,10 @@ class GateViewApp(BaseApp):
         self.plc_raw_df = pd.DataFrame() 
         self.plc_journeys_df = pd.DataFrame() 
         self.plc_error_df = pd.DataFrame()
+        # NEU: Offene Journeys (OMS/SPS) für das Anhängen weiterer Dateien
+        self.oms_sessionizer = JourneySessionizer(key='IATA')
+        self.plc_sessionizer = plc_sessionizer()
+        self.append_mode = tk.BooleanVar(value=False)
         
         self.loading_win = None
         self._setup_ui()
@@ -79,7 +91,9 @@ class GateViewApp(BaseApp):
         
         ttk.Button(button_frame, text="1a. Scanner-Logs laden", command=lambda: self._load_from_dialog(mode="scanner_full")).pack(side=tk.LEFT, padx=(5,0))
         ttk.Button(button_frame, text="1b. Scanner (Letzter Tag)", command=lambda: self._load_from_dialog(mode="scanner_last_day"), style='Accent.TButton').pack(side=tk.LEFT, padx=(5,5))
+        ttk.Button(button_frame, text="1c. Scanner (Zeitraum)", command=lambda: self._load_from_dialog(mode="scanner_timespan")).pack(side=tk.LEFT, padx=(0,5))
         self.oms_button = ttk.Button(button_frame, text="2. OMS-Logs laden", command=lambda: self._load_from_dialog(mode="oms"), state="normal"); self.oms_button.pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_frame, text="Anhängen", variable=self.append_mode).pack(side=tk.LEFT, padx=(0, 5)) # NEU: Neue Dateien an geladene Daten anhängen
         
         ttk.Button(button_frame, text="3. SPS-Journeys laden (CSV)", command=self._load_plc_journeys_from_dialog, style='Accent.TButton').pack(side=tk.LEFT, padx=(15, 5))
         ttk.Button(button_frame, text="4. SPS-Fehler laden (CSV)", command=self._load_plc_errors_from_dialog, style='Accent.TButton').pack(side=tk.LEFT, padx=5)
@@ -204,21 +218,24 @@ class GateViewApp(BaseApp):
     def on_ftp_download_complete(self, downloaded_files, mode="scanner_full"):
         messagebox.showinfo("Download Abgeschlossen", f"{len(downloaded_files)} Datei(en) heruntergeladen.\nAnalyse wird gestartet.", parent=self)
         
-        if mode == "oms":
+        append = self.append_mode.get() # Im Haupt-Thread lesen (Tk-Variable), gilt für den ganzen Ladevorgang
+        if append:
+            pass # NEU: Geladene Daten behalten (siehe _load_from_dialog)
+        elif mode == "oms":
             self.oms_raw_df = pd.DataFrame()
             self.oms_journeys_df = pd.DataFrame()
         else: # scanner
             self.scanner_raw_df = pd.DataFrame()
             self.scanner_journeys_df = pd.DataFrame()
             
-        self._start_loading_process(downloaded_files, mode)
+        self._start_loading_process(downloaded_files, mode, append=append)
 
-    def _start_loading_process(self, file_paths, mode):
+    def _start_loading_process(self, file_paths, mode, time_window=None, append=False):
         self._create_loading_window()
         
         load_type = "oms" if mode == "oms" else "scanner"
         
-        thread = threading.Thread(target=self._load_and_process_files, args=(file_paths, mode), daemon=True); thread.start()
+        thread = threading.Thread(target=self._load_and_process_files, args=(file_paths, mode, time_window, append), daemon=True); thread.start()
         self.after(100, self._check_thread, thread, load_type) 
 
     def _load_from_dialog(self, mode):
@@ -236,14 +253,42 @@ class GateViewApp(BaseApp):
         config["last_gateview_dir"] = os.path.dirname(file_paths[0]); cfg.save_config(config) # Nimm das Verzeichnis der ersten Datei
         # --- ENDE KORREKTUR ---
         
-        if mode == "oms":
+        time_window = None
+        if mode == "scanner_timespan":
+            # NEU: Zeitraum über den Zeit-Index wählen (liest nur Stichproben der Dateien)
+            available_start, available_end = self._get_scanner_time_range(file_paths)
+            result = TimespanDialog(self, available_start, available_end, total_entries=None).show()
+            if not result:
+                return
+            if result["load_all"]:
+                mode = "scanner_full"
+            else:
+                time_window = (result["start"], result["end"])
+        
+        append = self.append_mode.get() # Im Haupt-Thread lesen (Tk-Variable), gilt für den ganzen Ladevorgang
+        if append:
+            pass # NEU: Geladene Daten behalten, nur betroffene Journeys neu berechnen
+        elif mode == "oms":
             self.oms_raw_df = pd.DataFrame()
             self.oms_journeys_df = pd.DataFrame()
         else: # scanner_full or scanner_last_day
             self.scanner_raw_df = pd.DataFrame() 
             self.scanner_journeys_df = pd.DataFrame()
             
-        self._start_loading_process(file_paths, mode) # Übergebe das Tuple
+        self._start_loading_process(file_paths, mode, time_window, append) # Übergebe das Tuple
+
+    def _get_scanner_time_range(self, file_paths):
+        """Frühester und spätester Zeitstempel (Lokalzeit) der ausgewählten Scanner-Logs laut Zeit-Index."""
+        starts, ends = [], []
+        for file_path in file_paths:
+            try:
+                index = LogTimeIndex.for_file(file_path)
+            except OSError as e:
+                print(f"Zeit-Index für {os.path.basename(file_path)} nicht verfügbar: {e}")
+                continue
+            if index.first_timestamp: starts.append(index.first_timestamp)
+            if index.last_timestamp: ends.append(index.last_timestamp)
+        return (min(starts) if starts else None), (max(ends) if ends else None)
 
     # --- SPS-Funktionen (Tab 2 & 3) - Unverändert ---
     def _load_plc_journeys_from_dialog(self):
@@ -280,7 +325,9 @@ class GateViewApp(BaseApp):
             for file_path in file_paths:
                 new_df = plclog_journey_parser.parse_log(
                     file_path,
-                    lambda p, f: self.after(0, self._update_progress, p, f)
+                    lambda p, f: self.after(0, self._update_progress, p, f),
+                    lazy_log=True,
+                    use_cache=True # NEU: Unveränderte Dateien aus dem Parse-Cache
                 )
                 if not new_df.empty:
                     temp_df = pd.concat([temp_df, new_df])
@@ -290,9 +337,11 @@ class GateViewApp(BaseApp):
                 self.after(0, self._populate_plc_tabs) 
                 return 
             
-            raw_data_with_iata = pd.concat([self.plc_raw_df, temp_df]).drop_duplicates().sort_values(by="Timestamp").reset_index(drop=True)
+            raw_data_with_iata = drop_duplicate_rows(temp_df).sort_values(by="Timestamp").reset_index(drop=True)
             
-            self.plc_journeys_df, self.plc_raw_df = consolidate_plc_journeys(raw_data_with_iata)
+            # NEU: Nur Journeys mit neuen Zeilen neu berechnen (statt alles erneut zu konsolidieren)
+            self.plc_journeys_df, self.plc_raw_df = update_plc_journeys(
+                self.plc_journeys_df, self.plc_raw_df, raw_data_with_iata, self.plc_sessionizer)
             
             self.after(0, self._populate_plc_tabs)
             
@@ -430,18 +479,21 @@ class GateViewApp(BaseApp):
         else: 
             self.after(100, self._finalize_loading, load_type) 
 
-    def _load_and_process_files(self, file_paths, mode):
+    def _load_and_process_files(self, file_paths, mode, time_window=None, append=False):
+        # 'append': Wert der Checkbox "Anhängen" beim Start (Tk-Variablen nicht aus dem Lade-Thread lesen)
         load_last_day = (mode == "scanner_last_day")
         
         if mode == "oms":
             # --- OMS-Ladevorgang (Tab 4) ---
-            temp_raw_df = pd.DataFrame()
-            for file_path in file_paths:
-                new_df = parse_oms_log(
-                    file_path, 
-                    lambda p, f: self.after(0, self._update_progress, p, f)
-                )
-                temp_raw_df = pd.concat([temp_raw_df, new_df])
+            # NEU: Mehrere Dateien parallel (Prozess-Pool), EIN concat am Ende
+            temp_raw_df = load_files_parallel(
+                parse_oms_log, file_paths,
+                lambda p, f: self.after(0, self._update_progress, p, f),
+                lazy_log=True, # OriginalLog erst im Detailfenster aus der Datei lesen
+                # NEU: Eine einzelne (große) Datei wird in Byte-Bereichen parallel geparst
+                workers=(os.cpu_count() or 1) if len(file_paths) == 1 else 1,
+                use_cache=True # NEU: Unveränderte Dateien aus dem Parse-Cache
+            )
             
             if temp_raw_df.empty:
                 print("Keine OMS-Daten gefunden.")
@@ -449,21 +501,27 @@ class GateViewApp(BaseApp):
 
             self.after(0, self._update_loading_text, "Daten werden konsolidiert (kann dauern)...")
             temp_raw_df['Timestamp'] = pd.to_datetime(temp_raw_df['Timestamp'], utc=True)
-            self.oms_raw_df = temp_raw_df.drop_duplicates().reset_index(drop=True)
+            new_raw_df = drop_duplicate_rows(temp_raw_df).reset_index(drop=True)
             
-            if not self.oms_raw_df.empty:
-                self.oms_journeys_df, self.oms_raw_df = consolidate_oms_journeys(self.oms_raw_df)
+            if append and not self.oms_raw_df.empty:
+                # NEU: Nur Journeys mit neuen Zeilen neu berechnen
+                self.oms_journeys_df, self.oms_raw_df = update_oms_journeys(
+                    self.oms_journeys_df, self.oms_raw_df, new_raw_df, self.oms_sessionizer)
+            elif not new_raw_df.empty:
+                self.oms_journeys_df, self.oms_raw_df = consolidate_oms_journeys(new_raw_df, self.oms_sessionizer)
+                self.oms_raw_df = compact_raw_df(self.oms_raw_df)
 
         else:
             # --- SCANNER-Ladevorgang (Tab 1) ---
-            temp_raw_df = pd.DataFrame()
-            for file_path in file_paths:
-                new_df = parse_log_file(
-                    file_path, 
-                    lambda p, f: self.after(0, self._update_progress, p, f),
-                    load_last_day=load_last_day
-                )
-                temp_raw_df = pd.concat([temp_raw_df, new_df])
+            # NEU: Mehrere Dateien parallel (Prozess-Pool), EIN concat am Ende
+            temp_raw_df = load_files_parallel(
+                parse_log_file, file_paths,
+                lambda p, f: self.after(0, self._update_progress, p, f),
+                load_last_day=load_last_day,
+                time_window=time_window,
+                lazy_log=True, # OriginalLog erst im Detailfenster aus der Datei lesen
+                use_cache=True # NEU: Unveränderte Dateien aus dem Parse-Cache
+            )
             
             if temp_raw_df.empty:
                 print("Keine Scanner-Daten gefunden.")
@@ -471,10 +529,15 @@ class GateViewApp(BaseApp):
 
             self.after(0, self._update_loading_text, "Daten werden konsolidiert (kann dauern)...")
             temp_raw_df['Timestamp'] = pd.to_datetime(temp_raw_df['Timestamp'], utc=True)
-            self.scanner_raw_df = temp_raw_df.drop_duplicates().reset_index(drop=True)
+            new_raw_df = drop_duplicate_rows(temp_raw_df).reset_index(drop=True)
             
-            if not self.scanner_raw_df.empty:
-                self.scanner_journeys_df, self.scanner_raw_df = consolidate_scanner_journeys(self.scanner_raw_df)
+            if append and not self.scanner_raw_df.empty:
+                # NEU: Nur BagIDs mit neuen Zeilen neu berechnen
+                self.scanner_journeys_df, self.scanner_raw_df = update_scanner_journeys(
+                    self.scanner_journeys_df, self.scanner_raw_df, new_raw_df)
+            elif not new_raw_df.empty:
+                self.scanner_journeys_df, self.scanner_raw_df = consolidate_scanner_journeys(new_raw_df)
+                self.scanner_raw_df = compact_raw_df(self.scanner_raw_df)
 
     def _finalize_loading(self, load_type):
         if self.loading_win: 
@@ -713,6 +776,7 @@ class GateViewApp(BaseApp):
             (self.scanner_raw_df['BagID'] == bag_id) & 
             (self.scanner_raw_df['IATA'] == iata)
         ].sort_values(by="Timestamp")
+        history_df = with_original_log(history_df) # Liest die Rohzeilen bei Bedarf aus der Datei
         
         routing_info = self._extract_routing_info(history_df)
         
@@ -762,6 +826,7 @@ class GateViewApp(BaseApp):
             (self.oms_raw_df['IATA'] == iata) &
             (self.oms_raw_df['JourneyID'] == journey_id)
         ].sort_values(by="Timestamp")
+        history_df = with_original_log(history_df) # Liest die Rohzeilen bei Bedarf aus der Datei
         
         routing_info = self._extract_routing_info(history_df)
         
@@ -805,6 +870,7 @@ class GateViewApp(BaseApp):
 
     def _show_plc_history_window(self, iata, history_df):
         win = tk.Toplevel(self); win.title(f"SPS-Detail-Analyse für IATA: {iata}"); win.geometry("1100x700")
+        history_df = with_original_log(history_df) # Liest die Rohzeilen bei Bedarf aus der Datei
         
         summary_frame = ttk.LabelFrame(win, text="SPS-Vorgang (nur PlcLog.csv)", padding=10); summary_frame.pack(fill=tk.X, padx=10, pady=10)
         
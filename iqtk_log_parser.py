@@ -1,16 +1,19 @@
-import re; import pandas as pd; from datetime import datetime
+import re
+from parser_registry import LogFormat, register_format, parse_file
 TS_PATTERN = re.compile(r"^(\d{14}):")
 RESULT_PATTERN = re.compile(r"(Nylon Sphere|Aluminum Sphere):.*(pass|fail)\}")
 def parse_line(line):
     results = [f"{m.group(1)}-Test: {m.group(2).upper()}" for m in RESULT_PATTERN.finditer(line)]
     if results: return f"[IQTK] Bildqualitäts-Test: " + ", ".join(results)
     return None
+# NEU (V2-REG): Format-Beschreibung für den gemeinsamen Treiber (parser_registry.py)
+LOG_FORMAT = register_format(LogFormat(
+    name="iqtk", source="IQTK",
+    file_patterns=[r'^iqtk.*\.(log|txt)$'],
+    prefilter=["Nylon Sphere",
+               "Aluminum Sphere"],
+    ts_pattern=TS_PATTERN, ts_format="compact",
+    parse_line=parse_line))
+
 def parse_log(file_path):
-    records = []
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            if ts_match := TS_PATTERN.search(line):
-                try: dt = datetime.strptime(ts_match.group(1), "%Y%m%d%H%M%S")
-                except ValueError: continue
-                if klartext := parse_line(line): records.append({"Timestamp": dt, "Quelle": "IQTK", "Ereignis": klartext, "OriginalLog": line.strip()})
-    return pd.DataFrame(records)
\ No newline at end of file
+    return parse_file(file_path, LOG_FORMAT)
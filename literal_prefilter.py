@@ -0,0 +1,130 @@
+# literal_prefilter.py
+print("--- [V1-PREFILTER] literal_prefilter.py wird geladen (Literal-Vorfilter für viele Regex-Regeln, erste Regel gewinnt) ... ---")
+
+import re
+
+# Der Regex-Parser der Standardbibliothek (ab Python 3.11 unter re._parser, vorher sre_parse)
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+LITERAL = sre_parse.LITERAL
+SUBPATTERN = sre_parse.SUBPATTERN
+BRANCH = sre_parse.BRANCH
+REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+
+def _best(candidates):
+    """Die Alternativen-Menge, deren kürzestes Literal am längsten ist (seltener im Text = besserer Filter)."""
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: (min(len(literal) for literal in literals), -len(literals)))
+
+
+def _required_in_sequence(sequence):
+    """
+    Menge von Literalen, von denen JEDER Treffer der Sequenz mindestens eines enthält (oder None).
+    Nur ASCII-Literale (in Kleinbuchstaben): Für ASCII-Text ist das unter IGNORECASE exakt.
+    """
+    candidates = []
+    run = []
+
+    def flush():
+        if run:
+            candidates.append({''.join(run)})
+            run.clear()
+
+    for op, av in sequence:
+        if op is LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        flush()
+        if op is SUBPATTERN:
+            inner = _required_in_sequence(av[-1])
+        elif op is BRANCH:
+            alternatives = [_required_in_sequence(branch) for branch in av[1]]
+            inner = set().union(*alternatives) if all(alternatives) else None
+        elif op in REPEATS and av[0] >= 1:
+            inner = _required_in_sequence(av[2])
+        else:
+            inner = None # Zeichenklassen, '.', Anker, optionale Teile: kein Pflicht-Literal
+        if inner:
+            candidates.append(inner)
+    flush()
+    return _best(candidates)
+
+
+def required_literals(regex):
+    """
+    Pflicht-Literale eines Regex (String oder kompiliert): Jeder Treffer auf einem
+    kleingeschriebenen ASCII-Text enthält mindestens eines davon.
+    GIBT ZURÜCK: Tupel der Literale oder None (kein Vorfilter möglich, Regel wird immer geprüft).
+    """
+    pattern = regex.pattern if hasattr(regex, 'pattern') else regex
+    try:
+        literals = _required_in_sequence(sre_parse.parse(pattern))
+    except Exception:
+        return None
+    return tuple(sorted(literals)) if literals else None
+
+
+class PrefilteredMatcher:
+    """
+    Sucht die ERSTE passende Regel aus einer geordneten Liste kompilierter Regex.
+
+    Stufe 1: Ein kombinierter Regex aus allen Pflicht-Literalen. Die meisten Zeilen enthalten
+    keines und sind nach einem Suchlauf erledigt; sonst wird jeweils ein Zeichen hinter dem
+    Anfang des letzten Fundes weitergesucht, damit auch überlappende Literale gefunden werden.
+    Stufe 2: Nur Regeln, deren Literal im Text vorkommt (plus Regeln ohne Literal), werden mit
+    ihrem vollen Regex geprüft, in der ursprünglichen Reihenfolge.
+
+    Die Literale sind kleingeschrieben: 'text' muss (wie bisher in MV3DLogParser) bereits
+    mit .lower() umgewandelt sein. Nicht-ASCII-Text prüft sicherheitshalber alle Regeln.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.rule_literals = [required_literals(pattern) for pattern in self.patterns]
+        self._all = list(range(len(self.patterns)))
+        self._always = [i for i, literals in enumerate(self.rule_literals) if literals is None]
+        all_literals = sorted({literal for literals in self.rule_literals if literals for literal in literals},
+                              key=len, reverse=True)
+        # Literal -> Regeln, inklusive der Regeln aller Literale, die darin enthalten sind: An einer Position
+        # liefert die Alternation nur das längste Literal (absteigend sortiert), kürzere Präfixe stecken darin.
+        self._literal_rules = {literal: sorted(i for i, literals in enumerate(self.rule_literals)
+                                               if literals and any(other in literal for other in literals))
+                               for literal in all_literals}
+        # Ohne Lookahead o.ä.: Nur dann prüft 're' vorab die Anfangszeichen aller Alternativen (schneller Suchlauf)
+        self._gate = re.compile('|'.join(map(re.escape, all_literals))) if all_literals else None
+
+    @property
+    def prefiltered_count(self):
+        """Anzahl der Regeln mit Literal-Vorfilter."""
+        return len(self.patterns) - len(self._always)
+
+    def _candidates(self, text):
+        if self._gate is None or not text.isascii():
+            return self._all
+        search = self._gate.search
+        match = search(text)
+        if match is None:
+            return self._always
+        found = []
+        while match is not None:
+            found.append(match.group())
+            match = search(text, match.start() + 1)
+        if len(found) == 1 and not self._always:
+            return self._literal_rules[found[0]]
+        rules = set(self._always)
+        for literal in found:
+            rules.update(self._literal_rules[literal])
+        return sorted(rules)
+
+    def search(self, text):
+        """GIBT ZURÜCK: (Regel-Index, Match) der ersten passenden Regel oder None."""
+        for i in self._candidates(text):
+            match = self.patterns[i].search(text)
+            if match:
+                return i, match
+        return None
@@ -0,0 +1,207 @@
+# log_index.py
+print("--- [V1-IDX] log_index.py wird geladen (Zeit -> Byte-Offset Index für Scanner-Logs) ... ---")
+
+import os
+import re
+import json
+import hashlib
+import bisect
+from datetime import datetime, timedelta
+
+from log_timestamps import TimestampDecoder
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".tsidx"
+INDEX_STEP = 1024 * 1024          # Ein Index-Eintrag pro MB
+SAMPLE_WINDOW = 8 * 1024          # Startgröße des Lesefensters pro Stichprobe
+HEAD_HASH_BYTES = 4096            # Erkennt ersetzte (rotierte) Dateien
+SEEK_SLACK = timedelta(minutes=1) # Toleranz für nicht streng sortierte Zeilen
+
+# Scanner-Format (identisch zu log_parser.TS_PATTERN)
+SYSLOG_TS_PATTERN = re.compile(rb"([A-Z][a-z]{2}\s+[A-Z][a-z]{2}\s+\d{2}\s+\d{2}:\d{2}:\d{2})\.\d+")
+
+
+def index_path_for(file_path):
+    """
+    Pfad der Index-Datei neben dem Log. Ohne '.log' im Namen, damit der
+    Dateidialog (Filter '*.log*') den Index nicht als Log anbietet.
+    """
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, name.replace('.', '_') + INDEX_SUFFIX)
+
+
+def _head_hash(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha1(f.read(HEAD_HASH_BYTES)).hexdigest()
+
+
+class LogTimeIndex:
+    """
+    Dünner Index (Lokalzeit -> Byte-Offset) für ein Log mit Zeitstempeln ohne Jahr.
+
+    Pro INDEX_STEP Bytes wird per Seek eine Stichprobe genommen: der Offset der ersten
+    Zeile mit Zeitstempel ab dieser Position. Der Aufbau liest also nur einen Bruchteil
+    der Datei. Der Index wird neben dem Log gespeichert und bei angehängten Daten
+    (gleicher Dateianfang, größere Datei) nur erweitert.
+    """
+
+    def __init__(self, file_path, entries=None, size=0, mtime=0.0, head_hash=None):
+        self.file_path = file_path
+        self.offsets = [offset for offset, _ in (entries or [])]
+        self.timestamps = [ts for _, ts in (entries or [])]
+        self.size = size
+        self.mtime = mtime
+        self.head_hash = head_hash
+        self.last_timestamp = None
+
+    # --- Laden / Aufbauen ---
+
+    @classmethod
+    def for_file(cls, file_path, step=INDEX_STEP):
+        """Lädt den Index neben der Datei, erweitert oder baut ihn neu auf und speichert ihn."""
+        size = os.path.getsize(file_path)
+        mtime = os.path.getmtime(file_path)
+        head_hash = _head_hash(file_path)
+
+        index = cls._load(file_path)
+        if index is None or index.head_hash != head_hash or index.size > size or not index.offsets:
+            index = cls(file_path, head_hash=head_hash)
+
+        if index.size != size or index.mtime != mtime or not index.offsets:
+            index._extend(size, step)
+            index.size, index.mtime = size, mtime
+            index._save()
+
+        index.last_timestamp = index._find_last_timestamp()
+        return index
+
+    @classmethod
+    def _load(cls, file_path):
+        path = index_path_for(file_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            entries = [(offset, datetime.fromisoformat(ts)) for offset, ts in data["entries"]]
+            return cls(file_path, entries, data["size"], data["mtime"], data["head_hash"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"--- log_index: WARNUNG: Index {os.path.basename(path)} unlesbar, baue neu auf ({e}) ---")
+            return None
+
+    def _save(self):
+        path = index_path_for(self.file_path)
+        data = {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "mtime": self.mtime,
+            "head_hash": self.head_hash,
+            "entries": [[offset, ts.isoformat()] for offset, ts in zip(self.offsets, self.timestamps)]
+        }
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError as e:
+            # z.B. schreibgeschütztes Verzeichnis: Index nur im Speicher verwenden
+            print(f"--- log_index: WARNUNG: Index konnte nicht gespeichert werden: {e} ---")
+
+    def _decoder_after(self, position):
+        """Decoder, dessen Jahr/Monat dem letzten Eintrag vor 'position' entspricht."""
+        i = bisect.bisect_right(self.offsets, position) - 1
+        if i < 0:
+            return TimestampDecoder()
+        decoder = TimestampDecoder(start_year=self.timestamps[i].year)
+        decoder.last_month = self.timestamps[i].month
+        return decoder
+
+    def _extend(self, size, step):
+        start = self.offsets[-1] + step if self.offsets else 0
+        decoder = self._decoder_after(start)
+        with open(self.file_path, 'rb') as f:
+            for sample_pos in range(start, size, step):
+                found = self._first_timestamp_at(f, sample_pos, min(size, sample_pos + step), decoder)
+                if found is None:
+                    continue
+                offset, ts = found
+                if self.offsets and offset <= self.offsets[-1]:
+                    continue
+                self.offsets.append(offset)
+                self.timestamps.append(ts)
+
+    @staticmethod
+    def _first_timestamp_at(f, sample_pos, limit, decoder):
+        """Offset und Zeit der ersten Zeile mit Zeitstempel, die in [sample_pos, limit) beginnt."""
+        window = SAMPLE_WINDOW
+        while True:
+            f.seek(sample_pos)
+            data = f.read(window)
+            # Bei sample_pos > 0 ist die erste (angebrochene) Zeile nicht verwertbar
+            line_start = 0 if sample_pos == 0 else data.find(b'\n') + 1
+            if line_start or sample_pos == 0:
+                while sample_pos + line_start < limit:
+                    line_end = data.find(b'\n', line_start)
+                    if line_end == -1:
+                        break # Zeile reicht über das Fenster hinaus
+                    if m := SYSLOG_TS_PATTERN.match(data, line_start, line_end):
+                        ts = decoder.parse_syslog(m.group(1).decode('ascii', errors='ignore'))
+                        if ts:
+                            return sample_pos + line_start, ts
+                    line_start = line_end + 1
+                else:
+                    return None
+            if len(data) < window or sample_pos + window > limit + INDEX_STEP:
+                return None
+            window *= 4
+
+    def _find_last_timestamp(self):
+        """Letzter Zeitstempel der Datei (liest rückwärts in wachsenden Blöcken)."""
+        if not self.offsets:
+            return None
+        window = SAMPLE_WINDOW
+        with open(self.file_path, 'rb') as f:
+            while True:
+                start = max(self.offsets[-1], self.size - window)
+                f.seek(start)
+                data = f.read(self.size - start)
+                decoder = self._decoder_after(start)
+                lines = data.split(b'\n')
+                if start > 0 and start != self.offsets[-1]:
+                    lines = lines[1:] # angebrochene erste Zeile
+                last = None
+                for line in lines:
+                    if m := SYSLOG_TS_PATTERN.match(line):
+                        ts = decoder.parse_syslog(m.group(1).decode('ascii', errors='ignore'))
+                        if ts:
+                            last = ts
+                if last is not None or start == self.offsets[-1]:
+                    return last or self.timestamps[-1]
+                window *= 4
+
+    # --- Abfragen ---
+
+    @property
+    def first_timestamp(self):
+        return self.timestamps[0] if self.timestamps else None
+
+    def byte_range(self, start_dt=None, end_dt=None):
+        """
+        Byte-Bereich, der alle Zeilen im Zeitfenster [start_dt, end_dt] enthält (Binärsuche).
+        GIBT ZURÜCK: (start_offset, end_offset oder None für Dateiende, seed_timestamp)
+        'seed_timestamp' ist der Index-Zeitpunkt am Start-Offset (für Jahr/Jahreswechsel).
+        """
+        if not self.offsets:
+            return 0, None, None
+
+        start_i = 0
+        if start_dt is not None:
+            start_i = max(0, bisect.bisect_left(self.timestamps, start_dt - SEEK_SLACK) - 1)
+
+        end_offset = None
+        if end_dt is not None:
+            end_i = bisect.bisect_right(self.timestamps, end_dt + SEEK_SLACK)
+            if end_i < len(self.offsets):
+                end_offset = self.offsets[end_i]
+
+        return self.offsets[start_i], end_offset, self.timestamps[start_i]
@@ -2,10 +2,20 @@
 print("--- [V23-FIX-OMS-V12] log_parser.py wird geladen (UTC, 4-Digit-IATA, Robuste Regex V12) ... ---")
 
 import re
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
-import pytz # Import für Zeitzonen
+from itertools import repeat
+
+from log_stream import iter_line_blocks, line_offsets, file_size, DEFAULT_BLOCK_SIZE
+from log_timestamps import TimestampDecoder
+from log_index import LogTimeIndex
+from raw_schema import LOG_REF_COLUMNS, line_crc
+from parse_cache import get_default_cache, year_hint
+
+# Geht in den Cache-Schlüssel ein (parse_cache.py): erhöhen, wenn sich das Ergebnis des Parsers ändert
+PARSER_VERSION = "V30"
 
 # --- Normalisierungsfunktion (unverändert) ---
 def _normalize_iata(iata_str):
@@ -41,6 +51,62 @@ IATA_PATTERN = re.compile(
 )
 CCT_PATTERN = re.compile(r'@(CCT\d+)') 
 
+# --- NEU (V28): Spaltenweise (vektorisierte) ID-Extraktion für den Batch-Modus ---
+# Jede IATA_PATTERN-Variante braucht ein '=' (Fall 1) oder 'RFID'/'IATA' (Fall 2/3, ohne Groß/Klein).
+# Zeilen ohne diese Hinweise werden gar nicht erst mit der (teuren) IATA-Regex durchsucht.
+IATA_HINT_PATTERN = re.compile(r'rfid|iata', re.IGNORECASE)
+
+def normalize_iata_series(raw):
+    """
+    Vektorisierte Variante von _normalize_iata für eine Spalte aus Strings / NaN
+    (z.B. das Ergebnis von str.extract). Liefert exakt dieselben Werte wie _normalize_iata.
+    Normalisiert wird nur jeder unterschiedliche Rohwert einmal.
+    """
+    raw = pd.Series(raw, dtype=object)
+    codes, uniques = pd.factorize(raw, use_na_sentinel=True)
+    cleaned = pd.Series(uniques, dtype=object).astype(str).str.replace('L', '', regex=False).str.strip()
+    normalized = pd.Series("N/A", index=cleaned.index, dtype=object)
+    is_four = cleaned.str.fullmatch(r'[0-9]{4}')
+    is_three = cleaned.str.fullmatch(r'[0-9]{3}')
+    normalized[is_four] = cleaned[is_four]
+    normalized[is_three] = "0" + cleaned[is_three]
+    # NaN (kein Treffer) -> Code -1 -> "N/A"
+    lookup = np.append(normalized.to_numpy(dtype=object), "N/A")
+    return pd.Series(lookup[codes], index=raw.index, dtype=object)
+
+def _extract_where(lines, mask, pattern, expand):
+    """str.extract nur für die Zeilen in 'mask' (Rest: NaN)."""
+    extracted = lines[mask].str.extract(pattern, expand=expand)
+    return extracted.reindex(lines.index)
+
+def extract_ids_batch(lines, bag_id_pattern=BAG_ID_PATTERN, iata_pattern=IATA_PATTERN, cct_pattern=CCT_PATTERN):
+    """
+    Extrahiert BagID, IATA und Gerät für eine ganze Spalte von Zeilen mit str.extract
+    (gleiche Regex und gleiche Gruppen-Zuweisung wie die Zeile-für-Zeile-Logik).
+    Vorher schließen schnelle Teilstring-Masken Zeilen aus, in denen die Regex nicht treffen kann.
+    'cct_pattern=None' -> Device ist immer "N/A" (OMS).
+    GIBT ZURÜCK: DataFrame mit den Spalten BagID, IATA, Device (fehlende Werte = "N/A")
+    """
+    lines = pd.Series(lines, dtype=object)
+    bag_ids = _extract_where(lines, lines.str.contains('"0', regex=False), bag_id_pattern, expand=False)
+    
+    iata_mask = lines.str.contains('=', regex=False, na=False).astype(bool)
+    rest = ~iata_mask
+    iata_mask[rest] = lines[rest].str.contains(IATA_HINT_PATTERN, na=False).to_numpy(bool)
+    iata_groups = _extract_where(lines, iata_mask, iata_pattern, expand=True)
+    # Wie bisher: group(1) or group(3) or group(4)
+    raw_iata = iata_groups[0].fillna(iata_groups[2]).fillna(iata_groups[3])
+    
+    devices = "N/A"
+    if cct_pattern is not None:
+        devices = _extract_where(lines, lines.str.contains('@CCT', regex=False), cct_pattern, expand=False)
+        devices = devices.astype(object).where(devices.notna(), "N/A")
+    return pd.DataFrame({
+        "BagID": bag_ids.astype(object).where(bag_ids.notna(), "N/A"),
+        "IATA": normalize_iata_series(raw_iata),
+        "Device": devices
+    }, index=lines.index)
+
 SOURCE_SCANNER = "Scanner"
 
 def map_disposition_to_text(code):
@@ -70,128 +136,231 @@ SCANNER_PATTERNS = [
      lambda m, ident, bag_id, iata, dev: f"[{SOURCE_SCANNER}] Bilddaten für Wanne **{ident}** wurden gespeichert.")
 ]
 
+# --- NEU (V25): Schlüsselwort-Index für SCANNER_PATTERNS ---
+# Jedes Muster enthält ein festes Schlüsselwort (gleiche Reihenfolge wie SCANNER_PATTERNS).
+# Eine einzige kombinierte Suche verwirft alle Zeilen ohne Schlüsselwort; die eigentliche
+# Regex läuft nur noch für Muster, deren Schlüsselwort in der Zeile vorkommt.
+SCANNER_PATTERN_KEYWORDS = [
+    'CreateNewBag',
+    'AssignAlgorithms',
+    'Associated',
+    'BagIoHandler::MarkAlgoDone[',
+    'SetDisposition[',
+    'SetDisposition[OSR]',
+    'SetOperatorDisposition',
+    'Security rule for this bag is now',
+    'Finished(',
+    'Ok:Saved'
+]
+SCANNER_KEYWORD_PATTERN = re.compile('|'.join(re.escape(k) for k in dict.fromkeys(SCANNER_PATTERN_KEYWORDS)))
+_SCANNER_DISPATCH = [(keyword, pattern, handler) for keyword, (pattern, handler) in zip(SCANNER_PATTERN_KEYWORDS, SCANNER_PATTERNS)]
+
+def match_scanner_event(line):
+    """
+    Sucht das erste passende SCANNER_PATTERN (gleiche Priorität wie bisher).
+    GIBT ZURÜCK: (handler, match) oder None, wenn die Zeile kein Ereignis ist.
+    """
+    if not SCANNER_KEYWORD_PATTERN.search(line):
+        return None
+    for keyword, pattern, handler in _SCANNER_DISPATCH:
+        if keyword in line and (m := pattern.search(line)):
+            return handler, m
+    return None
+
 # --- V13: OMS_PATTERNS entfernt ---
 
 def parse_line_to_klartext(line, source, bag_id, iata, device):
     ident = iata if iata not in ["N/A", "NO_READ"] else bag_id
     
-    patterns_to_check = SCANNER_PATTERNS
-
-    for pattern, handler in patterns_to_check:
-        if m := pattern.search(line):
-            return handler(m, ident, bag_id, iata, device) 
+    event = match_scanner_event(line)
+    if event:
+        handler, m = event
+        return handler(m, ident, bag_id, iata, device) 
     
     return None 
 
-def _get_timestamp_from_line(line_str, current_year, last_month):
-    ts_match = TS_PATTERN.search(line_str)
-    if not ts_match: 
-        return None, last_month
-        
-    try:
-        dt_no_year = datetime.strptime(ts_match.group(1), "%a %b %d %H:%M:%S")
-        year_to_use = current_year
-        if last_month and dt_no_year.month == 1 and last_month == 12: 
-            year_to_use -= 1
-        
-        dt_object = dt_no_year.replace(year=year_to_use)
-        return dt_object, dt_object.month
-        
-    except (ValueError, Exception):
-        return None, last_month
-
-def _find_last_day_date(file_path, current_year):
-    last_month = datetime.now().month
+def resolve_time_window(file_path, load_last_day=False, last_hours=None, time_window=None):
+    """
+    NEU (V27): Ermittelt über den Zeit-Index (log_index.py) den Byte-Bereich für ein Zeitfenster.
+    - load_last_day: Kompletter letzter Log-Tag
+    - last_hours: Die letzten N Stunden vor dem letzten Zeitstempel
+    - time_window: (start, ende) als naive Lokalzeit, z.B. aus dem TimespanDialog
+    GIBT ZURÜCK: dict mit start_dt, end_dt, start_offset, end_offset, seed_dt
+                 oder None (kein Fenster / Index nicht verwendbar -> komplettes Log).
+    """
+    if not (load_last_day or last_hours or time_window):
+        return None
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            try:
-                f.seek(0, os.SEEK_END)
-                end_pos = f.tell()
-                f.seek(max(0, end_pos - 8192), os.SEEK_SET) 
-            except (IOError, OSError):
-                f.seek(0) 
-
-            for line in reversed(f.readlines()):
-                dt_object, _ = _get_timestamp_from_line(line, current_year, last_month)
-                if dt_object:
-                    print(f"--- log_parser: Letzter Log-Tag gefunden: {dt_object.date()} ---")
-                    return dt_object.date()
-                    
-    except Exception as e:
-        print(f"--- log_parser: Fehler beim Finden des letzten Tags: {e} ---")
+        index = LogTimeIndex.for_file(file_path)
+    except OSError as e:
+        print(f"--- log_parser: Zeit-Index nicht verfügbar ({e}) ---")
+        return None
+    if index.last_timestamp is None:
         return None
 
-def parse_log_file(file_path, update_progress=None, load_last_day=False):
-    log_records = []; current_year = datetime.now().year; last_month = None
-    
-    try:
-        local_tz = pytz.timezone('Europe/Berlin')
-    except pytz.exceptions.UnknownTimeZoneError:
-        local_tz = pytz.utc 
-    
-    target_date = None
     if load_last_day:
-        target_date = _find_last_day_date(file_path, current_year)
-        if target_date is None:
-            print("--- log_parser: Konnte letzten Tag nicht ermitteln, lade komplettes Log. ---")
-            
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f: lines = f.readlines()
-    total_lines = len(lines)
+        start_dt = datetime.combine(index.last_timestamp.date(), datetime.min.time())
+        end_dt = start_dt + timedelta(days=1) - timedelta(microseconds=1)
+        print(f"--- log_parser: Letzter Log-Tag gefunden: {start_dt.date()} ---")
+    elif last_hours:
+        start_dt, end_dt = index.last_timestamp - timedelta(hours=last_hours), None
+    else:
+        start_dt, end_dt = time_window
+
+    start_offset, end_offset, seed_dt = index.byte_range(start_dt, end_dt)
+    return {"start_dt": start_dt, "end_dt": end_dt, "start_offset": start_offset,
+            "end_offset": end_offset, "seed_dt": seed_dt}
+
+SCANNER_COLUMNS = ["Timestamp", "BagID", "IATA", "Source", "Klartext", "OriginalLog", "Device"]
+# V29: Kompaktes Schema - OriginalLog als Verweis in die Quelldatei (siehe raw_schema.py)
+SCANNER_LAZY_COLUMNS = [col for col in SCANNER_COLUMNS if col != "OriginalLog"] + LOG_REF_COLUMNS
+
+def _append_scanner_row(batch, timestamp_utc, line, event, bag_id, iata, device, ref=None):
+    if bag_id == "N/A" and iata == "N/A":
+        return
+    handler, m = event
+    ident = iata if iata not in ["N/A", "NO_READ"] else bag_id
+    klartext = handler(m, ident, bag_id, iata, device)
+    if klartext: 
+        batch["Timestamp"].append(timestamp_utc)
+        batch["BagID"].append(bag_id)
+        batch["IATA"].append(iata)
+        batch["Source"].append(SOURCE_SCANNER)
+        batch["Klartext"].append(klartext)
+        batch["Device"].append(device)
+        if ref is None:
+            batch["OriginalLog"].append(line.strip())
+        else:
+            log_file, line_start, line_length = ref
+            batch["LogFile"].append(log_file)
+            batch["LogOffset"].append(line_start)
+            batch["LogLength"].append(line_length)
+            batch["LogCRC"].append(line_crc(line.strip()))
+
+def iter_scanner_batches(file_path, update_progress=None, window=None, block_size=DEFAULT_BLOCK_SIZE,
+                         batch_extract=False, lazy_log=False):
+    """
+    NEU (V24): Streaming-Modus für große Scanner-Logs.
+    Liest die Datei blockweise (binär) und gibt pro Block einen spaltenorientierten
+    Batch (dict: Spaltenname -> Liste) zurück. Der Fortschritt wird nach gelesenen Bytes gemeldet.
+    V27: 'window' (siehe resolve_time_window) begrenzt das Lesen auf den Byte-Bereich des Zeitfensters.
+    V28: 'batch_extract' extrahiert BagID/IATA/Gerät pro Block spaltenweise (extract_ids_batch).
+    V29: 'lazy_log' speichert statt OriginalLog nur LogFile/LogOffset/LogLength/LogCRC.
+    """
+    filename = os.path.basename(file_path)
+    start_offset, end_offset = 0, None
+    start_dt = end_dt = None
+    decoder = TimestampDecoder() # V26: Gecachte Zeitstempel (Europe/Berlin -> UTC)
+    if window:
+        start_offset, end_offset = window["start_offset"], window["end_offset"]
+        start_dt, end_dt = window["start_dt"], window["end_dt"]
+        if window["seed_dt"]:
+            # Jahr (und Jahreswechsel-Zustand) vom Index-Eintrag am Start-Offset übernehmen
+            decoder = TimestampDecoder(start_year=window["seed_dt"].year)
+            decoder.last_month = window["seed_dt"].month
+    total_size = ((end_offset if end_offset is not None else file_size(file_path)) - start_offset) or 1
     
-    for i, line in enumerate(lines):
-        if update_progress and (i % 500 == 0 or i == total_lines - 1):
-            progress = int((i + 1) / total_lines * 100); update_progress(progress, os.path.basename(file_path))
+    for block_offset, raw_lines, bytes_consumed in iter_line_blocks(file_path, block_size, start_offset, end_offset):
+        batch = {col: [] for col in (SCANNER_LAZY_COLUMNS if lazy_log else SCANNER_COLUMNS)}
+        pending = [] # Batch-Modus: (timestamp_utc, line, event, ref)
+        offsets = line_offsets(block_offset, raw_lines) if lazy_log else repeat(None)
         
-        if '\"0' not in line and 'IATA' not in line and 'RFID' not in line:
-            continue
-        
-        if "[OMS:" in line:
-            continue
+        for line_start, raw_line in zip(offsets, raw_lines):
+            # Schneller Vorfilter direkt auf den Bytes (vor dem Dekodieren)
+            if b'"0' not in raw_line and b'IATA' not in raw_line and b'RFID' not in raw_line:
+                continue
             
-        dt_object, new_last_month = _get_timestamp_from_line(line, current_year, last_month)
-        if not dt_object:
-            continue
-        last_month = new_last_month
-        
-        if load_last_day and target_date and dt_object.date() != target_date:
-            continue 
+            if b"[OMS:" in raw_line:
+                continue
             
-        try:
-            aware_local_time = local_tz.localize(dt_object, is_dst=None)
-            timestamp_utc = aware_local_time.astimezone(pytz.utc)
-        except Exception as tz_err:
-            continue
+            line = raw_line.decode('utf-8', errors='ignore')
             
-        bag_id_match = BAG_ID_PATTERN.search(line)
-        iata_match = IATA_PATTERN.search(line) # Nutzt die neue, strikte Regex (V12)
-        
-        bag_id = bag_id_match.group(1) if bag_id_match else "N/A"
-        
-        # --- KORRIGIERTE GRUPPEN-ZUWEISUNG (V12) ---
-        raw_iata = "N/A"
-        if iata_match:
-            raw_iata = iata_match.group(1) or iata_match.group(3) or iata_match.group(4)
-        iata = _normalize_iata(raw_iata)
-        # --- ENDE KORREKTUR ---
-        
-        cct_match = CCT_PATTERN.search(line)
-        device = cct_match.group(1) if cct_match else "N/A" 
-        
-        if bag_id == "N/A" and iata == "N/A": continue
+            ts_match = TS_PATTERN.match(line)
+            if not ts_match:
+                continue
+            dt_object = decoder.parse_syslog(ts_match.group(1))
+            if not dt_object:
+                continue
             
-        source = SOURCE_SCANNER 
+            if start_dt and dt_object < start_dt:
+                continue
+            if end_dt and dt_object > end_dt:
+                continue 
+            
+            timestamp_utc = decoder.to_utc(dt_object)
+            if timestamp_utc is None: # Zeitumstellung (nicht existierende / doppelte Stunde)
+                continue
+            
+            # V25: Erst das Ereignis bestimmen - Zeilen ohne Ereignis brauchen keine ID-Suche
+            event = match_scanner_event(line)
+            if event is None:
+                continue
+            
+            ref = (file_path, line_start, len(raw_line)) if lazy_log else None
+            if batch_extract:
+                pending.append((timestamp_utc, line, event, ref))
+                continue
+                
+            bag_id_match = BAG_ID_PATTERN.search(line) if '"0' in line else None
+            iata_match = IATA_PATTERN.search(line) # Nutzt die neue, strikte Regex (V12)
+            
+            bag_id = bag_id_match.group(1) if bag_id_match else "N/A"
+            
+            # --- KORRIGIERTE GRUPPEN-ZUWEISUNG (V12) ---
+            raw_iata = "N/A"
+            if iata_match:
+                raw_iata = iata_match.group(1) or iata_match.group(3) or iata_match.group(4)
+            iata = _normalize_iata(raw_iata)
+            # --- ENDE KORREKTUR ---
+            
+            cct_match = CCT_PATTERN.search(line) if '@CCT' in line else None
+            device = cct_match.group(1) if cct_match else "N/A" 
+            
+            _append_scanner_row(batch, timestamp_utc, line, event, bag_id, iata, device, ref)
         
-        klartext = parse_line_to_klartext(line, source, bag_id, iata, device)
+        if pending:
+            ids = extract_ids_batch([line for _, line, _, _ in pending])
+            for (timestamp_utc, line, event, ref), bag_id, iata, device in zip(pending, ids["BagID"], ids["IATA"], ids["Device"]):
+                _append_scanner_row(batch, timestamp_utc, line, event, bag_id, iata, device, ref)
         
-        if klartext: 
-            log_records.append({
-                "Timestamp": timestamp_utc, 
-                "BagID": bag_id, 
-                "IATA": iata, 
-                "Source": source, 
-                "Klartext": klartext, 
-                "OriginalLog": line.strip(),
-                "Device": device 
-            })
-            
-    return pd.DataFrame(log_records)
\ No newline at end of file
+        if update_progress:
+            update_progress(min(100, int(bytes_consumed / total_size * 100)), filename)
+        
+        if batch["Timestamp"]:
+            yield batch
+
+def parse_log_file(file_path, update_progress=None, load_last_day=False, block_size=DEFAULT_BLOCK_SIZE,
+                   last_hours=None, time_window=None, batch_extract=False, lazy_log=False, use_cache=False):
+    """
+    Parst ein Scanner-Log.
+    KORRIGIERT (V24): Kein readlines() mehr - die Datei wird blockweise gestreamt
+    und das DataFrame aus den spaltenorientierten Batches zusammengesetzt.
+    V27: 'load_last_day', 'last_hours' und 'time_window' springen per Zeit-Index
+    direkt an den Anfang des Zeitfensters, statt die ganze Datei zu lesen.
+    V28: 'batch_extract' aktiviert die spaltenweise ID-Extraktion (gleiches Ergebnis).
+    V29: 'lazy_log' ersetzt OriginalLog durch Zeilen-Verweise (raw_schema.with_original_log liest nach).
+    V30: 'use_cache' liest das Ergebnis aus dem Parse-Cache (parse_cache.py), solange sich die Datei
+    nicht geändert hat. 'block_size' und 'batch_extract' ändern das Ergebnis nicht und zählen nicht zum Schlüssel.
+    """
+    if use_cache:
+        params = {"load_last_day": load_last_day, "last_hours": last_hours, "time_window": time_window,
+                  "lazy_log": lazy_log, "year": year_hint()}
+        df = get_default_cache().cached(
+            file_path, "scanner", PARSER_VERSION, params,
+            lambda: parse_log_file(file_path, update_progress, load_last_day, block_size, last_hours,
+                                   time_window, batch_extract, lazy_log))
+        if update_progress:
+            update_progress(100, os.path.basename(file_path))
+        return df
+
+    window = resolve_time_window(file_path, load_last_day, last_hours, time_window)
+    if window is None and (load_last_day or last_hours or time_window):
+        print("--- log_parser: Konnte Zeitfenster nicht ermitteln, lade komplettes Log. ---")
+    
+    frames = [
+        pd.DataFrame(batch, columns=SCANNER_LAZY_COLUMNS if lazy_log else SCANNER_COLUMNS)
+        for batch in iter_scanner_batches(file_path, update_progress, window, block_size, batch_extract, lazy_log)
+    ]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,332 @@
+# log_stream.py
+print("--- [V3-STREAM] log_stream.py wird geladen (Blockweises Lesen, konstanter Speicher, .gz als Strom, Zeilen mit Byte-Position) ... ---")
+
+import io
+import os
+import re
+import gzip
+import zlib
+import shutil
+import subprocess
+from collections import deque
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor
+
+# Standard-Blockgröße für das binäre Lesen (4 MB)
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+# --- NEU (V2): .gz-Logs direkt lesen (ohne entpackte Kopie auf der Platte) ---
+# "python": gzip-Modul | "parallel": Member mehrteiliger .gz in Threads entpacken (zlib gibt den GIL frei)
+# "pipe": externes pigz/zcat über eine Pipe | "auto": pigz falls vorhanden, sonst "parallel"
+GZIP_MODES = ("python", "parallel", "pipe", "auto")
+GZIP_PIPE_TOOLS = (("pigz", ["-dc"]), ("zcat", []), ("gzip", ["-dc"]))
+GZIP_MAGIC = b'\x1f\x8b\x08' # ID1, ID2, CM=deflate
+GZIP_CHUNK_SIZE = 1024 * 1024
+
+# NEU (V3): Eine Textzeile mit Zeilenende wie im Textmodus ('\r\n', '\n' oder einzelnes '\r')
+TEXT_LINE_PATTERN = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+LINE_BREAK_BYTES = re.compile(rb'[\r\n]')
+
+
+def iter_line_blocks(file_path, block_size=DEFAULT_BLOCK_SIZE, start_offset=0, end_offset=None):
+    """
+    Liest eine Datei in festen Binär-Blöcken und gibt vollständige Zeilen zurück.
+
+    GIBT ZURÜCK (Generator):
+    (block_offset, raw_lines, bytes_consumed)
+      - block_offset: Byte-Position der ersten Zeile im Block
+      - raw_lines: Liste von bytes-Zeilen (ohne '\\n', ggf. mit '\\r')
+      - bytes_consumed: Bisher gelesene Bytes (für die Fortschrittsanzeige)
+
+    Eine angebrochene Zeile am Blockende wird in den nächsten Block übernommen,
+    der Speicherbedarf hängt also nur von 'block_size' ab, nicht von der Dateigröße.
+    'end_offset' begrenzt das Lesen; eine Zeile, die vor 'end_offset' beginnt,
+    wird immer vollständig gelesen.
+    """
+    with open(file_path, 'rb') as f:
+        if start_offset:
+            f.seek(start_offset)
+        position = start_offset
+        carry = b''
+
+        while True:
+            if end_offset is not None and position >= end_offset and not carry:
+                break
+            block = f.read(block_size)
+            if not block:
+                break
+            position += len(block)
+
+            block = carry + block
+            block_offset = position - len(block)
+            last_newline = block.rfind(b'\n')
+            if last_newline == -1:
+                carry = block
+                continue
+
+            raw_lines = block[:last_newline].split(b'\n')
+            carry = block[last_newline + 1:]
+
+            if end_offset is not None and position > end_offset:
+                # Nur Zeilen behalten, die vor 'end_offset' beginnen
+                kept = []
+                for line_start, line in zip(line_offsets(block_offset, raw_lines), raw_lines):
+                    if line_start >= end_offset:
+                        break
+                    kept.append(line)
+                if len(kept) < len(raw_lines):
+                    if kept:
+                        yield block_offset, kept, position - start_offset
+                    return
+                raw_lines = kept
+
+            yield block_offset, raw_lines, position - start_offset
+
+        if carry and (end_offset is None or position - len(carry) < end_offset):
+            yield position - len(carry), [carry], position - start_offset
+
+
+def split_line_ranges(file_path, n_ranges, min_range_size=0):
+    """
+    Teilt eine Datei in bis zu 'n_ranges' Byte-Bereiche (start, end), die jeweils an einem
+    Zeilenanfang beginnen (für iter_line_blocks(start_offset=start, end_offset=end)).
+    Bereiche werden nicht kleiner als 'min_range_size' Bytes.
+    """
+    size = file_size(file_path)
+    if min_range_size:
+        n_ranges = min(n_ranges, size // min_range_size)
+    bounds = [0]
+    if n_ranges > 1:
+        with open(file_path, 'rb') as f:
+            for k in range(1, n_ranges):
+                f.seek(max(size * k // n_ranges, bounds[-1] + 1) - 1)
+                f.readline() # Rest der angebrochenen Zeile
+                position = f.tell()
+                if position >= size:
+                    break
+                bounds.append(position)
+    return list(zip(bounds, bounds[1:] + [size]))
+
+
+def line_offsets(block_offset, raw_lines):
+    """Berechnet die Byte-Offsets (Zeilenanfang) für alle Zeilen eines Blocks."""
+    return list(accumulate((len(line) + 1 for line in raw_lines[:-1]), initial=block_offset))
+
+
+def file_size(file_path):
+    """Dateigröße in Bytes (0, falls nicht lesbar)."""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def find_gzip_tool(tools=GZIP_PIPE_TOOLS):
+    """Erstes installiertes Entpack-Programm als Befehlsliste (ohne Dateiname) oder None."""
+    for name, args in tools:
+        path = shutil.which(name)
+        if path:
+            return [path] + args
+    return None
+
+
+def open_log(file_path, gzip_mode="python", workers=None):
+    """
+    Öffnet eine Log-Datei als Textstrom wie bisher open()/gzip.open(..., 'rt')
+    (utf-8, ungültige Bytes ignoriert, universelle Zeilenenden).
+    .gz-Dateien werden beim Lesen entpackt, 'gzip_mode' wählt wie (GZIP_MODES).
+    """
+    if not file_path.endswith(".gz"):
+        return open(file_path, 'r', encoding='utf-8', errors='ignore')
+    return io.TextIOWrapper(open_gzip(file_path, gzip_mode, workers), encoding='utf-8', errors='ignore')
+
+
+def iter_log_lines(file_path, gzip_mode="python", workers=None):
+    """
+    NEU (V3): Wie 'for line in open_log(...)', liefert aber (line, offset, length): dieselben Textzeilen
+    plus Byte-Position und -Länge der Zeile (bei .gz im entpackten Inhalt) - für Zeilen-Verweise
+    statt Text (raw_schema.LOG_REF_COLUMNS).
+    """
+    stream = open_gzip(file_path, gzip_mode, workers) if file_path.endswith(".gz") else open(file_path, 'rb')
+    with stream:
+        offset = 0
+        for raw_line in stream:
+            if b'\r' not in raw_line:
+                line = raw_line.decode('utf-8', errors='ignore')
+                if line: # eine letzte Zeile nur aus ungültigen Bytes gibt es im Textmodus nicht
+                    yield line, offset, len(raw_line)
+            else:
+                # Universelle Zeilenenden wie im Textmodus (erst dekodieren, dann trennen): '\r\n' -> '\n',
+                # ein einzelnes '\r' beendet die Zeile. Ungültige Bytes werden nie zu '\r'/'\n', das k-te
+                # Zeilenende-Zeichen im Text ist also das k-te '\r'/'\n'-Byte der Zeile.
+                breaks = (match.start() for match in LINE_BREAK_BYTES.finditer(raw_line))
+                start = 0
+                for match in TEXT_LINE_PATTERN.finditer(raw_line.decode('utf-8', errors='ignore')):
+                    text = match.group()
+                    body = text.rstrip('\r\n')
+                    end = len(raw_line)
+                    for _ in range(len(text) - len(body)):
+                        end = next(breaks) + 1
+                    yield body + ('\n' if len(body) < len(text) else ''), offset + start, end - start
+                    start = end
+            offset += len(raw_line)
+
+
+def open_gzip(file_path, gzip_mode="python", workers=None):
+    """Binärer Strom des entpackten Inhalts einer .gz-Datei."""
+    if gzip_mode not in GZIP_MODES:
+        raise ValueError(f"Unbekannter gzip_mode '{gzip_mode}' ({', '.join(GZIP_MODES)})")
+    if gzip_mode in ("pipe", "auto"):
+        command = find_gzip_tool() if gzip_mode == "pipe" else find_gzip_tool(GZIP_PIPE_TOOLS[:1])
+        if command:
+            return io.BufferedReader(_PipeReader(command + [file_path]))
+        if gzip_mode == "pipe":
+            print("--- log_stream: Kein pigz/zcat gefunden, entpacke mit dem gzip-Modul ---")
+    if gzip_mode in ("parallel", "auto"):
+        return io.BufferedReader(_ChunkReader(_iter_gzip_parallel(file_path, workers)), GZIP_CHUNK_SIZE)
+    return gzip.open(file_path, 'rb')
+
+
+def gzip_member_offsets(file_path, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Byte-Positionen, an denen ein gzip-Member beginnen KÖNNTE (Magic + plausibler Header).
+    Auch komprimierte Daten können zufällig so aussehen - _iter_gzip_parallel prüft jeden Member.
+    """
+    offsets = []
+    with open(file_path, 'rb') as f:
+        position = 0
+        tail = b''
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            data = tail + block
+            base = position - len(tail)
+            position += len(block)
+            last = len(data) - 10 # Header (10 Bytes) muss vollständig im Block liegen, sonst im nächsten
+            i = data.find(GZIP_MAGIC)
+            while i != -1 and i <= last:
+                if data[i + 3] & 0xE0 == 0 and data[i + 8] in (0, 2, 4) and (data[i + 9] <= 13 or data[i + 9] == 255):
+                    offsets.append(base + i)
+                i = data.find(GZIP_MAGIC, i + 1)
+            tail = data[max(0, last + 1):]
+    return offsets
+
+
+def _iter_gzip_chunks(file_path, start_offset=0):
+    """Entpackt ab 'start_offset' sequenziell mit dem gzip-Modul (alle folgenden Member)."""
+    with open(file_path, 'rb') as f:
+        f.seek(start_offset)
+        with gzip.GzipFile(fileobj=f) as gz:
+            while True:
+                chunk = gz.read(GZIP_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+
+def _inflate_member(file_path, start, end):
+    """Entpackt genau einen Member [start, end) - oder None, wenn der Bereich kein vollständiger Member ist."""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    inflater = zlib.decompressobj(wbits=31) # 31: gzip-Header und -Prüfsumme
+    try:
+        out = inflater.decompress(data)
+    except zlib.error:
+        return None
+    if not inflater.eof or inflater.unused_data:
+        return None
+    return out
+
+
+def _iter_gzip_parallel(file_path, workers=None):
+    """
+    Mehrteilige .gz (z.B. aneinandergehängte Rotationen, bgzip): die Member werden in einem
+    Thread-Pool entpackt und in Datei-Reihenfolge geliefert (höchstens 2 * workers im Speicher).
+    Passt ein Bereich nicht (Fehlalarm der Header-Suche, Füll-Nullen am Ende), geht es ab dort
+    sequenziell mit dem gzip-Modul weiter. Einteilige .gz werden direkt sequenziell gelesen.
+    """
+    offsets = gzip_member_offsets(file_path)
+    if len(offsets) <= 1 or offsets[0] != 0:
+        yield from _iter_gzip_chunks(file_path)
+        return
+
+    ranges = list(zip(offsets, offsets[1:] + [file_size(file_path)]))
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        next_range = 0
+        try:
+            while True:
+                while next_range < len(ranges) and len(pending) < 2 * workers:
+                    start, end = ranges[next_range]
+                    pending.append((start, executor.submit(_inflate_member, file_path, start, end)))
+                    next_range += 1
+                if not pending:
+                    return
+                start, future = pending.popleft()
+                data = future.result()
+                if data is None:
+                    yield from _iter_gzip_chunks(file_path, start)
+                    return
+                yield data
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+class _ChunkReader(io.RawIOBase):
+    """Roher Lese-Strom über einen Generator von bytes-Blöcken."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        n = min(len(target), len(self._buffer))
+        target[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._chunks.close()
+        super().close()
+
+
+class _PipeReader(io.RawIOBase):
+    """Roher Lese-Strom über die Standardausgabe eines Entpack-Programms (pigz/zcat)."""
+
+    def __init__(self, command):
+        self.command = command
+        # CREATE_NO_WINDOW: unter Windows kein Konsolenfenster aus der GUI heraus
+        self._process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                         creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        n = self._process.stdout.readinto(target)
+        if not n:
+            returncode = self._process.wait()
+            if returncode != 0:
+                raise OSError(f"{os.path.basename(self.command[0])} meldet Exit-Code {returncode} für {self.command[-1]}")
+        return n
+
+    def close(self):
+        if not self.closed:
+            if self._process.poll() is None:
+                self._process.kill() # vorzeitig geschlossen (z.B. Abbruch)
+            self._process.stdout.close()
+            self._process.wait()
+        super().close()
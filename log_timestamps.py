@@ -0,0 +1,207 @@
+# log_timestamps.py
+print("--- [V2-TS] log_timestamps.py wird geladen (Zeitstempel-Cache, Jahreswechsel, Spalten-Konvertierung, ISO-Schnellweg) ... ---")
+
+import numpy as np
+import pandas as pd
+import pytz
+from datetime import datetime
+
+MONTH_NUMBERS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+WEEKDAY_NAMES = {'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'}
+
+DEFAULT_TZ_NAME = 'Europe/Berlin'
+
+def get_local_tz(tz_name=DEFAULT_TZ_NAME):
+    try:
+        return pytz.timezone(tz_name)
+    except pytz.exceptions.UnknownTimeZoneError:
+        return pytz.utc # Fallback
+
+def guess_start_year(month, now=None):
+    """
+    Jahr für den ersten Zeitstempel eines Logs ohne Jahresangabe:
+    Ein Monat nach dem aktuellen Monat kann nur aus dem Vorjahr stammen.
+    """
+    now = now or datetime.now()
+    return now.year if month <= now.month else now.year - 1
+
+
+# --- NEU (V2): ISO-Zeitstempel fester Breite (SPS, BRAVA, MV3D) ---
+# 'YYYY-MM-DD[T ]HH:MM:SS[.,]ffffff[Z]': Datum/Uhrzeit stehen immer an denselben Positionen,
+# ein pd.to_datetime pro Zeile (zig Mikrosekunden) ist dafür unnötig.
+
+def parse_iso_fixed(raw):
+    """
+    Skalarer Schnellweg per String-Slicing -> naive datetime (oder None).
+    Bruchteile werden auf Mikrosekunden gekürzt, ein 'Z' wird ignoriert (Uhrzeit bleibt UTC-Wanduhrzeit).
+    """
+    try:
+        if raw[4] != '-' or raw[7] != '-' or raw[13] != ':' or raw[16] != ':':
+            return None
+        fraction = raw[20:26].rstrip('Z') if len(raw) > 20 and raw[19] in '.,' else ''
+        return datetime(int(raw[0:4]), int(raw[5:7]), int(raw[8:10]),
+                        int(raw[11:13]), int(raw[14:16]), int(raw[17:19]),
+                        int(fraction.ljust(6, '0')) if fraction else 0)
+    except (ValueError, IndexError):
+        return None
+
+
+def iso_series_to_datetime(raw, utc=False):
+    """
+    Wandelt eine ganze Spalte (oder Liste) ISO-Zeitstempel in EINEM Aufruf in datetime64 um.
+    Gedacht für Parser, die die Roh-Strings pro Block/Datei sammeln. Ungültige Werte werden NaT.
+    'utc': True -> datetime64[ns, UTC] (das 'Z' gilt als UTC), False -> naive.
+    """
+    raw = pd.Series(raw, dtype=object).str.rstrip('Z') # naiv parsen ist deutlich schneller als mit 'Z'
+    parsed = pd.to_datetime(raw, format='ISO8601', errors='coerce')
+    retry = parsed.isna() & raw.notna()
+    if retry.any():
+        # Dezimal-Komma ('12:57:30,096') kennt der ISO8601-Parser nicht.
+        # KORREKTUR: where() statt Zuweisung - waren alle Werte ungültig, hat der erste Lauf die Einheit
+        # datetime64[s], und die Millisekunden des zweiten Laufs passen nicht hinein (TypeError).
+        reparsed = pd.to_datetime(raw[retry].str.replace(',', '.', regex=False), format='ISO8601', errors='coerce')
+        parsed = parsed.where(~retry, reparsed)
+    return parsed.dt.tz_localize('UTC') if utc else parsed
+
+
+class TimestampDecoder:
+    """
+    Dekodiert die Zeitstempel der Scanner-, OMS- und FSM-Logs.
+
+    - Merkt sich den zuletzt dekodierten Sekunden-Präfix (aufeinanderfolgende
+      Zeilen haben meist dieselbe Sekunde).
+    - Merkt sich den UTC-Offset (Europe/Berlin) pro Stunde, statt für jede Zeile
+      pytz.localize / astimezone aufzurufen.
+    - Behandelt den Jahreswechsel (Dezember -> Januar) genau einmal: ab dem
+      Wechsel gilt das neue Jahr für alle folgenden Zeilen.
+
+    'start_year': Jahr der ersten Zeile. None = aus dem ersten Monat raten (guess_start_year).
+    """
+
+    def __init__(self, start_year=None, tz_name=DEFAULT_TZ_NAME):
+        self.year = start_year
+        self.last_month = None
+        self.tz = get_local_tz(tz_name)
+        self._hour_offsets = {}
+        self._last_syslog_raw = None
+        self._last_syslog = None
+        self._last_iso_raw = None
+        self._last_iso = None
+
+    def _year_for_month(self, month):
+        if self.year is None:
+            return guess_start_year(month)
+        if self.last_month == 12 and month == 1:
+            return self.year + 1
+        return self.year
+
+    def parse_syslog(self, raw):
+        """'Sat Nov 01 06:01:27[.123456]' -> naive Lokalzeit (oder None)."""
+        if raw == self._last_syslog_raw:
+            return self._last_syslog
+
+        dt_object = None
+        parts = raw.split()
+        if len(parts) == 4 and parts[0] in WEEKDAY_NAMES:
+            month = MONTH_NUMBERS.get(parts[1])
+            if month:
+                try:
+                    hour, minute, second = parts[3].split('.')[0].split(':')
+                    year = self._year_for_month(month)
+                    dt_object = datetime(year, month, int(parts[2]), int(hour), int(minute), int(second))
+                    self.year, self.last_month = year, month
+                except ValueError:
+                    dt_object = None
+
+        self._last_syslog_raw, self._last_syslog = raw, dt_object
+        return dt_object
+
+    def parse_iso(self, raw):
+        """'2025-10-14 12:57:30[.096]' -> naive Lokalzeit, auf Sekunden gekürzt (oder None)."""
+        prefix = raw[:19]
+        if prefix == self._last_iso_raw:
+            return self._last_iso
+        try:
+            dt_object = datetime(int(prefix[0:4]), int(prefix[5:7]), int(prefix[8:10]),
+                                 int(prefix[11:13]), int(prefix[14:16]), int(prefix[17:19]))
+        except ValueError:
+            dt_object = None
+        self._last_iso_raw, self._last_iso = prefix, dt_object
+        return dt_object
+
+    def to_utc(self, local_dt):
+        """
+        Naive Lokalzeit -> TZ-aware UTC.
+        Gibt None zurück für nicht existierende / mehrdeutige Zeiten (Zeitumstellung),
+        genau wie bisher localize(..., is_dst=None).
+        """
+        hour = local_dt.replace(minute=0, second=0, microsecond=0)
+        try:
+            offset = self._hour_offsets[hour]
+        except KeyError:
+            try:
+                offset = self.tz.localize(hour, is_dst=None).utcoffset()
+            except (pytz.exceptions.AmbiguousTimeError, pytz.exceptions.NonExistentTimeError):
+                offset = None
+            self._hour_offsets[hour] = offset
+        if offset is None:
+            return None
+        return (local_dt - offset).replace(tzinfo=pytz.utc)
+
+    def syslog_to_utc(self, raw):
+        local_dt = self.parse_syslog(raw)
+        return self.to_utc(local_dt) if local_dt else None
+
+    def iso_to_utc(self, raw):
+        local_dt = self.parse_iso(raw)
+        return self.to_utc(local_dt) if local_dt else None
+
+    # --- Spalten-Konvertierung (ganze Spalte auf einmal) ---
+
+    def syslog_series_to_local(self, raw):
+        """
+        Wandelt eine ganze Spalte 'Sat Nov 01 06:01:27[.123]' in naive datetime64 (Lokalzeit) um.
+        Ungültige Werte werden NaT. Der Jahreswechsel-Zustand wird fortgeschrieben,
+        sodass aufeinanderfolgende Batches nahtlos dekodiert werden.
+        """
+        raw = pd.Series(raw, dtype=object)
+        parts = raw.str.split(n=3, expand=True).reindex(columns=range(4))
+        month = parts[1].map(MONTH_NUMBERS)
+        valid = parts[0].isin(WEEKDAY_NAMES) & month.notna() & parts[3].notna()
+        if not valid.any():
+            return pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns]')
+
+        months = month[valid].astype(int).to_numpy()
+        first_year = self._year_for_month(int(months[0]))
+        previous = np.concatenate(([self.last_month or 0], months[:-1]))
+        # Der erste Wechsel ist bereits in first_year enthalten
+        rollover = (previous == 12) & (months == 1)
+        rollover[0] = False
+        years = first_year + np.cumsum(rollover)
+        self.year, self.last_month = int(years[-1]), int(months[-1])
+
+        index = month[valid].index
+        iso = (pd.Series(years, index=index).astype(str) + '-'
+               + pd.Series(months, index=index).astype(str).str.zfill(2) + '-'
+               + parts.loc[valid, 2] + ' ' + parts.loc[valid, 3].str.slice(0, 8))
+        local = pd.to_datetime(iso, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        return local.reindex(raw.index)
+
+    def iso_series_to_local(self, raw):
+        """Wandelt eine Spalte '2025-10-14 12:57:30[.096]' in naive datetime64 (Sekunden) um."""
+        raw = pd.Series(raw, dtype=object)
+        return pd.to_datetime(raw.str.slice(0, 19), format='%Y-%m-%d %H:%M:%S', errors='coerce')
+
+    def local_series_to_utc(self, local):
+        """Naive Lokalzeit-Spalte -> datetime64[ns, UTC]; Zeitumstellungs-Lücken werden NaT."""
+        return (local.dt.tz_localize(self.tz.zone, ambiguous='NaT', nonexistent='NaT')
+                     .dt.tz_convert('UTC'))
+
+    def syslog_series_to_utc(self, raw):
+        return self.local_series_to_utc(self.syslog_series_to_local(raw))
+
+    def iso_series_to_utc(self, raw):
+        return self.local_series_to_utc(self.iso_series_to_local(raw))
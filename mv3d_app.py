@@ -43,6 +43,7 @@ try:
     from ftp_file_selection_dialog import FTPFileSelectionDialog
     from help_texts import MV3D_HELP_TEXT
     from mv3d_log_parser import MV3DLogParser 
+    from raw_schema import line_crc
     from log_previewer import preview_log_directory
 except ImportError as e:
     error_message = f"Ein kritischer Import-Fehler ist aufgetreten:\n\nDie Datei '{e.name}.py' oder die Bibliothek '{e.name}' konnte nicht gefunden werden.\n\n{traceback.format_exc()}"
@@ -379,7 +380,12 @@ class MV3DApp(BaseApp):
             self.incidents_df, self.raw_df = self.parser.run_full_analysis(
                 file_list, 
                 progress_callback,
-                is_local=is_local
+                is_local=is_local,
+                use_cache=is_local, # FTP-Logs werden jedes Mal neu heruntergeladen, der Cache lohnt nur lokal
+                workers=os.cpu_count() or 1, # Ein Prozess pro Kern, größte Dateien zuerst
+                in_place=True, # Downloads direkt lesen, .gz als Strom entpacken (keine Kopie in ./logs)
+                gzip_mode="auto", # pigz, falls installiert
+                lazy_log=True # raw_df ohne Text, das Detailfenster liest die Zeilen nach (raw_schema.py)
             )
             self.thread_success = True 
         except Exception as e:
@@ -776,9 +782,15 @@ class MV3DApp(BaseApp):
                 original_log_match = selected_display_row['OriginalLog']
                 source_file_match = selected_display_row['SourceFile']
 
+                if 'OriginalLog' in self.raw_df.columns:
+                    same_line = self.raw_df['OriginalLog'] == original_log_match
+                else:
+                    # raw_df mit Zeilen-Verweisen (lazy_log): Vergleich über die Prüfsumme der Zeile
+                    same_line = self.raw_df['LogCRC'] == line_crc(original_log_match)
+
                 potential_matches = self.raw_df[
                     (self.raw_df['Timestamp'] == timestamp_match) &
-                    (self.raw_df['OriginalLog'] == original_log_match) &
+                    same_line &
                     (self.raw_df['SourceFile'] == source_file_match)
                 ]
                 
@@ -13,6 +13,8 @@ file_dir = os.path.dirname(os.path.abspath(__file__))
 if file_dir not in sys.path:
     sys.path.insert(0, file_dir)
 
+from raw_schema import with_original_log
+
 try:
     from mv3d_error_definitions import ERROR_DEFINITIONS, LOG_CONTEXT_RULES
 except ImportError:
@@ -28,6 +30,9 @@ class MV3DCasefileWindow(tk.Toplevel):
         self.transient(parent)
         self.grab_set()
 
+        # raw_df mit Zeilen-Verweisen (lazy_log): Text der Zeile erst jetzt aus dem Log lesen
+        if 'OriginalLog' not in selected_row.index:
+            selected_row = with_original_log(selected_row.to_frame().T).iloc[0]
         self.selected_row = selected_row
         self.raw_df = raw_df
         self.error_details = self._analyze_error(selected_row['OriginalLog'])
@@ -129,8 +134,8 @@ class MV3DCasefileWindow(tk.Toplevel):
                  return
 
             row_index = self.selected_row.name
-            context_before = self.raw_df.loc[max(0, row_index - 20) : row_index - 1]
-            context_after = self.raw_df.loc[row_index + 1 : min(len(self.raw_df) - 1, row_index + 20)]
+            context_before = with_original_log(self.raw_df.loc[max(0, row_index - 20) : row_index - 1])
+            context_after = with_original_log(self.raw_df.loc[row_index + 1 : min(len(self.raw_df) - 1, row_index + 20)])
 
             self.log_text_area.config(state=tk.NORMAL)
             self.log_text_area.delete(1.0, tk.END)
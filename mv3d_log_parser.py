@@ -1,16 +1,50 @@
 # mv3d_log_parser.py
+# VERSION 2.10
+# - NEU: run_full_analysis(..., lazy_log=True): raw_df ohne OriginalLog-Text, pro Zeile nur ein Verweis
+#   (LogFile/LogOffset/LogLength/LogCRC, raw_schema.py) und kompakte Spalten (category statt Strings).
+#   Duplikate werden über die Prüfsumme der Zeile erkannt, der Text wird erst im Detailfenster gelesen.
+# VERSION 2.9
+# - NEU: Zeitstempel-Format pro Datei erkennen (erste Zeile), danach verankerter Schnellweg pro Zeile und
+#   EINE spaltenweise Umwandlung in datetime64 am Dateiende (statt strptime pro Syslog-Zeile).
+#   Passt eine Zeile nicht, gilt der bisherige Weg (TS_REGEX) und das Format wird neu erkannt.
+# VERSION 2.8
+# - NEU: run_full_analysis(..., in_place=True) liest heruntergeladene Logs dort, wo sie liegen: keine
+#   entpackte Kopie in ./logs, .gz werden im Parser als Strom entpackt (log_stream.open_log, 'gzip_mode').
+# VERSION 2.7
+# - NEU: Fehlermuster über literal_prefilter.PrefilteredMatcher: Zeilen ohne eines der Pflicht-Literale
+#   kosten einen Suchlauf statt aller Regex; Reihenfolge (erstes Muster gewinnt) unverändert.
+# VERSION 2.6
+# - NEU: run_full_analysis(..., workers=N) parst die Dateien in einem Prozess-Pool (größte zuerst).
+# - _generic_parser sammelt Spalten statt einer Liste von Dictionaries.
+# VERSION 2.5
+# - NEU: run_full_analysis(..., use_cache=True) liest unveränderte Logs aus dem Parse-Cache (parse_cache.py).
+# - Ergebnisse werden pro Datei als DataFrame gesammelt und EINMAL am Ende zusammengefügt.
+# VERSION 2.4
+# - NEU: ISO-Zeitstempel per String-Slicing (log_timestamps.parse_iso_fixed) statt pd.to_datetime pro Zeile.
+# - KORREKTUR: Format 3 (YYYY-MM-DDTHH:MM:SS.sssZ) wurde nie erkannt (Gruppe 4 statt 3).
 # VERSION 2.3
 # - HINZUGEFÜGT: Erkennt jetzt auch boot.log, yum.log und dmesg.
 # - (Behält alle Fixes aus v2.2 bei)
 
 import os
 import re
+import numpy as np
 import pandas as pd
 import gzip
 import shutil
 from datetime import datetime
 import warnings
 
+from log_timestamps import parse_iso_fixed, iso_series_to_datetime, MONTH_NUMBERS, WEEKDAY_NAMES
+from log_stream import file_size, open_log, iter_log_lines
+from raw_schema import LOG_REF_COLUMNS, line_crc, compact_raw_df, concat_raw_frames, drop_duplicate_rows
+from parallel_loader import run_parallel
+from parse_cache import get_default_cache
+from literal_prefilter import PrefilteredMatcher
+
+# Geht in den Cache-Schlüssel ein (parse_cache.py): erhöhen, wenn sich das Ergebnis des Parsers ändert
+PARSER_VERSION = "2.5"
+
 try:
     from mv3d_error_definitions import ERROR_DEFINITIONS
 except ImportError:
@@ -19,6 +53,28 @@ except ImportError:
 
 warnings.simplefilter(action='ignore', category=pd.errors.PerformanceWarning)
 
+# --- NEU (v2.9): Zeitstempel-Formate (je eine Alternative aus TS_REGEX, am Zeilenanfang verankert) ---
+# An derselben Position passt höchstens eine der drei Alternativen, der verankerte Treffer ist also
+# genau der, den TS_REGEX.search() an Position 0 liefern würde.
+TS_FORMAT_PATTERNS = {
+    "iso": re.compile(r'\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}(?:[.,]\d{3,6})?'),
+    "syslog": re.compile(r'(?:[A-Z][a-z]{2}\s+)?(?:[A-Z][a-z]{2}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})(?:[.,]\d{3,6})?'),
+    "iso_z": re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:[.,]\d{3,6})?Z'),
+}
+TS_FORMAT_BY_GROUP = {1: "iso", 2: "syslog", 3: "iso_z"}
+SYSLOG_PARTS = r'^(?:([A-Z][a-z]{2})\s+)?([A-Z][a-z]{2})\s+(\d{1,2})\s+(\d{2}):(\d{2}):(\d{2})(?:[.,](\d{3,6}))?$'
+
+# dtype, den pandas für eine Liste von datetime-Objekten wählt (so sah die Spalte bisher aus)
+PY_DATETIME_DTYPE = pd.Series([datetime(2000, 1, 1)]).dtype
+
+# Spalten der Ergebnisse (Reihenfolge wie bisher)
+INCIDENT_COLUMNS = ["Timestamp", "Category", "Error", "SourceFile", "BagID", "TrayID", "System", "OriginalLog"]
+RAW_COLUMNS = ["Timestamp", "SourceFile", "BagID", "TrayID", "System", "OriginalLog"]
+# NEU (v2.10): lazy_log - statt OriginalLog ein Verweis auf die Zeile (raw_schema.with_original_log liest nach)
+RAW_LAZY_COLUMNS = [col for col in RAW_COLUMNS if col != "OriginalLog"] + LOG_REF_COLUMNS
+# Wenige unterschiedliche Werte pro Analyse: als category (ein Code pro Zeile)
+RAW_CATEGORY_COLUMNS = ["SourceFile", "TrayID", "System"]
+
 class MV3DLogParser:
     def __init__(self):
         # 1. Definition der Parser-Map (ERWEITERT)
@@ -120,7 +176,9 @@ class MV3DLogParser:
         
         # 2. Vorkompilierte Regex-Muster (Logik von v2.1 - ist korrekt)
         self.ERROR_PATTERNS = self._compile_error_patterns()
-        print(f"--- {len(self.ERROR_PATTERNS)} MV3D-Fehlermuster (v2.3) vorkompiliert. ---")
+        self.error_matcher = PrefilteredMatcher([pattern for pattern, _, _ in self.ERROR_PATTERNS])
+        print(f"--- {len(self.ERROR_PATTERNS)} MV3D-Fehlermuster (v2.3) vorkompiliert "
+              f"({self.error_matcher.prefiltered_count} mit Literal-Vorfilter). ---")
 
         self.TS_REGEX = re.compile(
             r'(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}(?:[.,]\d{3,6})?)'
@@ -133,6 +191,8 @@ class MV3DLogParser:
         
         self.analysis_dir = None 
         self.assumed_year = datetime.now().year
+        self.gzip_mode = "python" # v2.8: wie .gz entpackt werden (log_stream.GZIP_MODES)
+        self.lazy_log = False # v2.10: raw_df mit Zeilen-Verweisen statt OriginalLog
 
     def _compile_error_patterns(self):
         # (Logik von v2.1 - ist korrekt)
@@ -176,8 +236,16 @@ class MV3DLogParser:
                 print(f"WARNUNG: Ungültiges Regex in mv3d_error_definitions.py ignoriert: {regex_str} -> {e}")
         return compiled
 
-    def run_full_analysis(self, file_list, progress_callback, is_local=False):
-        # (Funktion unverändert zu v2.0/v2.1)
+    def run_full_analysis(self, file_list, progress_callback, is_local=False, use_cache=False, workers=1,
+                          in_place=False, gzip_mode=None, lazy_log=None):
+        # (Funktion unverändert zu v2.0/v2.1, v2.5: DataFrames pro Datei, optional Parse-Cache)
+        # NEU (v2.6): 'workers' > 1 verteilt die Dateien auf einen Prozess-Pool (parallel_loader.py)
+        # NEU (v2.8): 'in_place' liest FTP-Downloads ohne Kopie; 'gzip_mode' siehe log_stream.open_log
+        # NEU (v2.10): 'lazy_log' speichert in raw_df Zeilen-Verweise statt des Textes (RAW_LAZY_COLUMNS)
+        if gzip_mode:
+            self.gzip_mode = gzip_mode
+        if lazy_log is not None:
+            self.lazy_log = lazy_log
         progress_callback(0, "Starte Analyse...")
         log_files_map = self._build_log_map_from_list(file_list)
         if not log_files_map:
@@ -189,6 +257,10 @@ class MV3DLogParser:
             progress_callback(20, "Lokale Dateien werden direkt gelesen...")
             processed_files = log_files_map
             print(f"--- Analysiere {len(file_list)} lokale Dateien direkt (ohne Kopie) ---")
+        elif in_place:
+            progress_callback(30, "Prüfe heruntergeladene Logs...")
+            processed_files = self._check_files_in_place(log_files_map, progress_callback)
+            print(f"--- Analysiere heruntergeladene Dateien direkt (ohne Kopie, gzip: {self.gzip_mode}) ---")
         else:
             progress_callback(20, "Bereite 'logs'-Verzeichnis vor...")
             self.analysis_dir = self._prepare_analysis_dir()
@@ -199,49 +271,94 @@ class MV3DLogParser:
             progress_callback(100, "Analyse fehlgeschlagen: Logs konnten nicht kopiert/gefunden werden.")
             return pd.DataFrame(), pd.DataFrame()
 
-        all_incidents = []
-        all_raw_entries = []
-        
-        total_parsers = len(processed_files)
-        for i, (parser_name, files) in enumerate(processed_files.items()):
-            parser_info = self.PARSER_MAP[parser_name]
-            parser_func = parser_info['parser_func']
-            system_tag = parser_info.get('system_tag', 'UNKNOWN') 
-            
-            for file_path in files:
-                filename = os.path.basename(file_path)
-                progress = 60 + int(((i + 1) / total_parsers) * 35)
-                progress_callback(progress, f"Parse: {filename}")
-                
-                try:
-                    incidents, raw_entries = parser_func(file_path, filename, system_tag)
-                    all_incidents.extend(incidents)
-                    all_raw_entries.extend(raw_entries)
-                except Exception as e:
-                    print(f"FEHLER: Parser {parser_name} fehlgeschlagen für Datei {filename}: {e}")
+        tasks = [(parser_name, file_path) for parser_name, files in processed_files.items() for file_path in files]
+        workers = min(len(tasks), workers or 1)
+        if workers > 1:
+            results = self._parse_files_parallel(tasks, progress_callback, workers, use_cache)
+        else:
+            results = []
+            total_parsers = len(processed_files)
+            for i, (parser_name, files) in enumerate(processed_files.items()):
+                for file_path in files:
+                    progress = 60 + int(((i + 1) / total_parsers) * 35)
+                    progress_callback(progress, f"Parse: {os.path.basename(file_path)}")
+                    results.append(self._parse_task(parser_name, file_path, use_cache))
 
         progress_callback(95, "Kombiniere Ergebnisse...")
+        incident_frames = [incidents_df for incidents_df, _ in results]
+        raw_frames = [raw_df for _, raw_df in results]
 
-        if not all_raw_entries and not all_incidents:
+        incident_frames = [df for df in incident_frames if not df.empty]
+        raw_frames = [df for df in raw_frames if not df.empty]
+        if not raw_frames and not incident_frames:
             print("INFO: Analyse abgeschlossen, keine lesbaren Log-Einträge gefunden.")
             progress_callback(100, "Analyse abgeschlossen. Keine lesbaren Einträge gefunden.")
             return pd.DataFrame(), pd.DataFrame()
             
-        incidents_df = pd.DataFrame(all_incidents) if all_incidents else pd.DataFrame()
-        raw_df = pd.DataFrame(all_raw_entries) if all_raw_entries else pd.DataFrame()
+        incidents_df = pd.concat(incident_frames, ignore_index=True) if incident_frames else pd.DataFrame()
+        raw_df = concat_raw_frames(raw_frames) # v2.10: category-Spalten (lazy_log) bleiben category
         
         if not incidents_df.empty:
             incidents_df = incidents_df.sort_values(by="Timestamp").drop_duplicates()
             incidents_df.reset_index(drop=True, inplace=True)
 
         if not raw_df.empty:
-            raw_df = raw_df.sort_values(by="Timestamp").drop_duplicates()
+            # v2.10: Mit Zeilen-Verweisen zählt für Duplikate die Prüfsumme (LogCRC), nicht die Position
+            raw_df = drop_duplicate_rows(raw_df.sort_values(by="Timestamp"))
             raw_df.reset_index(drop=True, inplace=True)
         
         progress_callback(100, f"Analyse abgeschlossen. {len(incidents_df)} Ereignisse gefunden.")
         
         return incidents_df, raw_df
 
+    def _parse_files_parallel(self, tasks, progress_callback, workers, use_cache=False):
+        """
+        NEU (v2.6): Parst die Aufgaben (parser_name, file_path) in 'workers' Prozessen.
+        Die größten Dateien starten zuerst (sie bestimmen die Gesamtdauer), die Ergebnisse
+        kommen in der Reihenfolge von 'tasks' zurück - das Ergebnis ist dasselbe wie seriell.
+        Der Fortschritt (60-95 %) zählt die fertigen Dateien.
+        """
+        order = sorted(range(len(tasks)), key=lambda k: file_size(tasks[k][1]), reverse=True)
+        finished = [0]
+
+        def on_progress(_, progress, text):
+            if progress >= 100:
+                finished[0] += 1
+            progress_callback(60 + int(finished[0] / len(tasks) * 35), text)
+
+        print(f"--- Parse {len(tasks)} MV3D-Logs mit {workers} Prozessen ---")
+        ordered_results = run_parallel(_parse_task_in_worker, [tasks[k] + (self.assumed_year,) for k in order],
+                                       on_progress, workers, use_cache=use_cache, gzip_mode=self.gzip_mode,
+                                       lazy_log=self.lazy_log)
+        results = [None] * len(tasks)
+        for k, result in zip(order, ordered_results):
+            results[k] = result
+        return results
+
+    def _parse_task(self, parser_name, file_path, use_cache=False):
+        """Eine Datei mit dem Parser aus PARSER_MAP; Fehler werden gemeldet und ergeben leere DataFrames."""
+        parser_info = self.PARSER_MAP[parser_name]
+        filename = os.path.basename(file_path)
+        try:
+            return self._parse_file(parser_name, parser_info['parser_func'], file_path, filename,
+                                    parser_info.get('system_tag', 'UNKNOWN'), use_cache)
+        except Exception as e:
+            print(f"FEHLER: Parser {parser_name} fehlgeschlagen für Datei {filename}: {e}")
+            return pd.DataFrame(), pd.DataFrame()
+
+    def _parse_file(self, parser_name, parser_func, file_path, source_file, system_tag, use_cache=False):
+        """NEU (v2.5): Ein Log -> (incidents_df, raw_df), mit 'use_cache' über den Parse-Cache."""
+        def parse():
+            return parser_func(file_path, source_file, system_tag)
+
+        if not use_cache:
+            return parse()
+        # Jahr: Zeitstempel ohne Jahresangabe bekommen self.assumed_year
+        params = {"parser": parser_name, "source_file": source_file, "system": system_tag, "year": self.assumed_year}
+        if self.lazy_log:
+            params["lazy_log"] = True # anderes Ergebnis-Schema (RAW_LAZY_COLUMNS)
+        return get_default_cache().cached_frames(file_path, "mv3d", PARSER_VERSION, params, parse, 2)
+
     # --- Datei-Vorbereitung (unverändert zu v2.0/v2.1) ---
     def _build_log_map_from_list(self, file_list):
         log_files_map = {}
@@ -262,6 +379,28 @@ class MV3DLogParser:
         print(f"--- Analyse-Verzeichnis erstellt/geprüft: {analysis_path}")
         return analysis_path
 
+    def _check_files_in_place(self, log_files_map, progress_callback):
+        """NEU (v2.8): Wie _copy_files_to_analysis_dir (gleiche Prüfungen), aber ohne Kopie."""
+        processed_files = {}
+        total_files = sum(len(files) for files in log_files_map.values())
+        checked_count = 0
+        for parser_name, file_paths in log_files_map.items():
+            for file_path in file_paths:
+                checked_count += 1
+                try:
+                    if not os.path.isfile(file_path):
+                        print(f"WARNUNG: (FTP) Überspringe (nicht gefunden): {file_path}")
+                        continue
+                    if os.path.getsize(file_path) == 0:
+                        print(f"WARNUNG: (FTP) Überspringe (0-Byte): {file_path}")
+                        continue
+                except OSError as e:
+                    print(f"WARNUNG: (FTP) Datei nicht lesbar {file_path}: {e}")
+                    continue
+                processed_files.setdefault(parser_name, []).append(file_path)
+                progress_callback(30 + int((checked_count / total_files) * 30), f"Prüfe: {os.path.basename(file_path)}")
+        return processed_files
+
     def _copy_files_to_analysis_dir(self, log_files_map, progress_callback):
         processed_files = {}
         total_files = sum(len(files) for files in log_files_map.values())
@@ -298,51 +437,45 @@ class MV3DLogParser:
         return processed_files
 
     # --- 2. Haupt-Parsing-Logik (Logik von v2.1 - ist korrekt) ---
-    def _parse_line(self, line, source_file, system):
+    def _parse_line(self, line):
+        """
+        GIBT ZURÜCK: (timestamp, line_clean, bag_id, tray_id, incident) oder None (kein Zeitstempel).
+        'incident' ist (category, error) des ersten passenden Fehlermusters oder None.
+        (v2.6: Werte statt Dictionaries, Quelldatei/System ergänzt _generic_parser spaltenweise)
+        """
         timestamp = self._get_timestamp(line)
         if timestamp is None:
-            return None, None 
-        
+            return None
+        return (timestamp,) + self._parse_content(line)
+
+    def _parse_content(self, line):
+        """v2.9: Der Teil von _parse_line ohne Zeitstempel -> (line_clean, bag_id, tray_id, incident)."""
         line_clean = line.strip()
         bag_id = self._get_bag_id(line_clean)
         tray_id = self._get_tray_id(line_clean)
         incident = None
         line_lower = line_clean.lower()
         
-        for pattern, details, category in self.ERROR_PATTERNS:
-            match = pattern.search(line_lower)
-            if match:
-                incident = {
-                    "Timestamp": timestamp, 
-                    "Category": category, 
-                    "Error": match.group(0), 
-                    "SourceFile": source_file,
-                    "BagID": bag_id, 
-                    "TrayID": tray_id, 
-                    "System": system,
-                    "OriginalLog": line_clean 
-                }
-                break 
+        # v2.7: erstes passende Muster wie bisher, aber nur Kandidaten aus dem Literal-Vorfilter
+        hit = self.error_matcher.search(line_lower)
+        if hit:
+            index, match = hit
+            incident = (self.ERROR_PATTERNS[index][2], match.group(0))
                 
-        raw_entry = {
-            "Timestamp": timestamp, "SourceFile": source_file,
-            "BagID": bag_id, "TrayID": tray_id,
-            "System": system, "OriginalLog": line_clean
-        }
-        return incident, raw_entry
+        return line_clean, bag_id, tray_id, incident
 
     def _get_timestamp(self, line):
         # (unverändert zu v2.0/v2.1)
         match = self.TS_REGEX.search(line)
         if not match: return None
+        return self._decode_timestamp_match(match)
+
+    def _decode_timestamp_match(self, match):
+        """Ein Treffer von TS_REGEX -> datetime (oder None). v2.9: aus _get_timestamp herausgelöst."""
         try:
             ts_str = None
             if match.group(1): # Format 1: YYYY-MM-DD HH:MM:SS
-                ts_str = match.group(1).replace(',', '.') 
-                if '.' in ts_str:
-                    parts = ts_str.split('.')
-                    ts_str = parts[0] + '.' + parts[1][:6]
-                return pd.to_datetime(ts_str)
+                return parse_iso_fixed(match.group(1))
             elif match.group(2): # Format 2: [Wochentag] Monat Tag HH:MM:SS
                 ts_str = match.group(2).replace(',', '.').replace('  ', ' ')
                 ms_part = None
@@ -361,9 +494,8 @@ class MV3DLogParser:
                 dt = dt.replace(year=self.assumed_year)
                 if ms_part: dt = dt.replace(microsecond=ms_part)
                 return dt
-            elif match.group(4): # Format 3: YYYY-MM-DDTHH:MM:SS.sssZ
-                ts_str = match.group(4).replace(',', '.')
-                return pd.to_datetime(ts_str)
+            elif match.group(3): # Format 3: YYYY-MM-DDTHH:MM:SS.sssZ (naiv, wie die übrigen Formate)
+                return parse_iso_fixed(match.group(3))
         except Exception as e:
             return None
         return None
@@ -378,21 +510,174 @@ class MV3DLogParser:
 
     # --- 3. Spezifische Log-Parser ---
     def _generic_parser(self, file_path, source_file, system_tag):
-        # (unverändert zu v2.0/v2.1)
-        incidents, raw_entries = [], []
+        """
+        GIBT ZURÜCK: (incidents_df, raw_df) - NEU (v2.6): spaltenweise gesammelt
+        (gleiches Ergebnis wie vorher pd.DataFrame(Liste von Dictionaries)).
+        """
+        timestamps = FileTimestamps(self)
+        lazy_log = self.lazy_log
+        raw = {"BagID": [], "TrayID": []}
+        raw.update({col: [] for col in ("LogOffset", "LogLength", "LogCRC")} if lazy_log else {"OriginalLog": []})
+        incidents = {"Row": [], "Category": [], "Error": [], "OriginalLog": []}
         try:
-            if file_path.endswith(".gz"):
-                f = gzip.open(file_path, 'rt', encoding='utf-8', errors='ignore')
-            else:
-                f = open(file_path, 'r', encoding='utf-8', errors='ignore')
-
-            with f:
-                for line in f:
-                    incident, raw_entry = self._parse_line(line, source_file, system_tag)
-                    if raw_entry:
-                        raw_entries.append(raw_entry)
-                    if incident:
-                        incidents.append(incident)
+            for line, offset, length in self._iter_lines(file_path):
+                # v2.9: Zeitstempel vorerst als Roh-String, umgewandelt wird am Dateiende (timestamps.decode)
+                if not timestamps.add(line):
+                    continue
+                line_clean, bag_id, tray_id, incident = self._parse_content(line)
+                if incident:
+                    incidents["Row"].append(len(raw["BagID"]))
+                    incidents["Category"].append(incident[0])
+                    incidents["Error"].append(incident[1])
+                    incidents["OriginalLog"].append(line_clean)
+                raw["BagID"].append(bag_id)
+                raw["TrayID"].append(tray_id)
+                if lazy_log:
+                    raw["LogOffset"].append(offset)
+                    raw["LogLength"].append(length)
+                    raw["LogCRC"].append(line_crc(line_clean))
+                else:
+                    raw["OriginalLog"].append(line_clean)
         except (OSError, FileNotFoundError, gzip.BadGzipFile) as e:
             print(f"FEHLER: Datei konnte nicht gelesen werden (evtl. defekt oder Symlink): {file_path}. Fehler: {e}")
-        return incidents, raw_entries
\ No newline at end of file
+
+        # Zeilen, deren Zeitstempel sich nicht umwandeln ließ, fallen wie bisher weg
+        decoded = timestamps.decode()
+        valid = ~np.isnat(decoded)
+        rows = np.flatnonzero(valid)
+        raw_columns = {col: [values[i] for i in rows] for col, values in raw.items()}
+        raw_columns["Timestamp"] = decoded[rows]
+        incident_rows = [k for k, row in enumerate(incidents["Row"]) if valid[row]]
+        incident_columns = {col: [raw[col][incidents["Row"][k]] for k in incident_rows] for col in ("BagID", "TrayID")}
+        incident_columns.update({col: [incidents[col][k] for k in incident_rows]
+                                 for col in ("Category", "Error", "OriginalLog")})
+        incident_columns["Timestamp"] = decoded[[incidents["Row"][k] for k in incident_rows]]
+        incidents_df = self._columns_to_frame(incident_columns, INCIDENT_COLUMNS, source_file, system_tag)
+        if not lazy_log:
+            return incidents_df, self._columns_to_frame(raw_columns, RAW_COLUMNS, source_file, system_tag)
+
+        raw_columns["LogFile"] = [file_path] * len(rows)
+        raw_df = compact_raw_df(self._columns_to_frame(raw_columns, RAW_LAZY_COLUMNS, source_file, system_tag))
+        for col in RAW_CATEGORY_COLUMNS:
+            if col in raw_df.columns:
+                raw_df[col] = raw_df[col].astype("category")
+        return incidents_df, raw_df
+
+    def _iter_lines(self, file_path):
+        """
+        (line, offset, length) pro Zeile; Position und Länge nur mit lazy_log (sonst None).
+        v2.8: .gz als Strom (python/parallel/pipe), Text wie bisher gzip.open(..., 'rt')
+        """
+        if self.lazy_log:
+            yield from iter_log_lines(file_path, self.gzip_mode)
+            return
+        with open_log(file_path, self.gzip_mode) as f:
+            for line in f:
+                yield line, None, None
+
+    @staticmethod
+    def _columns_to_frame(columns, column_order, source_file, system_tag):
+        n_rows = len(columns["Timestamp"])
+        if not n_rows:
+            return pd.DataFrame()
+        columns = dict(columns, SourceFile=[source_file] * n_rows, System=[system_tag] * n_rows,
+                       Timestamp=pd.Series(columns["Timestamp"]).astype(PY_DATETIME_DTYPE))
+        return pd.DataFrame({col: columns[col] for col in column_order})
+
+
+class FileTimestamps:
+    """
+    NEU (v2.9): Zeitstempel-Spalte einer MV3D-Datei.
+
+    Das Format wird an der ersten Zeile mit Zeitstempel am Zeilenanfang erkannt; danach prüft pro
+    Zeile nur noch der verankerte Regex dieses Formats (TS_FORMAT_PATTERNS) und merkt sich den
+    Roh-String. decode() wandelt alle Roh-Strings eines Formats in einem Aufruf um.
+    Passt eine Zeile nicht, wird sie wie bisher dekodiert (TS_REGEX + _decode_timestamp_match)
+    und das Format neu erkannt - das Ergebnis ist in jedem Fall dasselbe wie mit _get_timestamp.
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.format = None  # erkanntes Format (Schlüssel von TS_FORMAT_PATTERNS)
+        self.raw = []       # Roh-String (Schnellweg) oder None
+        self.formats = []   # Format des Roh-Strings
+        self.values = {}    # Zeile -> bereits dekodierter Wert (bisheriger Weg)
+
+    def add(self, line):
+        """Nimmt den Zeitstempel der Zeile auf. False: Zeile hat keinen (wird übersprungen)."""
+        if self.format is not None:
+            match = TS_FORMAT_PATTERNS[self.format].match(line)
+            if match:
+                self.raw.append(match.group())
+                self.formats.append(self.format)
+                return True
+
+        match = self.parser.TS_REGEX.search(line)
+        if not match:
+            return False
+        if match.start() == 0:
+            self.format = TS_FORMAT_BY_GROUP[match.lastindex]
+        timestamp = self.parser._decode_timestamp_match(match)
+        if timestamp is None:
+            return False
+        self.values[len(self.raw)] = timestamp
+        self.raw.append(None)
+        self.formats.append(None)
+        return True
+
+    def decode(self):
+        """GIBT ZURÜCK: datetime64[us]-Array (eine Zeile pro add() == True), NaT = ungültig."""
+        decoded = np.full(len(self.raw), np.datetime64('NaT'), dtype='datetime64[us]')
+        if self.values:
+            decoded[list(self.values)] = np.array(list(self.values.values()), dtype='datetime64[us]')
+        formats = pd.Series(self.formats, dtype=object)
+        raw = pd.Series(self.raw, dtype=object)
+        for ts_format in formats.dropna().unique():
+            rows = np.flatnonzero((formats == ts_format).to_numpy())
+            converted = self._convert(ts_format, raw.iloc[rows].reset_index(drop=True))
+            # Was spaltenweise nicht ging, einzeln wie bisher (die Regeln sind dieselben, nur langsamer)
+            for k in np.flatnonzero(np.isnat(converted)):
+                value = self.parser._decode_timestamp_match(self.parser.TS_REGEX.match(raw.iloc[rows[k]]))
+                converted[k] = np.datetime64(value, 'us') if value is not None else np.datetime64('NaT')
+            decoded[rows] = converted
+        return decoded
+
+    def _convert(self, ts_format, raw):
+        if ts_format in ("iso", "iso_z"):
+            return iso_series_to_datetime(raw).to_numpy(dtype='datetime64[us]', copy=True)
+
+        # Syslog: wie strptime('%a %b %d %H:%M:%S') bzw. ('%b %d %H:%M:%S'), Jahr = assumed_year
+        parts = raw.str.extract(SYSLOG_PARTS)
+        month = parts[1].map(MONTH_NUMBERS)
+        day, hour, minute, second = (pd.to_numeric(parts[col], errors='coerce') for col in (2, 3, 4, 5))
+        valid = (month.notna() & (parts[0].isna() | parts[0].isin(WEEKDAY_NAMES))
+                 # to_datetime würde 24:00 / :60 auf den nächsten Tag bzw. die nächste Minute schieben
+                 & (hour < 24) & (minute < 60) & (second < 60)
+                 # strptime ohne Jahr rechnet mit 1900: der 29. Februar war dort nie gültig
+                 & ~((month == 2) & (day == 29)))
+        fraction = parts[6].fillna('').str.slice(0, 6).str.ljust(6, '0')
+        local = pd.to_datetime(pd.DataFrame({"year": self.parser.assumed_year, "month": month.where(valid),
+                                             "day": day, "hour": hour, "minute": minute, "second": second,
+                                             "microsecond": pd.to_numeric(fraction, errors='coerce').fillna(0)}),
+                               errors='coerce')
+        return local.to_numpy(dtype='datetime64[us]', copy=True)
+
+
+# --- NEU (v2.6): Worker für run_full_analysis(workers > 1) ---
+
+_worker_parser = None
+
+def _parse_task_in_worker(parser_name, file_path, assumed_year, report, use_cache=False, gzip_mode="python",
+                          lazy_log=False):
+    """Läuft im Worker-Prozess (parallel_loader.run_parallel): ein MV3DLogParser pro Prozess."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = MV3DLogParser()
+    _worker_parser.assumed_year = assumed_year
+    _worker_parser.gzip_mode = gzip_mode
+    _worker_parser.lazy_log = lazy_log
+    filename = os.path.basename(file_path)
+    report(0, f"Parse: {filename}")
+    result = _worker_parser._parse_task(parser_name, file_path, use_cache)
+    report(100, f"Parse: {filename}")
+    return result
\ No newline at end of file
@@ -1,19 +1,24 @@
 # oms_log_parser.py
-print("--- [V8-FIX-14] oms_log_parser.py wird geladen (Nur OMS, Robuste Regex V12, MEHR Klartext V14) ... ---")
+print("--- [V8-FIX-21] oms_log_parser.py wird geladen (Nur OMS, Klassifizierung V18, Gestufte Filter V19, Byte-Bereiche parallel V20, Parse-Cache V21) ... ---")
 
 import re
 import pandas as pd
-from datetime import datetime
 import os
-import pytz
 import traceback 
 
+from log_timestamps import TimestampDecoder
+from log_stream import iter_line_blocks, line_offsets, file_size, split_line_ranges, DEFAULT_BLOCK_SIZE
+from parallel_loader import run_parallel
+from raw_schema import line_crc
+from parse_cache import get_default_cache, year_hint
+
 # --- KORREKTUR: Importiere die Übersetzungs-Logik aus log_parser.py ---
 try:
-    from log_parser import _normalize_iata
+    from log_parser import _normalize_iata, extract_ids_batch
     print("--- INFO (oms_log_parser): _normalize_iata erfolgreich aus log_parser importiert. ---")
 except ImportError:
     print("--- WARNUNG (oms_log_parser): Konnte _normalize_iata nicht aus log_parser importieren. Definiere Fallback. ---")
+    extract_ids_batch = None # Batch-Modus nicht verfügbar
     
     # --- Fallback-Definition (KORRIGIERT, um '0123' beizubehalten) ---
     def _normalize_iata(iata_str):
@@ -83,15 +88,51 @@ EVENT_PATTERNS = [
     (re.compile(r"bag thinks it missed it's diverter event"),
         lambda m, ident: f"[OMS] FEHLER: Bag glaubt, die Weiche verpasst zu haben (Encoder-Problem)."),
 
-    # Ignoriere diese Zeilen
-    (re.compile(r"RFID FOUND -"), lambda m, ident: None), # V14: Ignoriere die RFID FOUND Zeile (zu viele Rohdaten)
-    (re.compile(r"TricInterfaceMgr::slotSendFaultStatus"), lambda m, ident: None), 
-    (re.compile(r"CCTBagImagePool::ReceiveVsCount"), lambda m, ident: None),
-    (re.compile(r"slotUpdateTricRTRCnvState"), lambda m, ident: None),
-    (re.compile(r"slotSendEncoderUpdate"), lambda m, ident: None)
+    # Ignoriere diese Zeilen (Handler None)
+    (re.compile(r"RFID FOUND -"), None), # V14: Ignoriere die RFID FOUND Zeile (zu viele Rohdaten)
+    (re.compile(r"TricInterfaceMgr::slotSendFaultStatus"), None), 
+    (re.compile(r"CCTBagImagePool::ReceiveVsCount"), None),
+    (re.compile(r"slotUpdateTricRTRCnvState"), None),
+    (re.compile(r"slotSendEncoderUpdate"), None)
 ]
 # --- ENDE KORREKTUR V14 ---
 
+# --- NEU (V18): Klassifizierung mit Schlüsselwort-Index ---
+# Jedes Muster enthält ein festes Schlüsselwort (gleiche Reihenfolge wie EVENT_PATTERNS, klein geschrieben).
+# Eine einzige kombinierte Suche erkennt Zeilen ohne Ereignis; die eigentliche Regex läuft nur
+# für Muster, deren Schlüsselwort in der Zeile vorkommt.
+EVENT_PATTERN_KEYWORDS = [
+    'writing to plc diverter cmd:',
+    'setfinalbagdisposition',
+    'postopdec',
+    'cachebagdisposition',
+    'cachebagdisposition',
+    'removebagdisposition',
+    'lookupbagdisposition',
+    'lookupbagdisposition',
+    'slotdiverteraction',
+    'slotdivertrfid',
+    'slotdivertrfid',
+    'slotassociateexternalbagids',
+    'slotdiverteraction',
+    'slotsendtricbagdispositionmsg',
+    'does not match',
+    "bag thinks it missed it's diverter event",
+    'rfid found -',
+    'tricinterfacemgr::slotsendfaultstatus',
+    'cctbagimagepool::receivevscount',
+    'slotupdatetricrtrcnvstate',
+    'slotsendencoderupdate'
+]
+# Gesucht wird in der klein geschriebenen Zeile (schneller als re.IGNORECASE über alle Alternativen)
+EVENT_KEYWORD_PATTERN = re.compile('|'.join(re.escape(k) for k in dict.fromkeys(EVENT_PATTERN_KEYWORDS)))
+_EVENT_DISPATCH = [(keyword, pattern, handler) for keyword, (pattern, handler) in zip(EVENT_PATTERN_KEYWORDS, EVENT_PATTERNS)]
+
+# Ergebnis der Klassifizierung: genau eines pro Zeile
+OMS_EVENT = "event"       # Ein EVENT_PATTERN liefert Klartext
+OMS_IGNORED = "ignored"   # Ein Ignorier-Muster (Handler None) trifft zuerst zu
+OMS_RAW = "raw"           # Kein Muster: OMS-Nachricht bzw. Rohzeile als Klartext
+
 
 # --- KORREKTUR (V12): Zeitstempel-Muster (erkennt BEIDE Formate) ---
 TIMESTAMP_PATTERN = re.compile(
@@ -109,128 +150,270 @@ IATA_PATTERN = re.compile(
     re.IGNORECASE
 )
 OMS_MESSAGE_PATTERN = re.compile(r'\[OMS:.*\]:\s*(.*)')
+SYSLOG_PREFIX_PATTERN = re.compile(r'([A-Z][a-z]{2}\s+[A-Z][a-z]{2}\s+\d{2}\s+\d{2}:\d{2}:\d{2})\.\d+\s+(.*)')
+
+
+def classify_oms_line(line, ident):
+    """
+    Ordnet eine Zeile genau EINMAL einem Ergebnis zu (erstes passendes Muster gewinnt, wie bisher).
+    GIBT ZURÜCK: (OMS_EVENT | OMS_IGNORED | OMS_RAW, Klartext oder None)
+    """
+    lowered = line.lower()
+    if EVENT_KEYWORD_PATTERN.search(lowered):
+        for keyword, pattern, handler in _EVENT_DISPATCH:
+            if keyword in lowered and (m := pattern.search(line)):
+                if handler is None:
+                    return OMS_IGNORED, None
+                return OMS_EVENT, handler(m, ident)
 
+    if '[OMS:' in line and (message_match := OMS_MESSAGE_PATTERN.search(line)):
+        return OMS_RAW, f"[OMS] {message_match.group(1).strip()}"
+    if ts_prefix_match := SYSLOG_PREFIX_PATTERN.match(line):
+        return OMS_RAW, f"[OMS-RAW] {ts_prefix_match.group(2).strip()}"
+    return OMS_RAW, f"[OMS-RAW] {line.strip()}"
 
-def parse_oms_log(file_path, update_progress=None):
+
+# --- NEU (V19): Gestufte Filter-Pipeline ---
+# Stufe 1: billige Substring-Prüfung (kann die Zeile überhaupt eine BagID/IATA enthalten?)
+# Stufe 2: Zeitstempel
+# Stufe 3: die vollständigen BAG_ID_PATTERN / IATA_PATTERN
+# Stufe 4: Klartext (ignorierte Zeilen und ungültige Zeitstempel fallen hier heraus)
+FILTER_STAGES = ("id_hint", "timestamp", "ids", "record")
+
+# NEU (V20): Kleinere Dateien lohnen den Prozess-Start nicht (workers > 1)
+PARALLEL_MIN_RANGE_SIZE = 16 * 1024 * 1024
+
+# NEU (V21): Geht in den Cache-Schlüssel ein (parse_cache.py): erhöhen, wenn sich das Ergebnis ändert
+PARSER_VERSION = "V21"
+
+
+def has_id_hint(line):
+    """
+    Stufe 1: Notwendige Bedingung für einen Treffer von BAG_ID_PATTERN oder IATA_PATTERN.
+    BAG_ID_PATTERN braucht '"0'; IATA_PATTERN braucht 'iata', 'rfid' oder ('=' und 'for'/'tric').
+    Nicht-ASCII-Zeilen passieren immer (IGNORECASE lässt z.B. 'İ' als 'i' gelten).
+    """
+    if '"0' in line or not line.isascii():
+        return True
+    lowered = line.lower()
+    return 'iata' in lowered or 'rfid' in lowered or ('=' in lowered and ('for' in lowered or 'tric' in lowered))
+
+
+class OmsFilterStats:
+    """
+    Zähler pro Filter-Stufe: wie viele Zeilen eine Stufe erreicht haben und wie viele sie verworfen hat.
+    Zeigt, wo auf dem Log eines Standorts die Zeit hingeht (z.B. viele Zeilen erst in Stufe 3 verworfen).
+    """
+
+    def __init__(self):
+        self.lines = 0
+        self.rejected = dict.fromkeys(FILTER_STAGES, 0)
+
+    def reached(self, stage):
+        """Anzahl Zeilen, die 'stage' erreicht haben."""
+        count = self.lines
+        for previous in FILTER_STAGES[:FILTER_STAGES.index(stage)]:
+            count -= self.rejected[previous]
+        return count
+
+    @property
+    def records(self):
+        return self.reached(FILTER_STAGES[-1]) - self.rejected[FILTER_STAGES[-1]]
+
+    def merge(self, other):
+        self.lines += other.lines
+        for stage in FILTER_STAGES:
+            self.rejected[stage] += other.rejected[stage]
+        return self
+
+    def as_dict(self):
+        return {"lines": self.lines, "records": self.records,
+                **{f"{stage}_rejected": self.rejected[stage] for stage in FILTER_STAGES}}
+
+    def summary(self):
+        parts = [f"{stage}: {self.reached(stage)} -> -{self.rejected[stage]}" for stage in FILTER_STAGES]
+        return f"{self.lines} Zeilen | " + " | ".join(parts) + f" | {self.records} Einträge"
+
+
+def _extract_ids_line(line):
+    """Zeile-für-Zeile: BagID und normalisierte IATA."""
+    bag_id_match = BAG_ID_PATTERN.search(line) if '"0' in line else None
+    iata_match = IATA_PATTERN.search(line) # Nutzt die neue, strikte Regex (V12)
+    
+    bag_id = bag_id_match.group(1) if bag_id_match else "N/A"
+    
+    # --- KORRIGIERTE GRUPPEN-ZUWEISUNG (V12) ---
+    raw_iata = "N/A"
+    if iata_match:
+        # Prüfe alle 3 möglichen Treffer-Gruppen der neuen Regex
+        raw_iata = iata_match.group(1) or iata_match.group(3) or iata_match.group(4)
+    iata = _normalize_iata(raw_iata)
+    # --- ENDE KORREKTUR ---
+    return bag_id, iata
+
+
+def _build_record(line, bag_id, iata):
+    """Klartext für eine Zeile mit ID. GIBT ZURÜCK: dict (Timestamp noch leer) oder None (ignoriert)."""
+    ident = iata if iata != "N/A" else bag_id
+    
+    # --- KLARTEXT-LOGIK (V18: eine Klassifizierung pro Zeile) ---
+    _, klartext = classify_oms_line(line, ident)
+    if not klartext: # Ignorierte Zeilen
+        return None
+    return {
+        'Timestamp': None, # wird in _decode_records gesetzt
+        'Source': 'OMS', 
+        'Klartext': klartext,
+        'OriginalLog': line.strip(), 
+        'IATA': iata, 
+        'BagID': bag_id,
+        'Device': "N/A" # OMS-Parser findet kein CCT-Gerät
+    }
+
+
+def _scan_block(file_path, block_offset, raw_lines, batch_extract, lazy_log, stats):
+    """
+    Stufen 1-3 + Klartext für einen Block (ohne Zeitstempel-Zustand, daher auch in Worker-Prozessen).
+    GIBT ZURÜCK: Liste (iso_raw, syslog_raw, record oder None) in Datei-Reihenfolge.
+    """
+    lines = [raw_line.decode('utf-8', errors='ignore') for raw_line in raw_lines]
+    offsets = line_offsets(block_offset, raw_lines) if lazy_log else None
+    
+    # Stufen 1 + 2: Substring-Prüfung, dann Zeitstempel
+    stats.lines += len(lines)
+    hinted = [i for i, line in enumerate(lines) if has_id_hint(line)]
+    stats.rejected["id_hint"] += len(lines) - len(hinted)
+    timed = [(i, m) for i in hinted if (m := TIMESTAMP_PATTERN.search(lines[i]))]
+    stats.rejected["timestamp"] += len(hinted) - len(timed)
+    
+    # Stufe 3: vollständige ID-Regex
+    if batch_extract and timed:
+        ids = extract_ids_batch([lines[i] for i, _ in timed], BAG_ID_PATTERN, IATA_PATTERN, cct_pattern=None)
+        candidates = zip(timed, ids["BagID"], ids["IATA"])
+    else:
+        candidates = (((i, m), *_extract_ids_line(lines[i])) for i, m in timed)
+    
+    pending = []
+    for (i, ts_match), bag_id, iata in candidates:
+        if bag_id == "N/A" and iata == "N/A":
+            stats.rejected["ids"] += 1
+            continue
+        record = _build_record(lines[i], bag_id, iata)
+        if record and lazy_log:
+            record['LogFile'] = file_path
+            record['LogOffset'] = offsets[i]
+            record['LogLength'] = len(raw_lines[i])
+            record['LogCRC'] = line_crc(record.pop('OriginalLog'))
+        # Auch ignorierte Zeilen bleiben drin: ihr Zeitstempel schreibt den Jahreswechsel fort
+        pending.append((ts_match.group(1), ts_match.group(2), record))
+    return pending
+
+
+def _decode_records(pending, decoder, stats, data):
+    """Stufe 4: Zeitstempel in Datei-Reihenfolge dekodieren (Jahreswechsel!) und Einträge übernehmen."""
+    for iso_raw, syslog_raw, record in pending:
+        if iso_raw:
+            # Fall 1: Format '2025-10-14 12:57:30.096' (oder ',096')
+            timestamp_utc = decoder.iso_to_utc(iso_raw)
+        else:
+            # Fall 2: Format 'Sat Nov 01 06:01:27'
+            timestamp_utc = decoder.syslog_to_utc(syslog_raw)
+        if timestamp_utc is None or record is None:
+            stats.rejected["record"] += 1
+            continue
+        record['Timestamp'] = timestamp_utc
+        data.append(record)
+
+
+def _scan_range(file_path, start_offset, end_offset, update_progress=None, batch_extract=False, lazy_log=False,
+                block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Worker für parse_oms_log(workers > 1): Stufen 1-3 für einen Byte-Bereich.
+    Meldet den Fortschritt als gelesene Bytes. GIBT ZURÜCK: (pending, OmsFilterStats).
+    """
+    stats = OmsFilterStats()
+    pending = []
+    for block_offset, raw_lines, bytes_consumed in iter_line_blocks(file_path, block_size, start_offset, end_offset):
+        pending.extend(_scan_block(file_path, block_offset, raw_lines, batch_extract, lazy_log, stats))
+        if update_progress:
+            update_progress(bytes_consumed, file_path)
+    return pending, stats
+
+
+def _scan_ranges_parallel(file_path, byte_ranges, update_progress, workers, **scan_kwargs):
+    """Verteilt die Byte-Bereiche auf 'workers' Prozesse; Ergebnisse in Datei-Reihenfolge."""
+    filename = os.path.basename(file_path)
+    total_size = file_size(file_path) or 1
+    consumed = [0] * len(byte_ranges)
+    
+    def on_progress(range_index, bytes_consumed, _):
+        consumed[range_index] = min(bytes_consumed, byte_ranges[range_index][1] - byte_ranges[range_index][0])
+        if update_progress:
+            update_progress(min(100, int(sum(consumed) / total_size * 100)), f"Analysiere {filename}...")
+    
+    print(f"--- DEBUG (oms_log_parser): {len(byte_ranges)} Byte-Bereiche mit {workers} Prozessen ---")
+    tasks = [(file_path, start, end) for start, end in byte_ranges]
+    return run_parallel(_scan_range, tasks, on_progress, workers, **scan_kwargs)
+
+
+def parse_oms_log(file_path, update_progress=None, batch_extract=False, lazy_log=False, block_size=DEFAULT_BLOCK_SIZE,
+                  stats=None, workers=1, use_cache=False):
     """
     Parst eine OMS.log-Datei.
     KORRIGIERT (V14): Behandelt beide Zeitstempel-Formate als LOKALZEIT (Berlin) und 
     verwendet die neue V14-IATA-Regex.
+    NEU (V15): Zeitstempel über TimestampDecoder. ISO-Zeitstempel mit Dezimalkomma
+    ('2025-10-14 12:57:30,096') werden jetzt dekodiert; bisher hat strptime sie abgelehnt
+    und die Zeilen fielen stillschweigend weg.
+    NEU (V16): 'batch_extract' extrahiert BagID/IATA spaltenweise (str.extract) pro Block.
+    Das Ergebnis ist identisch zum Zeile-für-Zeile-Modus.
+    NEU (V17): Liest blockweise (log_stream) statt readlines(). 'lazy_log' speichert statt
+    OriginalLog nur LogFile/LogOffset/LogLength/LogCRC (siehe raw_schema.py).
+    NEU (V19): Gestufte Filter (FILTER_STAGES). 'stats': optional ein OmsFilterStats, das die
+    Treffer/Verwürfe pro Stufe aufsummiert.
+    NEU (V20): 'workers' > 1 teilt große Dateien an Zeilengrenzen in Byte-Bereiche, die parallel
+    gefiltert und klassifiziert werden. Die Zeitstempel werden danach in Datei-Reihenfolge
+    dekodiert (Jahreswechsel), das Ergebnis ist identisch zum sequentiellen Lauf.
+    NEU (V21): 'use_cache' liest das Ergebnis aus dem Parse-Cache (parse_cache.py), solange sich die
+    Datei nicht geändert hat ('stats' bleibt dann leer).
     """
-    print(f"\n--- DEBUG (oms_log_parser V8-FIX-14): Starte Analyse für {os.path.basename(file_path)} ---")
+    if use_cache:
+        df = get_default_cache().cached(
+            file_path, "oms", PARSER_VERSION, {"lazy_log": lazy_log, "year": year_hint()},
+            lambda: parse_oms_log(file_path, update_progress, batch_extract, lazy_log, block_size, stats, workers))
+        if update_progress:
+            update_progress(100, f"Analysiere {os.path.basename(file_path)}...")
+        return df
+
+    filename = os.path.basename(file_path)
+    print(f"\n--- DEBUG (oms_log_parser V8-FIX-21): Starte Analyse für {filename} ---")
     data = []
-    current_year = datetime.now().year
+    decoder = TimestampDecoder() # V15: Gecachte Zeitstempel (Europe/Berlin -> UTC, Jahreswechsel)
+    stats = stats if stats is not None else OmsFilterStats()
+    if batch_extract and extract_ids_batch is None:
+        print("--- WARNUNG (oms_log_parser): Batch-Modus nicht verfügbar, verwende Zeile-für-Zeile. ---")
+        batch_extract = False
     
     try:
-        local_tz = pytz.timezone('Europe/Berlin')
-    except pytz.exceptions.UnknownTimeZoneError:
-        local_tz = pytz.utc # Fallback
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-            
-        total_lines = len(lines)
-        if total_lines == 0:
-            return pd.DataFrame()
-
-        for i, line in enumerate(lines):
-            if update_progress and (i % 200 == 0 or i == total_lines - 1):
-                progress = int(((i + 1) / total_lines) * 100)
-                update_progress(progress, f"Analysiere {os.path.basename(file_path)}...")
-
-            bag_id_match = BAG_ID_PATTERN.search(line)
-            iata_match = IATA_PATTERN.search(line) # Nutzt die neue, strikte Regex (V12)
-            
-            bag_id = bag_id_match.group(1) if bag_id_match else "N/A"
-            
-            # --- KORRIGIERTE GRUPPEN-ZUWEISUNG (V12) ---
-            raw_iata = "N/A"
-            if iata_match:
-                # Prüfe alle 3 möglichen Treffer-Gruppen der neuen Regex
-                raw_iata = iata_match.group(1) or iata_match.group(3) or iata_match.group(4)
-            iata = _normalize_iata(raw_iata)
-            # --- ENDE KORREKTUR ---
-            
-            ident = iata if iata != "N/A" else bag_id
-            
-            if bag_id == "N/A" and iata == "N/A":
-                continue 
-                
-            ts_match = TIMESTAMP_PATTERN.search(line)
-            if not ts_match:
-                continue 
-            
-            try:
-                timestamp_utc = None
-                dt_object_naive = None 
-                
-                if ts_match.group(1):
-                    # Fall 1: Format '2025-10-14 12:57:30.096'
-                    ts_str = ts_match.group(1).split('.')[0]
-                    dt_object_naive = datetime.strptime(ts_str, '%Y-%m-%d %H:%M:%S')
-                
-                elif ts_match.group(2):
-                    # Fall 2: Format 'Sat Nov 01 06:01:27'
-                    dt_no_year = datetime.strptime(ts_match.group(2), "%a %b %d %H:%M:%S")
-                    dt_object_naive = dt_no_year.replace(year=current_year)
-                
-                else:
-                    continue 
-
-                if dt_object_naive:
-                    aware_local_time = local_tz.localize(dt_object_naive, is_dst=None)
-                    timestamp_utc = aware_local_time.astimezone(pytz.utc)
-
-                if pd.isna(timestamp_utc):
-                    continue
-                    
-            except ValueError as ve:
-                continue
-            except Exception as e:
-                continue
-                
-            # --- KLARTEXT-LOGIK (V14) ---
-            klartext = None
-            for pattern, translation_func in EVENT_PATTERNS:
-                match = pattern.search(line)
-                if match:
-                    if translation_func is None:
-                        klartext = None 
-                        break
-                    klartext = translation_func(match, ident)
-                    break 
-            
-            if klartext is None:
-                message_match = OMS_MESSAGE_PATTERN.search(line)
-                if message_match:
-                    # Nimm nur den Text, wenn er nicht bereits von EVENT_PATTERNS als "None" (ignoriert) markiert wurde
-                    if not any(p.search(line) for p, func in EVENT_PATTERNS if func is None):
-                        klartext = f"[OMS] {message_match.group(1).strip()}"
-                else:
-                    ts_prefix_match = re.match(r'([A-Z][a-z]{2}\s+[A-Z][a-z]{2}\s+\d{2}\s+\d{2}:\d{2}:\d{2})\.\d+\s+(.*)', line)
-                    if ts_prefix_match:
-                         if not any(p.search(line) for p, func in EVENT_PATTERNS if func is None):
-                             klartext = f"[OMS-RAW] {ts_prefix_match.group(2).strip()}"
-                    else:
-                         if not any(p.search(line) for p, func in EVENT_PATTERNS if func is None):
-                             klartext = f"[OMS-RAW] {line.strip()}" 
-            # --- ENDE ---
-            
-            if klartext: # Nur hinzufügen, wenn Klartext nicht 'None' ist
-                data.append({
-                    'Timestamp': timestamp_utc, 
-                    'Source': 'OMS', 
-                    'Klartext': klartext,
-                    'OriginalLog': line.strip(), 
-                    'IATA': iata, 
-                    'BagID': bag_id,
-                    'Device': "N/A" # OMS-Parser findet kein CCT-Gerät
-                })
+        byte_ranges = split_line_ranges(file_path, workers, PARALLEL_MIN_RANGE_SIZE) if workers > 1 else []
+        if len(byte_ranges) > 1:
+            results = _scan_ranges_parallel(file_path, byte_ranges, update_progress, workers,
+                                            batch_extract=batch_extract, lazy_log=lazy_log, block_size=block_size)
+            for pending, range_stats in results:
+                stats.merge(range_stats)
+                _decode_records(pending, decoder, stats, data)
+        else:
+            total_size = file_size(file_path) or 1
+            for block_offset, raw_lines, bytes_consumed in iter_line_blocks(file_path, block_size):
+                pending = _scan_block(file_path, block_offset, raw_lines, batch_extract, lazy_log, stats)
+                _decode_records(pending, decoder, stats, data)
+                if update_progress:
+                    update_progress(min(100, int(bytes_consumed / total_size * 100)), f"Analysiere {filename}...")
                 
     except Exception as e:
-        print(f"--- FEHLER im OMS Parser (V8-FIX-14): {e} ---")
+        print(f"--- FEHLER im OMS Parser (V8-FIX-21): {e} ---")
         traceback.print_exc()
 
-    print(f"--- DEBUG (oms_log_parser V8-FIX-14): {len(data)} OMS-Zeilen erfolgreich extrahiert ---")
-    return pd.DataFrame(data)
\ No newline at end of file
+    print(f"--- DEBUG (oms_log_parser V8-FIX-21): {len(data)} OMS-Zeilen erfolgreich extrahiert ---")
+    print(f"--- DEBUG (oms_log_parser): Filter-Stufen: {stats.summary()} ---")
+    return pd.DataFrame(data)
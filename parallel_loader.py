@@ -0,0 +1,95 @@
+# parallel_loader.py
+print("--- [V2-PAR] parallel_loader.py wird geladen (Paralleles Laden mehrerer Log-Dateien, Aufgaben-Pool) ... ---")
+
+import os
+import queue
+import functools
+import multiprocessing
+import concurrent.futures
+import pandas as pd
+
+# Wartezeit zwischen zwei Abfragen der Fortschritts-Queue (Sekunden)
+PROGRESS_POLL_INTERVAL = 0.1
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    """Initialisiert einen Worker-Prozess mit der gemeinsamen Fortschritts-Queue."""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _report_progress(task_index, progress, text):
+    _progress_queue.put((task_index, progress, text))
+
+
+def _run_in_worker(func, task_index, args, kwargs):
+    """Läuft im Worker-Prozess: führt eine Aufgabe aus und meldet den Fortschritt über die Queue."""
+    return func(*args, functools.partial(_report_progress, task_index), **kwargs)
+
+
+def _drain(progress_queue, on_progress):
+    while True:
+        try:
+            task_index, progress, text = progress_queue.get_nowait()
+        except queue.Empty:
+            return
+        if on_progress:
+            on_progress(task_index, progress, text)
+
+
+def _combine(frames):
+    """Fügt die Ergebnisse EINMAL am Ende zusammen (statt pd.concat pro Datei)."""
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def run_parallel(func, tasks, on_progress=None, max_workers=None, **kwargs):
+    """
+    Führt func(*task, report, **kwargs) für jede Aufgabe in 'tasks' in einem Prozess-Pool aus.
+
+    'func' muss eine Funktion auf Modulebene sein. 'report(progress, text)' meldet den Fortschritt
+    einer Aufgabe; er kommt als 'on_progress(task_index, progress, text)' im aufrufenden Thread an.
+    GIBT ZURÜCK: Liste der Ergebnisse in Aufgaben-Reihenfolge.
+    """
+    tasks = list(tasks)
+    progress_queue = multiprocessing.Queue()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                initargs=(progress_queue,)) as executor:
+        futures = [executor.submit(_run_in_worker, func, task_index, tuple(args), kwargs)
+                   for task_index, args in enumerate(tasks)]
+        pending = set(futures)
+        while pending:
+            _, pending = concurrent.futures.wait(pending, timeout=PROGRESS_POLL_INTERVAL)
+            _drain(progress_queue, on_progress)
+        results = [future.result() for future in futures]
+
+    _drain(progress_queue, on_progress)
+    return results
+
+
+def load_files_parallel(parse_func, file_paths, update_progress=None, max_workers=None, **parse_kwargs):
+    """
+    Parst mehrere Log-Dateien parallel in einem Prozess-Pool.
+
+    'parse_func' muss eine Funktion auf Modulebene sein (z.B. parse_log_file, parse_oms_log)
+    mit der Signatur parse_func(file_path, update_progress, **parse_kwargs).
+    Der Fortschritt pro Datei wird über 'update_progress(progress, filename)' gemeldet,
+    und zwar im aufrufenden Thread. Das Ergebnis enthält die Dateien in Auswahl-Reihenfolge.
+    Bei nur einer Datei wird ohne Prozess-Pool direkt geparst.
+    """
+    file_paths = list(file_paths)
+    if not file_paths:
+        return pd.DataFrame()
+
+    workers = min(len(file_paths), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return _combine([parse_func(file_path, update_progress, **parse_kwargs) for file_path in file_paths])
+
+    print(f"--- parallel_loader: Lade {len(file_paths)} Dateien mit {workers} Prozessen ---")
+    on_progress = (lambda _, progress, filename: update_progress(progress, filename)) if update_progress else None
+    frames = run_parallel(parse_func, [(file_path,) for file_path in file_paths], on_progress, workers, **parse_kwargs)
+    return _combine(frames)
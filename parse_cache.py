@@ -0,0 +1,213 @@
+# parse_cache.py
+print("--- [V1-CACHE] parse_cache.py wird geladen (Persistenter Cache für geparste Logs, LRU nach Gesamtgröße) ... ---")
+
+import os
+import json
+import time
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+
+# Feather (Arrow) nur, wenn pyarrow installiert ist: wird per Memory-Map gelesen.
+# Ohne pyarrow: Pickle (genauso exakt, aber ohne Memory-Map).
+try:
+    import pyarrow.feather as pa_feather
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+CACHE_VERSION = 1                          # Ändern, wenn sich das Format der Einträge ändert
+FINGERPRINT_BYTES = 64 * 1024              # Anfang und Ende der Datei gehen in den Schlüssel ein
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024 # LRU: ältere Einträge werden oberhalb dieser Gesamtgröße gelöscht
+CACHE_SUFFIXES = (".feather", ".pkl")
+
+
+def default_cache_dir():
+    """Cache-Verzeichnis pro Benutzer (Windows: %LOCALAPPDATA%, sonst ~/.cache)."""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "GateView", "parse_cache")
+
+
+def file_fingerprint(file_path):
+    """
+    Pfad, Größe, mtime und SHA1 über Anfang + Ende der Datei.
+    Erkennt geänderte, angehängte und ersetzte (rotierte) Dateien, ohne die ganze Datei zu lesen.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if stat.st_size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, stat.st_size - FINGERPRINT_BYTES))
+            digest.update(f.read(FINGERPRINT_BYTES))
+    return {"path": os.path.abspath(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "content": digest.hexdigest()}
+
+
+def year_hint(now=None):
+    """
+    Für Logs ohne Jahresangabe hängt das Ergebnis vom aktuellen Monat ab (guess_start_year):
+    als Teil der Parameter wird der Eintrag monatlich neu erzeugt.
+    """
+    now = now or datetime.now()
+    return f"{now.year}-{now.month:02d}"
+
+
+class ParseCache:
+    """
+    Geparste DataFrames auf der Platte, ein Eintrag pro (Datei-Fingerprint, Parser, Version, Parameter).
+
+    Der Dateiname ist der SHA1 des Schlüssels: Ein geänderter Log oder eine neue Parser-Version
+    trifft einfach keinen Eintrag mehr, alte Einträge verschwinden über die LRU-Verdrängung.
+    Die mtime eines Eintrags ist sein letzter Zugriff.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, file_path, parser_name, parser_version, params=None):
+        key = {"cache": CACHE_VERSION, "file": file_fingerprint(file_path), "parser": parser_name,
+               "version": parser_version, "params": params or {}}
+        return hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def load(self, key):
+        """Gibt das gespeicherte DataFrame zurück (oder None) und markiert den Eintrag als benutzt."""
+        for suffix in CACHE_SUFFIXES:
+            path = self._entry_path(key, suffix)
+            if not os.path.exists(path):
+                continue
+            try:
+                if suffix == ".feather":
+                    if not FEATHER_AVAILABLE:
+                        continue
+                    # pd.read_feather kennt kein memory_map -> direkt über pyarrow
+                    df = pa_feather.read_table(path, memory_map=True).to_pandas()
+                else:
+                    df = pd.read_pickle(path)
+                os.utime(path) # LRU: letzter Zugriff
+                return df
+            except Exception as e:
+                # Defekter/abgebrochener Eintrag: verwerfen, neu parsen
+                print(f"--- parse_cache: Eintrag {os.path.basename(path)} unlesbar, wird verworfen ({e}) ---")
+                self._remove(path)
+        return None
+
+    def store(self, key, df):
+        """Speichert 'df' (atomar über eine temporäre Datei) und verdrängt danach alte Einträge."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"--- parse_cache: WARNUNG: Cache-Verzeichnis nicht verfügbar: {e} ---")
+            return
+        df = df.reset_index(drop=True)
+        for suffix in (CACHE_SUFFIXES if FEATHER_AVAILABLE else CACHE_SUFFIXES[1:]):
+            path = self._entry_path(key, suffix)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                if suffix == ".feather":
+                    df.to_feather(tmp_path)
+                else:
+                    df.to_pickle(tmp_path)
+                os.replace(tmp_path, path)
+                break
+            except Exception as e:
+                # z.B. Spalten, die Arrow nicht abbilden kann -> nächstes Format
+                print(f"--- parse_cache: WARNUNG: Speichern als {suffix} fehlgeschlagen: {e} ---")
+                self._remove(tmp_path)
+        self.evict()
+
+    def entries(self):
+        """(Pfad, Größe, letzter Zugriff) aller Einträge."""
+        found = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return found
+        for name in names:
+            if not name.endswith(CACHE_SUFFIXES):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue # gerade von einem anderen Prozess verdrängt
+            found.append((path, stat.st_size, stat.st_mtime))
+        return found
+
+    def total_size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """LRU: löscht die am längsten nicht benutzten Einträge, bis die Gesamtgröße passt."""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def cached(self, file_path, parser_name, parser_version, params, parse):
+        """
+        Gibt das DataFrame aus dem Cache zurück oder ruft 'parse()' auf und speichert das Ergebnis.
+        Ist die Datei nicht lesbar, wird ohne Cache geparst (der Parser meldet den Fehler wie bisher).
+        """
+        return self.cached_frames(file_path, parser_name, parser_version, params, lambda: (parse(),), 1)[0]
+
+    def cached_frames(self, file_path, parser_name, parser_version, params, parse, n_frames):
+        """
+        Wie cached(), aber 'parse()' liefert ein Tupel aus 'n_frames' DataFrames (ein Eintrag pro DataFrame).
+        Fehlt ein Teil (z.B. verdrängt), wird neu geparst.
+        """
+        try:
+            key = self.key_for(file_path, parser_name, parser_version, params)
+        except OSError:
+            return parse()
+
+        start = time.perf_counter()
+        frames = []
+        for part in range(n_frames):
+            df = self.load(f"{key}_{part}")
+            if df is None:
+                break
+            frames.append(df)
+        if len(frames) == n_frames:
+            self.hits += 1
+            print(f"--- parse_cache: {os.path.basename(file_path)} aus dem Cache "
+                  f"({sum(len(df) for df in frames)} Zeilen, {time.perf_counter() - start:.2f} s) ---")
+            return tuple(frames)
+
+        self.misses += 1
+        frames = parse()
+        if all(df is not None for df in frames):
+            for part, df in enumerate(frames):
+                self.store(f"{key}_{part}", df)
+        return frames
+
+
+_default_cache = None
+
+def get_default_cache():
+    """Gemeinsamer Cache pro Prozess (auch in den Worker-Prozessen von parallel_loader)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
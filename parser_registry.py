@@ -0,0 +1,268 @@
+# parser_registry.py
+print("--- [V1-REG] parser_registry.py wird geladen (Gemeinsamer Treiber für BHS/BMS/DPP/SCS/FSM/IQTK, Durchsatz pro Parser) ... ---")
+
+import os
+import re
+import time
+import importlib
+from datetime import datetime
+from itertools import repeat
+
+import pandas as pd
+
+from log_timestamps import TimestampDecoder, parse_iso_fixed
+from log_stream import iter_line_blocks, line_offsets, file_size, DEFAULT_BLOCK_SIZE
+from raw_schema import LOG_REF_COLUMNS, line_crc
+
+# Spalten wie bisher in den einzelnen Parsern (error_analyzer liest 'Ereignis')
+REGISTRY_COLUMNS = ["Timestamp", "Quelle", "Ereignis", "OriginalLog"]
+REGISTRY_LAZY_COLUMNS = ["Timestamp", "Quelle", "Ereignis"] + LOG_REF_COLUMNS
+
+# Module, die sich beim Import selbst registrieren (register_format)
+BUILTIN_FORMAT_MODULES = ["bhs_log_parser", "bms_log_parser", "dpp_log_parser",
+                          "scs_log_parser", "fsm_log_parser", "iqtk_log_parser"]
+
+
+# --- Zeitstempel-Formate: Name -> Fabrik für eine Dekodier-Funktion (pro Datei neu, wegen Jahreswechsel) ---
+
+def _syslog_decoder(start_year):
+    return TimestampDecoder(start_year=start_year).parse_syslog
+
+def _iso_decoder(start_year):
+    return parse_iso_fixed # '2025-10-14 12:57:30,096' (Millisekunden bleiben erhalten)
+
+def _compact_decoder(start_year):
+    def decode(raw):
+        # '20251014125730' (wie strptime "%Y%m%d%H%M%S")
+        try:
+            return datetime(int(raw[0:4]), int(raw[4:6]), int(raw[6:8]),
+                            int(raw[8:10]), int(raw[10:12]), int(raw[12:14]))
+        except ValueError:
+            return None
+    return decode
+
+TIMESTAMP_FORMATS = {
+    "syslog": _syslog_decoder,   # 'Sat Nov 01 06:01:27.123' (ohne Jahr)
+    "iso": _iso_decoder,         # 'YYYY-MM-DD HH:MM:SS,fff'
+    "compact": _compact_decoder, # 'YYYYMMDDHHMMSS'
+}
+
+
+class LogFormat:
+    """
+    Beschreibung eines Log-Formats für den gemeinsamen Treiber:
+
+    - file_patterns: Regex für Dateinamen (ohne Verzeichnis), über die find_format() das Format erkennt
+    - prefilter: feste Textstücke, von denen mindestens eines in einer Ereignis-Zeile stehen MUSS.
+      Alle anderen Zeilen werden als Bytes verworfen, ohne Dekodierung und ohne Regex der Regeln.
+    - ts_pattern / ts_format: Zeitstempel am Zeilenanfang (Gruppe 1) und dessen Format (TIMESTAMP_FORMATS)
+    - parse_line: Ereignis-Regeln, Zeile -> Klartext oder None
+    """
+
+    def __init__(self, name, source, file_patterns, prefilter, ts_pattern, ts_format, parse_line,
+                 start_year=2025):
+        if ts_format not in TIMESTAMP_FORMATS:
+            raise ValueError(f"Unbekanntes Zeitstempel-Format '{ts_format}' für '{name}'")
+        self.name = name
+        self.source = source
+        self.file_patterns = [re.compile(pattern) for pattern in file_patterns]
+        self.prefilter = prefilter
+        self.ts_pattern = ts_pattern
+        self.ts_format = ts_format
+        self.parse_line = parse_line
+        self.start_year = start_year # Festes Startjahr wie bisher (Syslog ohne Jahresangabe)
+        # Ein Bytes-Regex für alle Textstücke: ein C-Aufruf pro Zeile
+        self._prefilter_re = re.compile(b'|'.join(re.escape(text.encode('utf-8')) for text in prefilter)) if prefilter else None
+
+    def matches_file(self, file_path):
+        file_name = os.path.basename(file_path)
+        return any(pattern.match(file_name) for pattern in self.file_patterns)
+
+    def new_timestamp_decoder(self):
+        return TIMESTAMP_FORMATS[self.ts_format](self.start_year)
+
+
+class ParserMetrics:
+    """Zähler pro Parser (über alle Dateien): Durchsatz und Trefferquoten."""
+
+    def __init__(self, name):
+        self.name = name
+        self.files = 0
+        self.bytes = 0
+        self.lines = 0
+        self.candidates = 0 # Zeilen, die den Vorfilter passiert haben
+        self.events = 0
+        self.seconds = 0.0
+
+    def add(self, other):
+        self.files += other.files
+        self.bytes += other.bytes
+        self.lines += other.lines
+        self.candidates += other.candidates
+        self.events += other.events
+        self.seconds += other.seconds
+        return self
+
+    @property
+    def lines_per_s(self):
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    @property
+    def match_rate(self):
+        """Anteil der Zeilen, die ein Ereignis ergeben."""
+        return self.events / self.lines if self.lines else 0.0
+
+    @property
+    def prefilter_rate(self):
+        """Anteil der Zeilen, die der Vorfilter an die Regeln weitergibt."""
+        return self.candidates / self.lines if self.lines else 0.0
+
+    def as_dict(self):
+        return {"Parser": self.name, "Dateien": self.files, "MB": self.bytes / 1e6, "Zeilen": self.lines,
+                "Kandidaten": self.candidates, "Ereignisse": self.events, "Sekunden": self.seconds,
+                "Zeilen/s": self.lines_per_s, "Vorfilter": self.prefilter_rate, "Trefferquote": self.match_rate}
+
+    def summary(self):
+        return (f"{self.name}: {self.lines} Zeilen in {self.seconds:.2f} s ({self.lines_per_s:,.0f} Zeilen/s), "
+                f"Vorfilter {self.prefilter_rate:.1%}, Treffer {self.events} ({self.match_rate:.2%})")
+
+
+# --- Registry ---
+
+PARSER_REGISTRY = {}
+_builtins_loaded = False
+
+def register_format(log_format):
+    """Nimmt ein Format in die Registry auf (ein späteres mit demselben Namen ersetzt das frühere)."""
+    PARSER_REGISTRY[log_format.name] = log_format
+    return log_format
+
+def load_builtin_formats():
+    """Importiert die mitgelieferten Parser-Module einmal (sie registrieren sich selbst)."""
+    global _builtins_loaded
+    if not _builtins_loaded:
+        _builtins_loaded = True
+        for module_name in BUILTIN_FORMAT_MODULES:
+            try:
+                importlib.import_module(module_name)
+            except ImportError as e:
+                print(f"--- parser_registry: WARNUNG: {module_name} nicht geladen: {e} ---")
+    return PARSER_REGISTRY
+
+def get_format(name):
+    if name not in PARSER_REGISTRY:
+        load_builtin_formats()
+    return PARSER_REGISTRY[name]
+
+def find_format(file_path):
+    """Format anhand des Dateinamens (oder None)."""
+    for log_format in load_builtin_formats().values():
+        if log_format.matches_file(file_path):
+            return log_format
+    return None
+
+
+# --- Treiber ---
+
+def parse_file(file_path, log_format, progress_callback=None, lazy_log=False, metrics=None,
+               block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Parst eine Datei mit 'log_format' (LogFormat oder Name): blockweise (binär), Vorfilter auf den
+    Bytes, Ergebnis spaltenweise gesammelt. 'metrics' (ParserMetrics) wird fortgeschrieben.
+    'lazy_log' speichert statt OriginalLog nur LogFile/LogOffset/LogLength/LogCRC (raw_schema.py).
+    GIBT ZURÜCK: DataFrame (Timestamp, Quelle, Ereignis, OriginalLog) - leer, wenn nichts gefunden.
+    """
+    if isinstance(log_format, str):
+        log_format = get_format(log_format)
+    filename = os.path.basename(file_path)
+    total_size = file_size(file_path) or 1
+    prefilter = log_format._prefilter_re.search if log_format._prefilter_re else None
+    ts_match = log_format.ts_pattern.match
+    decode_ts = log_format.new_timestamp_decoder()
+    parse_line = log_format.parse_line
+    source = log_format.source
+
+    columns = {col: [] for col in (REGISTRY_LAZY_COLUMNS if lazy_log else REGISTRY_COLUMNS)}
+    file_metrics = ParserMetrics(log_format.name)
+    file_metrics.files = 1
+    start = time.perf_counter()
+
+    for block_offset, raw_lines, bytes_consumed in iter_line_blocks(file_path, block_size):
+        file_metrics.lines += len(raw_lines)
+        offsets = line_offsets(block_offset, raw_lines) if lazy_log else repeat(None)
+
+        for line_start, raw_line in zip(offsets, raw_lines):
+            if prefilter and not prefilter(raw_line):
+                continue
+            file_metrics.candidates += 1
+            line = raw_line.decode('utf-8', errors='ignore')
+            if not (m := ts_match(line)):
+                continue
+            dt_object = decode_ts(m.group(1))
+            if dt_object is None:
+                continue
+            if not (klartext := parse_line(line)):
+                continue
+
+            columns["Timestamp"].append(dt_object)
+            columns["Quelle"].append(source)
+            columns["Ereignis"].append(klartext)
+            if lazy_log:
+                columns["LogFile"].append(file_path)
+                columns["LogOffset"].append(line_start)
+                columns["LogLength"].append(len(raw_line))
+                columns["LogCRC"].append(line_crc(line.strip()))
+            else:
+                columns["OriginalLog"].append(line.strip())
+
+        if progress_callback:
+            progress_callback(min(100, int(bytes_consumed / total_size * 100)), f"Analysiere {filename}...")
+
+    file_metrics.bytes = total_size
+    file_metrics.events = len(columns["Timestamp"])
+    file_metrics.seconds = time.perf_counter() - start
+    if metrics is not None:
+        metrics.add(file_metrics)
+    return pd.DataFrame(columns) if columns["Timestamp"] else pd.DataFrame()
+
+
+def _parse_task(file_path, format_name, report, lazy_log=False):
+    """Aufgabe für parallel_loader.run_parallel: gibt (df, ParserMetrics) zurück."""
+    metrics = ParserMetrics(format_name)
+    df = parse_file(file_path, format_name, report, lazy_log, metrics)
+    return df, metrics
+
+
+def parse_files(file_paths, progress_callback=None, workers=1, lazy_log=False):
+    """
+    Parst mehrere Dateien; das Format wird pro Datei am Dateinamen erkannt (Dateien ohne
+    passendes Format werden übersprungen). 'workers' > 1: eine Datei pro Aufgabe im Prozess-Pool.
+    GIBT ZURÜCK: (df, {Parser-Name: ParserMetrics}) - df nach Timestamp sortiert.
+    """
+    tasks = []
+    for file_path in file_paths:
+        log_format = find_format(file_path)
+        if log_format is None:
+            print(f"--- parser_registry: Kein Format für {os.path.basename(file_path)}, übersprungen ---")
+            continue
+        tasks.append((file_path, log_format.name))
+
+    workers = min(len(tasks), workers or 1)
+    if workers > 1:
+        from parallel_loader import run_parallel # Nur bei Bedarf (startet einen Prozess-Pool)
+        on_progress = (lambda index, progress, text: progress_callback(progress, text)) if progress_callback else None
+        results = run_parallel(_parse_task, tasks, on_progress, workers, lazy_log=lazy_log)
+    else:
+        results = [_parse_task(file_path, format_name, progress_callback, lazy_log) for file_path, format_name in tasks]
+
+    metrics = {}
+    for _, file_metrics in results:
+        metrics.setdefault(file_metrics.name, ParserMetrics(file_metrics.name)).add(file_metrics)
+    for parser_metrics in metrics.values():
+        print(f"--- parser_registry: {parser_metrics.summary()} ---")
+
+    frames = [df for df, _ in results if not df.empty]
+    if not frames:
+        return pd.DataFrame(), metrics
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values("Timestamp", kind='stable').reset_index(drop=True), metrics
@@ -1,18 +1,29 @@
 # plclog_csv_parser.py
-print("--- [V23-FIX] plclog_csv_parser.py wird geladen (NUR Fehler, Kein-UTC) ... ---")
+print("--- [V25-CSV] plclog_csv_parser.py wird geladen (NUR Fehler, Kein-UTC, Blockweiser CSV-Leser) ... ---")
 
 import pandas as pd
 import re
 import pytz
 import os
 import traceback
-from datetime import datetime
+
+from log_timestamps import iso_series_to_datetime
 
 # Spaltennamen, wie sie in PlcLog_0.csv (File 2) gefunden wurden
 ERROR_COL_TIMESTAMP = "Timestamp"
 ERROR_COL_CLASSID = "ClassId"
 ERROR_COL_INFOTEXT = "InfoText"
 
+# ClassId -> (Severity, Klartext-Präfix); andere ClassIds sind keine Fehler
+ERROR_CLASSES = {
+    2: ("Warning", "[PLC] Warnung: "),    # LOG_WARNING
+    4: ("Error", "[PLC] Fehler: "),       # LOG_ERROR
+    8: ("Exception", "[PLC] Ausnahme: "), # LOG_EXCEPTION
+}
+
+# NEU (V25): Blockgröße für den spaltenweisen Leser (begrenzt den Speicher bei Millionen Zeilen)
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
 def find_header_row_error_log(file_path):
     """
     Findet die Header-Zeile, die ';Timestamp, CmpId, ClassId,' enthält.
@@ -31,8 +42,140 @@ def find_header_row_error_log(file_path):
     print(f"--- plclog_csv_parser: WARNUNG: Konnte Error-Header nicht finden.")
     return None
 
+def _header_indices(header_line, filename):
+    """Spalten-Indizes (Timestamp, ClassId, InfoText) aus der Header-Zeile, oder None."""
+    # Entferne ';' und Leerzeichen aus Headern
+    header_map = {col.strip().strip(';'): i for i, col in enumerate(header_line.strip().split(','))}
+    indices = [header_map.get(col) for col in (ERROR_COL_TIMESTAMP, ERROR_COL_CLASSID, ERROR_COL_INFOTEXT)]
+    if any(idx is None for idx in indices):
+        print(f"--- plclog_csv_parser: FEHLER: Erwartete Error-Spalten (Timestamp, ClassId, InfoText) nicht in {filename} gefunden.")
+        print(f"--- Gefundene Header: {header_map.keys()}")
+        return None
+    return indices
+
+def _error_class(raw_class_id):
+    """Roh-Wert der ClassId-Spalte -> (Severity, Klartext-Präfix) oder None (int() wie im Zeilen-Parser)."""
+    try:
+        return ERROR_CLASSES.get(int(raw_class_id.strip(';')))
+    except ValueError:
+        return None
+
+def _errors_from_block(text, idx_ts, idx_class, idx_info):
+    """
+    Wertet einen Block vollständiger CSV-Zeilen aus (gleiche Regeln wie _parse_error_lines).
+    Pro Zeile ein split(',', last_idx): der letzte Teil behält die Kommas des InfoTextes.
+    Die ClassId wird pro unterschiedlichem Roh-Wert einmal umgewandelt (wenige Werte, Millionen Zeilen).
+    """
+    last_idx = max(idx_ts, idx_class, idx_info)
+    field = lambda parts, idx: parts[idx] if idx < last_idx else parts[idx].split(',', 1)[0]
+    error_classes = {}
+    timestamps, klartexte, original_logs, severities = [], [], [], []
+
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+        if '\r' in line:
+            raise pd.errors.ParserError("'\\r' innerhalb einer Zeile") # Zeilen-Parser trennt dort
+        if line[0] == ';': # Kommentar
+            continue
+
+        parts = line.split(',', last_idx)
+        if len(parts) <= last_idx:
+            continue # zu wenige Spalten
+        raw_class = field(parts, idx_class)
+        if raw_class not in error_classes:
+            error_classes[raw_class] = _error_class(raw_class)
+        error_class = error_classes[raw_class]
+        if error_class is None:
+            continue
+
+        severity, prefix = error_class
+        timestamps.append(field(parts, idx_ts).strip(';')) # wird in _finish_errors_df umgewandelt
+        # InfoText kann Kommas enthalten, nimm den Rest
+        klartexte.append(prefix + ",".join(parts[idx_info:]).strip('"'))
+        original_logs.append(line)
+        severities.append(severity)
+
+    if not timestamps:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        'Timestamp': timestamps,
+        'Source': "PLC-Error",
+        'Klartext': klartexte,
+        'OriginalLog': original_logs,
+        'IATA': "N/A", # Fehler-Logs haben keine IATA-Spalte
+        'BagID': "N/A",
+        'Device': "N/A",
+        'Severity': severities
+    })
+
+def _iter_text_blocks(f, block_size=CSV_BLOCK_SIZE):
+    """Liest ab der aktuellen Position Textblöcke, die an einem Zeilenende aufhören."""
+    carry = b''
+    while block := f.read(block_size):
+        block = carry + block
+        last_newline = block.rfind(b'\n')
+        if last_newline == -1:
+            carry = block
+            continue
+        carry = block[last_newline + 1:]
+        yield block[:last_newline].decode('utf-8', errors='ignore')
+    if carry:
+        yield carry.decode('utf-8', errors='ignore')
+
 def parse_error_log(file_path, header_row_index, progress_callback):
-    """Parst den 'Error'-Teil (File 2 Format) einer CSV."""
+    """
+    Parst den 'Error'-Teil (File 2 Format) einer CSV.
+    NEU (V25): Alles nach der Header-Zeile wird blockweise gelesen (Bytes, ohne readlines),
+    Severity/Klartext kommen aus einer Nachschlagetabelle pro ClassId-Wert. Enthält ein Block ein
+    einzelnes '\r', wird Zeile für Zeile geparst (_parse_error_lines, identisches Ergebnis).
+    """
+    filename = os.path.basename(file_path)
+    total_size = os.path.getsize(file_path) or 1
+    frames = []
+    
+    try:
+        with open(file_path, 'rb') as f:
+            header_line = None
+            for _ in range(header_row_index + 1 if header_row_index is not None else 0):
+                header_line = f.readline()
+            if not header_line:
+                print(f"--- plclog_csv_parser: Konnte Error-Header in {filename} nicht finden.")
+                return pd.DataFrame()
+
+            indices = _header_indices(header_line.decode('utf-8-sig', errors='ignore'), filename)
+            if indices is None:
+                return pd.DataFrame()
+
+            for text in _iter_text_blocks(f):
+                frames.append(_errors_from_block(text, *indices))
+                if progress_callback:
+                    progress_callback(min(100, int(f.tell() / total_size * 100)), f"Analysiere Fehler in {filename}...")
+
+    except pd.errors.ParserError as e:
+        print(f"--- plclog_csv_parser: CSV-Leser fehlgeschlagen ({e}), lese Zeile für Zeile. ---")
+        return _parse_error_lines(file_path, header_row_index, progress_callback)
+    except Exception as e:
+        print(f"--- plclog_csv_parser: Kritischer Fehler beim Lesen der CSV: {e} ---")
+        traceback.print_exc()
+        return pd.DataFrame()
+
+    frames = [frame for frame in frames if not frame.empty]
+    errors_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return _finish_errors_df(errors_df)
+
+def _finish_errors_df(errors_df):
+    if not errors_df.empty:
+        # --- KORREKTUR (Kein UTC) --- V24: EIN Aufruf statt strptime pro Zeile; ungültige Zeitstempel entfallen
+        errors_df['Timestamp'] = iso_series_to_datetime(errors_df['Timestamp'])
+        errors_df = errors_df.dropna(subset=['Timestamp']).reset_index(drop=True)
+
+    print(f"--- plclog_csv_parser (Error-Modus): {len(errors_df)} Fehler-Einträge gefunden.")
+    return errors_df
+
+def _parse_error_lines(file_path, header_row_index, progress_callback):
+    """Parst den 'Error'-Teil (File 2 Format) einer CSV Zeile für Zeile (Fallback für parse_error_log)."""
     filename = os.path.basename(file_path)
     errors_data = []
     
@@ -77,9 +220,6 @@ def parse_error_log(file_path, header_row_index, progress_callback):
                 # InfoText kann Kommas enthalten, nimm den Rest
                 info_text_str = ",".join(parts[idx_info:]).strip('"')
                 
-                # --- KORREKTUR (Kein UTC) ---
-                ts_naive = datetime.strptime(ts_str.split('Z')[0], '%Y-%m-%dT%H:%M:%S')
-                
                 class_id = int(class_id_str)
                 source = "PLC-Error"
                 klartext = None
@@ -97,7 +237,7 @@ def parse_error_log(file_path, header_row_index, progress_callback):
                 
                 if klartext:
                     errors_data.append({
-                        'Timestamp': ts_naive, # KORRIGIERT: ts_naive
+                        'Timestamp': ts_str, # V24: wird unten spaltenweise umgewandelt (Kein UTC)
                         'Source': source,
                         'Klartext': klartext,
                         'OriginalLog': line.strip(),
@@ -115,8 +255,7 @@ def parse_error_log(file_path, header_row_index, progress_callback):
         traceback.print_exc()
         return pd.DataFrame()
 
-    print(f"--- plclog_csv_parser (Error-Modus): {len(errors_data)} Fehler-Einträge gefunden.")
-    return pd.DataFrame(errors_data)
+    return _finish_errors_df(pd.DataFrame(errors_data))
 
 
 def parse_log(file_path, load_mode, progress_callback=None):
@@ -1,13 +1,21 @@
 # plclog_journey_parser.py
-print("--- [NEUSTART] plclog_journey_parser.py wird geladen (Neue 2-Phasen-Logik) ... ---")
+print("--- [V4-ENGINE] plclog_journey_parser.py wird geladen (SPS-Journey-Engine mit Regel-Profilen, Parse-Cache) ... ---")
 
 import re
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import traceback # Importiert
 from collections import defaultdict
 
+from log_stream import iter_line_blocks, line_offsets, file_size
+from log_timestamps import parse_iso_fixed
+from raw_schema import line_crc
+from parse_cache import get_default_cache
+
+# NEU (V3): Eine Engine für beide SPS-Parser. Die frühere 2plclog_journey_parser.py (V23, Start/End-Logik)
+# ist jetzt das Regel-Profil "start_end"; Lesen, Normalisieren, Zeitstempel und IATA-Suche sind gemeinsam.
+
 # --- REGEX-MUSTER (Passend zu den Log-Daten, mit Leerzeichen) ---
 
 # 1. Zeitstempel (Muss am Zeilenanfang stehen)
@@ -15,24 +23,76 @@ TIMESTAMP_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{3})?
 
 # 2. IATA-Muster (Priorisiert)
 RE_IATA_QUEUE = re.compile(r'Tray\s+with\s+RFID:\s*([\wL]+)\s+added') # Wichtigstes Muster
-RE_IATA_RESULT = re.compile(r'tray\s*:\s*([\wL]+)') 
-RE_RFID_READ = re.compile(r'ID\s+([\wL]+)') 
+RE_IATA_RESULT = re.compile(r'tray\s*:\s*([\wL]+)')
+RE_RFID_READ = re.compile(r'\bID\s+([\wL]+)') # KORREKTUR (V3): \b, sonst liefert 'RFID READER' die IATA 'READER'
 RE_IATA_INFEED = re.compile(r'New\s+tray\s+INFEED\s+-0\s+ID:\s*([\wL]+)')
-RE_IATA_EXAMINED = re.compile(r'EXAMINED:\s*(\w+)') 
-RE_IATA_SIMPLE = re.compile(r'ID:\s*(\w+)') 
+RE_IATA_EXAMINED = re.compile(r'EXAMINED:\s*(\w+)')
+RE_IATA_SIMPLE = re.compile(r'ID:\s*(\w+)')
+RE_RFID_DIGITS = re.compile(r'0*L?0*(\d+)$')
 
 # 3. Key-Muster
-RE_KEY_ADDED = re.compile(r'key:\s*(\d+)') 
+RE_KEY_ADDED = re.compile(r'key:\s*(\d+)')
 RE_KEY_DELETED = re.compile(r'key(\d+)') # Für 'key17265'
 
+# 4. NEU (V2): Schnelle Vorprüfung: ohne eines dieser Wörter liefert _get_klartext_for_event nie Klartext
+KLARTEXT_HINT_PATTERN = re.compile(
+    r'added|READER|INFEED|NEW_TRAY_DIVERTER|Result|NEW_INFO_RFID|Diverter|Deleting|CLEARSCAN_BELT_STOP'
+)
+RE_ADDED_TO_QUEUE = re.compile(r'added\s+to\s+queue')
+
+# 5. NEU (V3): Muster des Profils "start_end" (ausführlicher Klartext, auf der normalisierten Zeile)
+DETAILED_HINT_PATTERN = re.compile(
+    r'NEW_INFO_RFID|Diverter|DIVERTER|DVERTER|FT Module|READER|added|INFEED|Result|NO READ|removed'
+    r'|Deleting|Reallocating|CLEARSCAN_BELT'
+)
+RE_DETAILED_DECISION = re.compile(r'NEW_INFO_RFID.*EXAMINED: (\w+) .*decision: (\d)')
+RE_DETAILED_STEP = re.compile(r'Diverter (clear|reject) -0 Step (\w+) ?(.*)')
+RE_READER_INFEED = re.compile(r'RFID READER ([1-2]) data ready')
+RE_READER_DIVERTER = re.compile(r'RFID READER ([3-4]) data ready')
+JOURNEY_START_MARKER = 'RFID READER 1 data ready'
+JOURNEY_END_MARKER = 'CLEARSCAN_BELT_STOP'
+DETAILED_STEP_TEXTS = {
+    '250': "Wanne ist in Position (Step 250)",
+    '300': "Weiche 'reject': Aktion REJECT (Step 300)",
+    '450': "Weiche 'reject': Aktion RightFWD (Step 450)",
+    '550': "Weiche 'reject': Aktion Links (Step 550)",
+    '1000': "FEHLER: System im ERROR STOP (Step 1000)",
+}
+# Reihenfolge wie in V23: der erste Treffer gewinnt
+DETAILED_MARKER_TEXTS = [
+    ('NEW_TRAY_DIVERTER', "[PLC] Wanne an Weiche registriert"),
+    ('INFO_RECEIVED_DVERTER', "[PLC] Info von Weiche empfangen"),
+]
+DETAILED_LATE_MARKER_TEXTS = [
+    ('added to queue', "Wanne zur System-Warteschlange hinzugefügt"),
+    ('New tray INFEED', "[PLC] Wanne am Zulauf (Infeed) registriert"),
+    ('INFO_RECEIVED_INFEED', "[PLC] Info von Zulauf (Infeed) empfangen"),
+    ('Result CLEAR for tray', "System-Ergebnis verbucht: CLEAR"),
+    ('Result REJECT for tray', "System-Ergebnis verbucht: REJECT"),
+    ('NO READ BEFORE DIVERTER', "FEHLER: 'NO READ' an der Weiche"),
+    ('Object/tray removed from diverter', "FEHLER: Objekt/Wanne manuell entfernt"),
+    ('Tray ID: NO READ', "FEHLER: 'NO READ' Wanne nicht in Warteschlange"),
+    ('Deleting tray with key', "[PLC] Wanne wird aus Warteschlange gelöscht"),
+    ('Reallocating tray', "[PLC] Wanne wird in Warteschlange neu zugewiesen"),
+    ('CLEARSCAN_BELT_FORWARD', "[PLC] Gurt fährt vorwärts"),
+    ('CLEARSCAN_BELT_STOP', "[PLC] Gurt gestoppt"),
+]
+
+# Trennzeichen, die beim Normalisieren zu Leerzeichen werden
+NORMALIZE_TABLE = str.maketrans(',;\t', '   ')
+
+# NEU (V2): Zeilen mit Key, aber (noch) ohne IATA, werden höchstens so lange gepuffert
+# (entspricht data_processor.JOURNEY_GAP: danach gehört die Zeile ohnehin zu keiner laufenden Journey)
+UNRESOLVED_MAX_AGE = timedelta(minutes=5)
+
 def normalize_rfid(rfid_str):
-    """ Normalisiert '000L0131' zu '131' """
-    if not rfid_str or rfid_str == "0": 
+    """ Normalisiert '000L0131' zu '131' (und '0' zu 'N/A') """
+    if not rfid_str or rfid_str == "0":
         return "N/A"
-    match = re.search(r'0*L?0*(\d+)$', rfid_str) 
+    match = RE_RFID_DIGITS.search(rfid_str)
     if match:
         return match.group(1)
-    return rfid_str.strip()
+    return rfid_str.strip().replace(';', '')
 
 def _find_iata_in_line(infotext):
     """ Findet die IATA in einer normalisierten Zeile """
@@ -59,135 +119,346 @@ def _find_key_in_line(infotext):
     return None
 
 def _get_klartext_for_event(infotext):
-    """ Erstellt Klartext NUR für relevante Zeilen """
-    
+    """ Profil "key_queue": Erstellt Klartext NUR für relevante Zeilen """
+    if not KLARTEXT_HINT_PATTERN.search(infotext):
+        return None # V2: Die meisten Zeilen (Steps 0, 50, Status...) scheitern schon hier
+
     if re.search(r'added\s+to\s+queue', infotext): return "Wanne zur System-Warteschlange hinzugefügt"
     if re.search(r'RFID\s+READER\s+([1-2])\s+data\s+ready', infotext): return "[PLC] Wanne am Zulauf erkannt (Reader 1/2)"
     if re.search(r'New\s+tray\s+INFEED', infotext): return "[PLC] Wanne am Zulauf (Infeed) registriert"
-    
+
     if re.search(r'RFID\s+READER\s+([3-4])\s+data\s+ready', infotext): return "[PLC] Wanne an der Weiche erkannt (Reader 3/4)"
     if 'NEW_TRAY_DIVERTER' in infotext: return "[PLC] Wanne an Weiche registriert"
-    
+
     if re.search(r'Result\s+CLEAR\s+for\s+tray', infotext): return "System-Ergebnis verbucht: CLEAR"
     if re.search(r'Result\s+REJECT\s+for\s+tray', infotext): return "System-Ergebnis verbucht: REJECT"
-    
+
     match_decision = re.search(r'NEW_INFO_RFID.*decision:\s*(\d)', infotext)
     if match_decision:
         decision_text = "CLEAR" if match_decision.group(1) == '1' else "REJECT"
         return f"Entscheidung vom Scanner empfangen: {decision_text}"
-        
+
     step_match = re.search(r'Diverter\s+(clear|reject)\s+-0\s+Step\s+(250|700|2000)', infotext)
     if step_match:
         dtype, step = step_match.groups()
         if step == '250': return f"Wanne ist in Position (Step 250)"
         if step == '700': return f"Weiche '{dtype}': Fährt vorwärts (Step 700)"
         if step == '2000': return f"Weiche '{dtype}': Zyklus beendet (Step 2000)"
-        
+
     if re.search(r'Deleting\s+tray\s+with\s+key\d+', infotext): return "[PLC] Wanne wird aus Warteschlange gelöscht"
-    
+
     if 'CLEARSCAN_BELT_STOP' in infotext: return "[PLC] Gurt gestoppt"
 
     return None # Alle anderen Zeilen (Steps 0, 50, etc.) ignorieren
 
-def parse_log(file_path, progress_callback=None):
+def _get_klartext_detailed(infotext):
     """
-    Parst eine PlcLog.csv-Datei mit 2-Phasen-Logik
-    (1. Normalisieren, 2. Zuordnen)
+    Profil "start_end" (Regeln aus V23): ausführlicher Klartext inkl. FEHLER-Zeilen,
+    Sensoren und Gurt-Befehlen. Arbeitet wie alle Profile auf der normalisierten Zeile.
     """
-    
-    preliminary_events = []
-    key_to_iata_map = {}
-    
-    try:
-        total_size = os.path.getsize(file_path)
-        processed_size = 0
-        
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                processed_size += len(line.encode('utf-8'))
-                if progress_callback and processed_size % 100000 == 0:
-                    progress = int((processed_size / total_size) * 100)
-                    progress_callback(progress, f"Lese {os.path.basename(file_path)}...")
-
-                original_log = line.strip()
-                if not original_log: continue
-
-                # --- Phase 1: Normalisieren (Umwandeln) ---
-                # Ersetze alle Kommas und Semikolons durch Leerzeichen
-                normalized_line = original_log.replace(',', ' ').replace(';', ' ').replace('\t', ' ')
-                # Entferne mehrfache Leerzeichen
-                infotext = re.sub(r'\s+', ' ', normalized_line).strip()
-
-                timestamp_match = TIMESTAMP_PATTERN.search(infotext)
-                if not timestamp_match:
-                    continue 
-
-                timestamp = pd.to_datetime(timestamp_match.group(1)).tz_localize(None)
-
-                # --- Phase 2: Verknüpfen (Landkarte bauen) ---
-                iata = _find_iata_in_line(infotext)
-                key = _find_key_in_line(infotext)
-                
-                # Speichere die Rohdaten für Phase 3
-                preliminary_events.append({
-                    "Timestamp": timestamp,
-                    "IATA_found": iata, # IATA, die wir in dieser Zeile gefunden haben
-                    "Key_found": key,   # Key, den wir in dieser Zeile gefunden haben
-                    "Info": infotext,   # Normalisierter Text
-                    "OriginalLog": original_log 
-                })
-                
-                # Wenn die Zeile "added to queue" ist, ist die Verknüpfung sicher
-                if key and iata and iata != "N/A" and re.search(r'added\s+to\s+queue', infotext):
-                    key_to_iata_map[key] = iata
+    if not DETAILED_HINT_PATTERN.search(infotext):
+        return None
+
+    # 1. Scanner-Entscheidung
+    if match_decision := RE_DETAILED_DECISION.search(infotext):
+        decision = match_decision.group(2)
+        decision_text = "CLEAR" if decision == '1' else "REJECT"
+        return f"Entscheidung vom Scanner empfangen: Decision {decision} ({decision_text})"
+
+    # 2. Weichen-Schritte (technische Steps 0, 50, 100, 551, 600 und unbekannte werden ignoriert)
+    if step_match := RE_DETAILED_STEP.search(infotext):
+        dtype, step, info = step_match.groups()
+        if step == '700':
+            info_clean = info.split(' ')[0]
+            return f"Weiche '{dtype}': Fährt vorwärts (Step 700 {info_clean})"
+        if step == '2000':
+            return f"Weiche '{dtype}': Zyklus beendet (Step 2000)"
+        return DETAILED_STEP_TEXTS.get(step)
+
+    # 3. Ankunft / Registrierung
+    for marker, text in DETAILED_MARKER_TEXTS:
+        if marker in infotext:
+            return text
+    for sensor in ('FT Module before diverter', 'FT Module before scanner'):
+        if sensor in infotext:
+            return f"[PLC] Sensor '{sensor}' Status: {infotext.split('=')[-1].strip()}"
+
+    # 4./5. Zulauf (Reader 1 & 2), Ankunft Weiche (Reader 3 & 4)
+    if rfid_match := RE_READER_INFEED.search(infotext):
+        return f"[PLC] Wanne am Zulauf erkannt (Reader {rfid_match.group(1)})"
+    if rfid_match := RE_READER_DIVERTER.search(infotext):
+        return f"[PLC] Wanne an der Weiche erkannt (Reader {rfid_match.group(1)})"
+
+    # 6.-10. Queue, Ergebnisse, Fehler, Queue-Management, Gurt
+    for marker, text in DETAILED_LATE_MARKER_TEXTS:
+        if marker in infotext:
+            return text
+    return None
+
+def _normalize_line(original_log):
+    """Kommas, Semikolons und Tabs -> Leerzeichen, mehrfache Leerzeichen zusammenfassen."""
+    return ' '.join(original_log.translate(NORMALIZE_TABLE).split())
+
+class KeyIataResolver:
+    """
+    Profil "key_queue": Streaming-Zuordnung Key -> IATA (ersetzt die 2-Phasen-Logik).
+
+    'added to queue'-Zeilen verknüpfen Key und IATA. Eine Zeile, die nur einen Key trägt, wird
+    sofort aufgelöst, wenn der Key bekannt ist. Sonst wird sie gepuffert, bis die Verknüpfung
+    kommt, oder verworfen, sobald sie älter als 'max_age' ist.
+    """
+
+    def __init__(self, max_age=UNRESOLVED_MAX_AGE):
+        self.max_age = max_age
+        self.key_to_iata = {}
+        self.pending = defaultdict(list) # key -> [(timestamp, event), ...]
+        self.evicted = 0
+
+    def link(self, key, iata):
+        """Verknüpft Key und IATA. GIBT ZURÜCK: die dafür gepufferten Events."""
+        self.key_to_iata[key] = iata
+        return [event for _, event in self.pending.pop(key, ())]
+
+    def lookup(self, key):
+        return self.key_to_iata.get(key)
+
+    def defer(self, key, timestamp, event):
+        self.pending[key].append((timestamp, event))
+
+    def evict(self, now):
+        """Verwirft gepufferte Events, die älter als 'max_age' (relativ zu 'now') sind."""
+        cutoff = now - self.max_age
+        for key in [key for key, events in self.pending.items() if events[0][0] < cutoff]:
+            kept = [(ts, event) for ts, event in self.pending[key] if ts >= cutoff]
+            self.evicted += len(self.pending[key]) - len(kept)
+            if kept:
+                self.pending[key] = kept
+            else:
+                del self.pending[key]
+
+    @property
+    def unresolved(self):
+        return sum(len(events) for events in self.pending.values())
+
+    # --- Schnittstelle für iter_journey_events (NEU V3) ---
+
+    def observe(self, infotext):
+        """Zeilen ohne Klartext sind für die Key-Zuordnung bedeutungslos."""
+
+    def feed(self, event, infotext):
+        """Ordnet ein Event zu. GIBT ZURÜCK: die jetzt zugeordneten Events (auch gepufferte)."""
+        _, record = event
+        iata = _find_iata_in_line(infotext)
+        key = _find_key_in_line(infotext)
+        record["IATA"] = iata
+
+        if iata and iata != "N/A":
+            # Wenn die Zeile "added to queue" ist, ist die Verknüpfung sicher
+            resolved = []
+            if key and RE_ADDED_TO_QUEUE.search(infotext):
+                for deferred_no, deferred in self.link(key, iata):
+                    deferred["IATA"] = iata
+                    resolved.append((deferred_no, deferred))
+            resolved.append(event)
+            return resolved
+        if key:
+            # IATA fehlt, aber Key ist da -> Nachschlagen (oder puffern, bis die Verknüpfung kommt)
+            known_iata = self.lookup(key)
+            if known_iata:
+                record["IATA"] = known_iata
+                return [event]
+            self.defer(key, record["Timestamp"], event)
+        return [] # Ohne IATA und Key ist die Zeile nutzlos
 
+    def flush(self, now):
+        self.evict(now)
+
+    def finish(self):
+        """Am Dateiende bleiben nur nie verknüpfte Keys übrig (siehe 'discarded')."""
+
+    @property
+    def discarded(self):
+        return self.evicted + self.unresolved
+
+
+class StartEndTracker:
+    """
+    Profil "start_end" (Logik aus V23): Ein Vorgang beginnt bei 'RFID READER 1 data ready' und
+    endet bei 'CLEARSCAN_BELT_STOP'. Die IATA des Vorgangs stammt aus der ersten Zeile, die eine
+    trägt; enthält der Vorgang einen FEHLER, bekommen alle seine Events die IATA 'ERROR'.
+    Events werden pro Vorgang nach Klartext de-dupliziert und erst am Vorgangsende ausgegeben.
+    """
+
+    def __init__(self):
+        self.is_tracking = False
+        self.current_iata = "N/A"
+        self.current_events = []
+        self.seen_klartext = set()
+        self.discarded = 0 # Events eines beim Dateiende offenen Vorgangs
+        self.journeys = 0
+
+    def observe(self, infotext):
+        """Auch Zeilen ohne Klartext können die noch fehlende IATA liefern (z.B. nach NO READ)."""
+        if self.is_tracking and self.current_iata == "N/A":
+            self.current_iata = _find_iata_in_line(infotext) or "N/A"
+
+    def feed(self, event, infotext):
+        _, record = event
+        # 1. SUCHE NACH START (Reader 1)
+        if not self.is_tracking:
+            if JOURNEY_START_MARKER not in infotext:
+                return []
+            self.is_tracking = True
+            self.journeys += 1
+            self.current_events, self.seen_klartext = [], set()
+            self.current_iata = "N/A"
+
+        # 2. VERFOLGE VORGANG (Tracking)
+        self.observe(infotext)
+        klartext = record["Klartext"]
+        if klartext not in self.seen_klartext:
+            self.seen_klartext.add(klartext)
+            record["IATA"] = "ERROR" if "FEHLER:" in klartext else self.current_iata
+            self.current_events.append(event)
+
+        # 3. SUCHE NACH ENDE (Belt Stop)
+        if JOURNEY_END_MARKER not in infotext:
+            return []
+        self.is_tracking = False
+        final_iata = self.current_iata
+        if any("FEHLER:" in record["Klartext"] for _, record in self.current_events):
+            final_iata = "ERROR"
+        finished, self.current_events = self.current_events, []
+        for _, record in finished:
+            # Überschreibe IATA nur, wenn sie 'N/A' war oder ein Fehler auftrat
+            if record["IATA"] == "N/A" or final_iata == "ERROR":
+                record["IATA"] = final_iata
+        self.current_iata = "N/A"
+        return finished
+
+    def flush(self, now):
+        pass
+
+    def finish(self):
+        self.discarded += len(self.current_events)
+        self.current_events = []
+
+
+# --- NEU (V3): Regel-Profile ---
+# 'klartext': Zeile -> Klartext (oder None), 'tracker': ordnet die Events einer Journey/IATA zu,
+# 'dedup': Spalten für die abschließende De-Duplizierung.
+PLC_PROFILES = {
+    "key_queue": {
+        "version": "V2-STREAM",
+        "description": "Key/IATA-Zuordnung über 'added to queue' (Standard)",
+        "klartext": _get_klartext_for_event,
+        "tracker": KeyIataResolver,
+        "dedup": ["IATA", "Klartext"],
+    },
+    "start_end": {
+        "version": "V23-FIX",
+        "description": "Vorgang von Reader 1 bis Gurt-Stopp, ausführlicher Klartext",
+        "klartext": _get_klartext_detailed,
+        "tracker": StartEndTracker,
+        "dedup": ["Timestamp", "IATA", "Klartext"],
+    },
+}
+DEFAULT_PROFILE = "key_queue"
+
+# Geht zusammen mit der Profil-Version in den Cache-Schlüssel ein (parse_cache.py)
+ENGINE_VERSION = "V4"
+
+
+def iter_journey_events(file_path, progress_callback=None, lazy_log=False, tracker=None, profile=DEFAULT_PROFILE):
+    """
+    Liest eine PlcLog.csv in EINEM Durchlauf und gibt die zugeordneten Journey-Events aus.
+    GIBT ZURÜCK (Generator): (Zeilennummer, record). Gepufferte Events kommen erst bei ihrer
+    Auflösung, die Zeilennummer stellt die Datei-Reihenfolge wieder her.
+    'profile': Schlüssel in PLC_PROFILES; 'tracker': optional eine Instanz von dessen 'tracker'.
+    """
+    rules = PLC_PROFILES[profile]
+    get_klartext = rules["klartext"]
+    tracker = tracker if tracker is not None else rules["tracker"]()
+    filename = os.path.basename(file_path)
+    total_size = file_size(file_path) or 1
+    line_no = 0
+    last_timestamp = None
+
+    for block_offset, raw_lines, bytes_consumed in iter_line_blocks(file_path):
+        offsets = line_offsets(block_offset, raw_lines) if lazy_log else None
+        for i, raw_line in enumerate(raw_lines):
+            line_no += 1
+            original_log = raw_line.decode('utf-8', errors='ignore').strip()
+            if not original_log:
+                continue
+
+            infotext = _normalize_line(original_log)
+            timestamp_match = TIMESTAMP_PATTERN.match(infotext)
+            if not timestamp_match:
+                continue
+            # Nur Zeilen mit Klartext werden Events ('added to queue' gehört immer dazu)
+            klartext = get_klartext(infotext)
+            if not klartext:
+                tracker.observe(infotext)
+                continue
+
+            timestamp = parse_iso_fixed(timestamp_match.group(1))
+            last_timestamp = timestamp
+            record = {"Timestamp": timestamp, "Source": "PLC", "IATA": None, "Klartext": klartext}
+            if lazy_log:
+                record["LogFile"] = file_path
+                record["LogOffset"], record["LogLength"] = offsets[i], len(raw_line)
+                record["LogCRC"] = line_crc(original_log)
+            else:
+                record["OriginalLog"] = original_log
+            yield from tracker.feed((line_no, record), infotext)
+
+        if last_timestamp is not None:
+            tracker.flush(last_timestamp)
+        if progress_callback:
+            progress_callback(min(100, int(bytes_consumed / total_size * 100)), f"Lese {filename}...")
+
+    tracker.finish()
+
+
+def parse_log(file_path, progress_callback=None, lazy_log=False, profile=DEFAULT_PROFILE, use_cache=False):
+    """
+    Parst eine PlcLog.csv-Datei.
+    NEU: 'lazy_log' speichert statt OriginalLog nur LogFile/LogOffset/LogLength/LogCRC (siehe raw_schema.py).
+    NEU (V2): Ein Durchlauf (iter_journey_events) statt 2 Phasen: im Speicher bleiben nur relevante
+    Events und die Zeilen, deren Key noch keiner IATA zugeordnet ist (KeyIataResolver).
+    NEU (V3): 'profile' wählt das Regel-Profil (PLC_PROFILES). Die Ausgabe-Spalten sind für alle
+    Profile gleich, die JourneyID vergibt weiterhin data_processor.consolidate_plc_journeys.
+    NEU (V4): 'use_cache' liest das Ergebnis aus dem Parse-Cache (parse_cache.py), solange sich die
+    Datei nicht geändert hat.
+    """
+    rules = PLC_PROFILES[profile]
+    if use_cache:
+        version = f"{ENGINE_VERSION}/{profile}-{rules['version']}"
+        df = get_default_cache().cached(file_path, "plc_journey", version, {"lazy_log": lazy_log},
+                                        lambda: parse_log(file_path, progress_callback, lazy_log, profile))
+        if progress_callback:
+            progress_callback(100, f"Lese {os.path.basename(file_path)}...")
+        return df
+
+    tracker = rules["tracker"]()
+    try:
+        events = list(iter_journey_events(file_path, progress_callback, lazy_log, tracker, profile))
     except Exception as e:
-        print(f"Fehler bei Phase 1 (Sammeln) in {file_path}: {e}")
+        print(f"Fehler beim Lesen von {file_path}: {e}")
         traceback.print_exc()
-        return pd.DataFrame() 
-
-    if not preliminary_events:
-        # Dieser print-Befehl hilft beim Debuggen
-        print("DEBUG: Phase 1 (Sammeln) hat keine Events gefunden.")
-        return pd.DataFrame(columns=["Timestamp", "IATA", "Klartext", "OriginalLog", "JourneyID"])
-
-    # --- Phase 3 & 4: Zuordnen & Filtern ---
-    final_records = []
-    
-    for event in preliminary_events:
-        final_iata = event["IATA_found"]
-        key = event["Key_found"]
-        
-        # Wenn IATA fehlt, aber Key da ist -> Nachschlagen
-        if (final_iata is None or final_iata == "N/A") and key:
-            final_iata = key_to_iata_map.get(key, "N/A") 
-
-        # Wenn IATA (auch nach dem Nachschlagen) fehlt, ist die Zeile nutzlos
-        if final_iata is None or final_iata == "N/A":
-            continue
-            
-        # Erst JETZT den Klartext generieren
-        klartext = _get_klartext_for_event(event["Info"])
-        
-        # Nur relevante Zeilen behalten
-        if not klartext:
-            continue
-            
-        final_records.append({
-            "Timestamp": event["Timestamp"],
-            "Source": "PLC",
-            "IATA": final_iata, # Die final zugewiesene IATA
-            "Klartext": klartext,
-            "OriginalLog": event["OriginalLog"]
-        })
-
-    if not final_records:
-        print("DEBUG: Phase 2 (Zuordnen) hat keine Events zugeordnet.")
         return pd.DataFrame()
 
-    df = pd.DataFrame(final_records)
-    
+    if tracker.discarded:
+        print(f"DEBUG: {tracker.discarded} Events ohne IATA-Zuordnung verworfen (Profil '{profile}').")
+    if not events:
+        print("DEBUG: Keine Events zugeordnet.")
+        return pd.DataFrame()
+
+    events.sort(key=lambda event: event[0]) # Datei-Reihenfolge (für die De-Duplizierung)
+    df = pd.DataFrame([record for _, record in events])
+
     # De-Duplizierung (pro IATA)
-    df = df.drop_duplicates(subset=["IATA", "Klartext"])
-    
-    return df.sort_values(by="Timestamp").reset_index(drop=True)
\ No newline at end of file
+    df = df.drop_duplicates(subset=rules["dedup"])
+
+    return df.sort_values(by="Timestamp", kind="stable").reset_index(drop=True)
@@ -0,0 +1,270 @@
+# raw_schema.py
+print("--- [V3-SCHEMA] raw_schema.py wird geladen (Kompaktes Schema für Roh-DataFrames, OriginalLog bei Bedarf per Memory-Map, .gz mit Einstiegspunkten) ... ---")
+
+import os
+import mmap
+import zlib
+from contextlib import contextmanager
+from collections import defaultdict
+from functools import lru_cache
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Arrow-Strings nur, wenn pyarrow installiert ist (sonst bleiben es Python-Strings)
+try:
+    import pyarrow # noqa: F401
+    ARROW_STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    ARROW_STRING_DTYPE = None
+
+# Statt des OriginalLog-Textes: Verweis auf die Zeile in der Quelldatei
+LOG_REF_COLUMNS = ["LogFile", "LogOffset", "LogLength", "LogCRC"]
+
+# Spalten mit wenigen unterschiedlichen Werten (pro Zeile nur ein Code).
+# IATA: höchstens 10.000 vierstellige Nummern (+ 'N/A'/'NO_READ'), wiederholt sich über viele Wannen
+CATEGORY_COLUMNS = ["Source", "Device", "Severity", "LogFile", "IATA"]
+# Freitext-Spalten: Arrow-String mit pyarrow, sonst category (viele Klartexte wiederholen sich)
+STRING_COLUMNS = ["Klartext"]
+# IDs (fast eindeutig pro Gepäckstück): Arrow-String mit pyarrow, sonst object -
+# als category wüchse der Kategorien-Index mit den Daten
+ID_COLUMNS = ["BagID"]
+
+REF_DTYPES = {"LogOffset": "int64", "LogLength": "int32", "LogCRC": "uint32"}
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS         # zlib: gzip-Header erwarten
+GZIP_CHUNK = 256 * 1024                  # komprimierte Bytes pro Leseschritt
+GZIP_CHECKPOINT_SPACING = 4 * 1024 * 1024 # Abstand der Einstiegspunkte im entpackten Inhalt
+
+
+def line_crc(text):
+    """Prüfsumme des (gestrippten) Zeilentextes: erkennt geänderte Dateien und dient der De-Duplizierung."""
+    return zlib.crc32(text.encode('utf-8'))
+
+
+def compact_raw_df(df):
+    """
+    Wandelt ein Roh-DataFrame (Scanner, OMS, SPS) in das kompakte Schema um:
+    - CATEGORY_COLUMNS -> category
+    - STRING_COLUMNS -> Arrow-String (ohne pyarrow: category)
+    - ID_COLUMNS -> Arrow-String (ohne pyarrow: unverändert)
+    - Verweis-Spalten -> kleine Integer-Typen
+    Erst NACH der Konsolidierung aufrufen (data_processor arbeitet mit 'N/A'/pd.NA auf object-Spalten).
+    """
+    if df.empty:
+        return df
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col in STRING_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(ARROW_STRING_DTYPE if ARROW_STRING_DTYPE is not None else "category")
+    if ARROW_STRING_DTYPE is not None:
+        for col in ID_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype(ARROW_STRING_DTYPE)
+    for col, dtype in REF_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def expand_raw_df(df):
+    """Gegenstück zu compact_raw_df: category- und ID-Spalten wieder als Python-Strings (für die Konsolidierung)."""
+    categorical = {col: object for col in df.columns
+                   if isinstance(df[col].dtype, pd.CategoricalDtype) or (col in ID_COLUMNS and df[col].dtype != object)}
+    return df.astype(categorical) if categorical else df
+
+
+def concat_raw_frames(frames):
+    """
+    pd.concat für kompakte Roh-DataFrames: category-Spalten bleiben category
+    (Kategorien werden vereinigt, statt auf object zurückzufallen).
+    """
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    columns = list(dict.fromkeys(col for df in frames for col in df.columns))
+    # category-Spalten nicht durch pd.concat: eine Datei ohne einen einzigen Wert (z.B. TrayID) ist dort
+    # eine leere Kategorie, pandas 2.x warnt (FutureWarning) und der Ergebnis-dtype hängt von der Version ab
+    categorical = [col for col in columns
+                   if all(col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype) for df in frames)]
+    combined = pd.concat([df.drop(columns=categorical) for df in frames], ignore_index=True)
+    for col in categorical:
+        parts = [df[col] for df in frames]
+        try:
+            combined[col] = union_categoricals(parts)
+        except TypeError:
+            # Kategorien mit anderem dtype (z.B. eine Datei ohne einen einzigen Wert in der Spalte)
+            combined[col] = pd.concat([part.astype(object) for part in parts], ignore_index=True).astype("category")
+    return combined[columns]
+
+
+def _content_columns(df, ignore_columns=()):
+    """Spalten, die den Inhalt einer Zeile ausmachen (ohne Positions-Verweise)."""
+    return [col for col in df.columns if col not in ("LogFile", "LogOffset", "LogLength") and col not in ignore_columns]
+
+
+def drop_duplicate_rows(df):
+    """
+    Wie df.drop_duplicates(), aber bei Zeilen-Verweisen zählt der Inhalt (LogCRC), nicht die Position:
+    Dieselbe Zeile aus zwei Kopien einer Datei gilt weiterhin als Duplikat.
+    """
+    subset = _content_columns(df)
+    return df.drop_duplicates(subset=subset if len(subset) < len(df.columns) else None)
+
+
+def _row_hashes(df, columns):
+    key = df[columns].astype({col: "int64" for col in REF_DTYPES if col in columns})
+    return pd.util.hash_pandas_object(key, index=False)
+
+
+def drop_known_rows(new_df, known_df, ignore_columns=()):
+    """
+    Entfernt aus 'new_df' die Zeilen, die schon in 'known_df' enthalten sind (gleicher Inhalt wie bei
+    drop_duplicate_rows). Verglichen wird nur mit bekannten Zeilen ab dem ersten neuen Zeitstempel,
+    der Aufwand richtet sich also nach der Überlappung, nicht nach der Größe von 'known_df'.
+    'ignore_columns': Spalten, die die Konsolidierung verändert (z.B. IATA, JourneyID).
+    """
+    if new_df.empty or known_df.empty:
+        return new_df
+    columns = [col for col in _content_columns(new_df, ignore_columns) if col in known_df.columns]
+    overlap = known_df[known_df["Timestamp"] >= new_df["Timestamp"].min()]
+    if overlap.empty:
+        return new_df
+    return new_df[~_row_hashes(new_df, columns).isin(_row_hashes(overlap, columns)).to_numpy()]
+
+
+class _GzipCheckpoints:
+    """
+    Einstiegspunkte in eine .gz-Datei: (entpackter Offset, komprimierter Offset, Kopie des
+    zlib-Zustands) etwa alle GZIP_CHECKPOINT_SPACING Bytes. Ein Verweis weit hinten in der Datei
+    wird ab dem nächsten Einstiegspunkt entpackt statt ab dem Dateianfang.
+    Die Punkte entstehen beim Lesen, der erste Zugriff auf das Ende einer Datei entpackt sie also einmal ganz.
+    """
+
+    def __init__(self):
+        self.points = [(0, 0, None)]
+
+    def before(self, offset):
+        """Letzter Einstiegspunkt mit entpacktem Offset <= 'offset'."""
+        return max((point for point in self.points if point[0] <= offset), key=lambda point: point[0])
+
+    def add(self, out_pos, in_pos, decompressor):
+        if out_pos >= self.points[-1][0] + GZIP_CHECKPOINT_SPACING:
+            self.points.append((out_pos, in_pos, decompressor.copy()))
+
+
+@lru_cache(maxsize=16)
+def _gzip_checkpoints(path, size, mtime_ns):
+    """Einstiegspunkte pro Datei-Stand (eine geänderte Datei bekommt einen neuen Index)."""
+    return _GzipCheckpoints()
+
+
+class _GzipLineReader:
+    """
+    read(offset, length) im entpackten Inhalt einer .gz-Datei (auch mehrere gzip-Member hintereinander).
+    Vorwärts wird weitergelesen, rückwärts oder über einen Einstiegspunkt hinweg wird neu aufgesetzt.
+    """
+
+    def __init__(self, f, checkpoints):
+        self.f = f
+        self.checkpoints = checkpoints
+        self.decompressor = None
+
+    def _restore(self, offset):
+        out_pos, in_pos, state = self.checkpoints.before(offset)
+        self.f.seek(in_pos)
+        self.decompressor = state.copy() if state is not None else zlib.decompressobj(GZIP_WBITS)
+        self.in_pos = in_pos
+        self.buffer_start = out_pos
+        self.buffer = b""
+        self.done = False
+
+    def _feed(self):
+        chunk = self.f.read(GZIP_CHUNK)
+        if not chunk:
+            if not self.decompressor.eof:
+                raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+            self.done = True
+            return
+        self.in_pos += len(chunk)
+        parts = []
+        while chunk:
+            if self.decompressor.eof:
+                if not chunk.strip(b"\0"):
+                    break # Auffüllung hinter dem letzten Member
+                self.decompressor = zlib.decompressobj(GZIP_WBITS)
+            parts.append(self.decompressor.decompress(chunk))
+            chunk = self.decompressor.unused_data if self.decompressor.eof else b""
+        self.buffer += b"".join(parts)
+        if not self.decompressor.eof:
+            self.checkpoints.add(self.buffer_start + len(self.buffer), self.in_pos, self.decompressor)
+
+    def read(self, offset, length):
+        if (self.decompressor is None or offset < self.buffer_start
+                or self.checkpoints.before(offset)[0] > self.buffer_start + len(self.buffer)):
+            self._restore(offset)
+        while self.buffer_start + len(self.buffer) < offset + length and not self.done:
+            self._feed()
+            drop = min(offset - self.buffer_start, len(self.buffer)) # Nur ab 'offset' behalten
+            if drop > 0:
+                self.buffer = self.buffer[drop:]
+                self.buffer_start += drop
+        start = offset - self.buffer_start
+        return self.buffer[start:start + length]
+
+
+@contextmanager
+def _line_reader(path):
+    """
+    NEU (V2): read(offset, length) -> bytes für eine Quelldatei.
+    Normale Dateien per Memory-Map (nur die benötigten Seiten werden gelesen), .gz-Verweise zählen
+    im entpackten Inhalt (Aufrufer liest nach Offset sortiert).
+    NEU (V3): .gz über Einstiegspunkte (_GzipCheckpoints), die pro Datei zwischen den Aufrufen
+    erhalten bleiben - ein Detailfenster entpackt nicht mehr jedes Mal ab dem Dateianfang.
+    """
+    with open(path, 'rb') as f:
+        if path.endswith(".gz"):
+            stat = os.fstat(f.fileno())
+            yield _GzipLineReader(f, _gzip_checkpoints(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)).read
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield lambda offset, length: data[offset:offset + length]
+
+
+def read_original_logs(df):
+    """
+    Liest die Original-Zeilen für die Zeilen von 'df' aus den Quelldateien
+    (pro Datei einmal öffnen, nach Offset sortiert). GIBT ZURÜCK: Liste von Strings.
+    """
+    texts = [""] * len(df)
+    refs_by_file = defaultdict(list)
+    for pos, (path, offset, length, crc) in enumerate(zip(df["LogFile"], df["LogOffset"], df["LogLength"], df["LogCRC"])):
+        refs_by_file[path].append((int(offset), int(length), int(crc), pos))
+
+    for path, refs in refs_by_file.items():
+        try:
+            with _line_reader(path) as read:
+                for offset, length, crc, pos in sorted(refs):
+                    text = read(offset, length).decode('utf-8', errors='ignore').strip()
+                    if line_crc(text) != crc:
+                        text = f"[Original-Log geändert: {os.path.basename(path)} @ {offset}]"
+                    texts[pos] = text
+        except (OSError, ValueError, EOFError, zlib.error) as e: # ValueError: leere Datei (mmap), EOFError/zlib.error: .gz abgeschnitten/defekt
+            print(f"--- raw_schema: Original-Log nicht lesbar ({path}): {e} ---")
+            for _, _, _, pos in refs:
+                texts[pos] = f"[Original-Log nicht verfügbar: {os.path.basename(path)}]"
+    return texts
+
+
+def with_original_log(df):
+    """
+    Gibt 'df' mit einer OriginalLog-Spalte zurück. Bei Zeilen-Verweisen wird der Text
+    erst jetzt (z.B. für ein Detailfenster) aus der Datei gelesen.
+    """
+    if "OriginalLog" in df.columns or "LogOffset" not in df.columns:
+        return df
+    df = df.copy()
+    df["OriginalLog"] = read_original_logs(df)
+    return df
@@ -0,0 +1,98 @@
+# sample_logs.py
+# Synthetische Logs und Grenzfälle, gemeinsam für die Tests und benchmark_parsers.py.
+
+import random
+
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+def generate_scanner_log(path, n_lines, seed=1, start_month=3, lines_per_second=4):
+    """Schreibt ein synthetisches scanner_bag.log mit typischem Ereignis-Mix."""
+    rnd = random.Random(seed)
+    month, day, second = start_month, 1, 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for i in range(n_lines):
+            if rnd.randrange(lines_per_second) == 0:
+                second += 1
+            if second >= 86400:
+                second, day = 0, day + 1
+            if day > 28:
+                day, month = 1, month % 12 + 1
+            ts = (f"{WEEKDAYS[day % 7]} {MONTHS[month - 1]} {day:02d} "
+                  f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}.{rnd.randrange(1000000):06d}")
+            bag = f"0{rnd.randrange(1000000000):09d}"
+            iata = f"{rnd.randrange(1, 1000):04d}"
+            body = rnd.choice([
+                f'BagIoHandler::CreateNewBag bag="{bag}" @CCT{rnd.randint(1, 4)}',
+                f'BagIoHandler::AssignAlgorithms bag="{bag}" assigning eds-1.2.{rnd.randint(1, 30)}',
+                f'BagIoHandler::Associated bag="{bag}" with IATA="{iata}"',
+                f'BagIoHandler::MarkAlgoDone[eds-1.2.3] bag="{bag}"',
+                f'BagIoHandler::SetDisposition[MACHINE_THREAT] bag="{bag}" disp="{rnd.choice(["ALARM", "CLEAR"])}"',
+                f'BagIoHandler::SetDisposition[OSR] bag="{bag}" disp="CLEAR" op="operator{rnd.randint(1, 4)}"',
+                f'BagIoHandler::SetOperatorDisposition bag="{bag}" operator=operator{rnd.randint(1, 4)}, disposition={rnd.randint(0, 1)}',
+                f'BagIoHandler::Finished( bag="{bag}" )',
+                f'ImageWriter Ok:Saved IATA="{iata}"',
+                f'RfidReader RFID {iata} read at infeed',
+                f'[OMS: 12] slotDivertRfid for="{iata}"',
+                f'Heartbeat tick {i}',
+                f'Heartbeat tick {i}',
+                f'Heartbeat tick {i}',
+                f'StatusPoller polled bag="{bag}" state=idle',
+                'StatusPoller polled IATA: 12 junk',
+            ])
+            f.write(f"{ts} [thread-{rnd.randint(1, 9)}] {body}\n")
+
+def generate_oms_log(path, n_lines, seed=1):
+    """Schreibt ein synthetisches OMS.log (beide Zeitstempel-Formate, alle IATA-Schreibweisen)."""
+    rnd = random.Random(seed)
+    second = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for i in range(n_lines):
+            second += rnd.randrange(2)
+            day, rest = 1 + second // 86400, second % 86400
+            clock = f"{rest // 3600:02d}:{rest // 60 % 60:02d}:{rest % 60:02d}"
+            if rnd.randrange(2):
+                ts = f"2025-10-{day:02d} {clock}{rnd.choice(['.', ','])}{rnd.randrange(1000):03d}"
+            else:
+                ts = f"{WEEKDAYS[(day + 1) % 7]} Oct {day:02d} {clock}.{rnd.randrange(1000000):06d}"
+            bag = f"0{rnd.randrange(1000000000):09d}"
+            iata = rnd.choice([f"{rnd.randrange(10000):04d}", f"{rnd.randrange(1000):03d}", f"L{rnd.randrange(10000):04d}",
+                               f" {rnd.randrange(1000):03d} ", "NOREAD", f"{rnd.randrange(100):02d}"])
+            num = f"{rnd.randrange(1, 10000):0{rnd.choice([3, 4])}d}"
+            body = rnd.choice([
+                f'[OMS: 1]: writing to PLC diverter cmd: {rnd.randint(0, 1)} for="{iata}"',
+                f'[OMS: 2]: setFinalBagDisposition bag="{bag}" final disposition is {rnd.randint(0, 1)}',
+                f'[OMS: 3]: postOpDec IATA="{iata}" diverter cmd: {rnd.randint(0, 1)}',
+                f'[OMS: 4]: cacheBagDisposition saving disposition for "{iata}"',
+                f'[OMS: 4]: cacheBagDisposition updating disposition for "{iata}"',
+                f'[OMS: 5]: removeBagDisposition found disposition for "{iata}"',
+                f'[OMS: 6]: lookUpBagDisposition found disposition for "{iata}"',
+                f'[OMS: 6]: lookUpBagDisposition Entering tric="{iata}"',
+                f'[OMS: 7]: slotDiverterAction RFID {num} diverter action: {rnd.randint(0, 1)}',
+                f'[OMS: 8]: slotDivertRfid rfid: {num} operator descision: {rnd.randint(0, 1)}',
+                f'[OMS: 8]: slotDivertRfid IATA: {num}',
+                f'[OMS: 9]: slotAssociateExternalBagIDs for bag: {rnd.randrange(10**6)} IATA: {num} GLOBAL: {rnd.randrange(100)}',
+                f'[OMS: 10]: slotSendTricBagDispositionMsg bag="{bag}"',
+                f'[OMS: 11]: disposition for "{iata}" does not match {num}',
+                f'[OMS: 12]: RFID FOUND - RFID {num}',
+                f'[OMS: 13]: TricInterfaceMgr::slotSendFaultStatus IATA="{iata}"',
+                f'[OMS: 14]: unknown message for bag "{bag}"',
+                f'plain line IATA={iata} without quotes',
+                f'Heartbeat {i}',
+                f'Heartbeat {i}',
+            ])
+            f.write(f"{ts} {body}\n")
+
+
+# MV3D-Zeitstempel: Grenzfälle (je Liste eine Datei)
+MV3D_TIMESTAMP_EDGE_FILES = [
+    # Python-logging / log4j: nur Dezimal-Komma
+    ["2025-05-06 15:18:47,123 INFO start", "2025-05-06 15:18:48,456 ERROR fatal error occurred"],
+    ["2025-05-06 15:18:47,123 a", "kein Zeitstempel", "2025-02-30 10:00:00,5 b", "2025-05-06 24:00:00,1 c"],
+    ["Sat Feb 29 10:00:00 a", "Feb 29 10:00:00", "Sat Mar 01 24:00:00 b", "Mar 01 10:00:60.5 c",
+     "Foo Mar 01 10:00:00 d", "Sat\tMar\t1\t10:00:00,12 e", "Tue  Mar   3   03:03:03 f"],
+    # Formatwechsel und Zeitstempel mitten in der Zeile
+    ["2025-03-01T10:00:00.123Z a", "2025-03-01 10:00:00,5 b", "Sat Mar 01 10:00:00.1 c", "prefix Mar 01 10:00:00 d",
+     "2025-03-01T10:00:01Z e"],
+]
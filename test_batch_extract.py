@@ -0,0 +1,85 @@
+# test_batch_extract.py
+# Regressionstest: Batch-Modus (spaltenweise ID-Extraktion) == Zeile-für-Zeile-Modus.
+# Aufruf: python -m pytest -q test_batch_extract.py   oder   python test_batch_extract.py
+
+import os
+import tempfile
+
+import pandas as pd
+
+import log_parser
+import oms_log_parser
+from sample_logs import generate_scanner_log, generate_oms_log
+
+# Grenzfälle, die in den synthetischen Logs selten oder gar nicht vorkommen
+SCANNER_EDGE_LINES = [
+    'Sat Nov 01 06:01:27.123456 [t] BagIoHandler::Associated bag="0123456789" with IATA="L0456"',
+    'Sat Nov 01 06:01:27.223456 [t] BagIoHandler::Associated bag="0123456789" with IATA="123"',
+    'Sat Nov 01 06:01:28.123456 [t] ImageWriter Ok:Saved iata: 0789 @CCT2',
+    'Sat Nov 01 06:01:28.223456 [t] ImageWriter Ok:Saved RFID 12345',
+    'Sat Nov 01 06:01:29.123456 [t] ImageWriter Ok:Saved rfid: 456',
+    'Sat Nov 01 06:01:29.223456 [t] BagIoHandler::CreateNewBag bag="0000000001" @CCT12 İata="0111"',
+    'Sat Nov 01 06:01:30.123456 [t] BagIoHandler::Finished( bag="12345" )',
+]
+
+OMS_EDGE_LINES = [
+    '2025-10-14 12:57:30.096 [OMS: 1]: cacheBagDisposition saving disposition for " 0123 "',
+    '2025-10-14 12:57:30,096 [OMS: 1]: cacheBagDisposition saving disposition for "L12"',
+    '2025-10-14 12:57:31.000 [OMS: 2]: removeBagDisposition found disposition for "L0012"',
+    'Tue Oct 14 12:57:32.000000 [OMS: 3]: slotDivertRfid RfId 0456',
+    'Tue Oct 14 12:57:33.000000 something without any id',
+    'Tue Oct 14 12:57:34.000000 lookUpBagDisposition Entering bag="0987654321"',
+]
+
+
+def _write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _assert_same(per_line, batched):
+    assert len(per_line) > 0
+    pd.testing.assert_frame_equal(per_line, batched)
+
+
+def test_normalize_iata_series_matches_normalize_iata():
+    values = ["0123", "123", "L0123", " 456 ", "12", "12345", "ABCD", "L12", "", None, float('nan'), "0123"]
+    expected = [log_parser._normalize_iata(v if v is not None else "N/A") for v in values]
+    assert list(log_parser.normalize_iata_series(values)) == expected
+
+
+def test_scanner_batch_extract_matches_per_line():
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "scanner_bag.log")
+        generate_scanner_log(path, 20000, seed=7)
+        with open(path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write("\n".join(SCANNER_EDGE_LINES) + "\n")
+        per_line = log_parser.parse_log_file(path, block_size=64 * 1024)
+        batched = log_parser.parse_log_file(path, block_size=64 * 1024, batch_extract=True)
+        _assert_same(per_line, batched)
+
+
+def test_oms_batch_extract_matches_per_line():
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "OMS.log")
+        generate_oms_log(path, 20000, seed=7)
+        with open(path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write("\n".join(OMS_EDGE_LINES) + "\n")
+        per_line = oms_log_parser.parse_oms_log(path)
+        batched = oms_log_parser.parse_oms_log(path, batch_extract=True)
+        _assert_same(per_line, batched)
+
+
+def test_oms_batch_extract_without_ids():
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "OMS.log")
+        _write_lines(path, ['Tue Oct 14 12:57:33.000000 heartbeat'] * 10)
+        assert oms_log_parser.parse_oms_log(path, batch_extract=True).empty
+        assert oms_log_parser.parse_oms_log(path).empty
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK: {name}")
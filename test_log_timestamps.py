@@ -0,0 +1,107 @@
+# test_log_timestamps.py
+# Regressionstest: Spalten-Konvertierung (iso_series_to_datetime) == skalarer Schnellweg (parse_iso_fixed).
+# Aufruf: python -m pytest -q test_log_timestamps.py   oder   python test_log_timestamps.py
+
+import numpy as np
+import pandas as pd
+
+import mv3d_log_parser
+from log_timestamps import TimestampDecoder, iso_series_to_datetime, parse_iso_fixed
+from sample_logs import MV3D_TIMESTAMP_EDGE_FILES
+
+
+def _as_scalar(values):
+    """Erwartetes Ergebnis Wert für Wert (None -> NaT)."""
+    return [parse_iso_fixed(v) if v is not None else None for v in values]
+
+
+def _assert_matches_scalar(values):
+    converted = iso_series_to_datetime(values)
+    assert len(converted) == len(values)
+    for raw, got, expected in zip(values, converted, _as_scalar(values)):
+        if expected is None:
+            assert pd.isna(got), raw
+        else:
+            assert got == pd.Timestamp(expected), raw
+
+
+def test_all_values_with_decimal_comma():
+    # Python-logging / log4j: der erste ISO8601-Lauf liefert nur NaT (datetime64[s])
+    _assert_matches_scalar(["2025-05-06 15:18:47,123", "2025-05-06 15:18:48,456"])
+
+
+def test_decimal_comma_mixed_with_invalid_values():
+    _assert_matches_scalar(["2025-05-06 15:18:47,123", "kein Zeitstempel", "2025-02-30 10:00:00,5", None,
+                            "2025-05-06 15:18:48,456789"])
+
+
+def test_decimal_point_and_comma_mixed():
+    _assert_matches_scalar(["2025-05-06 15:18:47.123", "2025-05-06 15:18:48,456", "2025-05-06 15:18:49"])
+
+
+def test_utc_with_decimal_comma():
+    converted = iso_series_to_datetime(["2025-05-06T15:18:47,123Z"], utc=True)
+    assert converted.iloc[0] == pd.Timestamp("2025-05-06 15:18:47.123", tz="UTC")
+
+
+def test_mv3d_file_timestamps_match_per_line():
+    # FileTimestamps (Format pro Datei, spaltenweise) == _get_timestamp Zeile für Zeile
+    parser = mv3d_log_parser.MV3DLogParser()
+    for lines in MV3D_TIMESTAMP_EDGE_FILES:
+        expected = [ts for ts in map(parser._get_timestamp, lines) if ts is not None]
+        timestamps = mv3d_log_parser.FileTimestamps(parser)
+        kept = [line for line in lines if timestamps.add(line)]
+        decoded = timestamps.decode()
+        assert len(kept) == len(decoded)
+        assert np.array_equal(decoded[~np.isnat(decoded)], np.array(expected, dtype='datetime64[us]')), lines
+
+
+# Jahreswechsel, Zeitumstellung (Lücke 30.03.2025 02:xx, doppelte Stunde 26.10.2025 02:xx), ungültige Werte
+SYSLOG_EDGE_VALUES = ["Tue Dec 31 23:59:58.500000", "Tue Dec 31 23:59:59.900000", "Wed Jan 01 00:00:00.100000",
+                      "Wed Jan 01 00:00:00.200000", "kein Zeitstempel", "Sun Mar 30 01:59:59.000000",
+                      "Sun Mar 30 02:30:00.000000", "Sun Mar 30 03:00:00.000000", "Sun Oct 26 02:30:00.000000",
+                      "Sun Oct 26 03:30:00.000000", "Foo Oct 26 04:00:00.000000"]
+ISO_EDGE_VALUES = ["2025-03-30 01:59:59.999", "2025-03-30 02:30:00.123", "2025-03-30 03:00:00,096",
+                   "2025-10-26 02:30:00.000", "2025-10-26 03:30:00", "2025-02-30 10:00:00", "kein Zeitstempel"]
+
+
+def _assert_series_matches_utc_scalar(converted, expected):
+    assert len(converted) == len(expected)
+    for got, want in zip(converted, expected):
+        if want is None:
+            assert pd.isna(got)
+        else:
+            assert got == pd.Timestamp(want)
+
+
+def test_syslog_series_to_utc_matches_scalar():
+    scalar = TimestampDecoder(start_year=2024)
+    expected = [scalar.syslog_to_utc(raw) for raw in SYSLOG_EDGE_VALUES]
+    # 01.01.2025 00:00 Berlin = 31.12.2024 23:00 UTC
+    assert pd.Timestamp(expected[2]) == pd.Timestamp("2024-12-31 23:00", tz="UTC")
+    assert expected[6] is None and expected[8] is None
+    _assert_series_matches_utc_scalar(TimestampDecoder(start_year=2024).syslog_series_to_utc(SYSLOG_EDGE_VALUES),
+                                      expected)
+
+
+def test_syslog_series_to_utc_keeps_rollover_across_batches():
+    scalar = TimestampDecoder(start_year=2024)
+    expected = [scalar.syslog_to_utc(raw) for raw in SYSLOG_EDGE_VALUES]
+    decoder = TimestampDecoder(start_year=2024)
+    converted = pd.concat([decoder.syslog_series_to_utc(SYSLOG_EDGE_VALUES[:2]),
+                           decoder.syslog_series_to_utc(SYSLOG_EDGE_VALUES[2:])], ignore_index=True)
+    _assert_series_matches_utc_scalar(converted, expected)
+
+
+def test_iso_series_to_utc_matches_scalar():
+    scalar = TimestampDecoder()
+    expected = [scalar.iso_to_utc(raw) for raw in ISO_EDGE_VALUES]
+    assert expected[1] is None and expected[3] is None
+    _assert_series_matches_utc_scalar(TimestampDecoder().iso_series_to_utc(ISO_EDGE_VALUES), expected)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK: {name}")
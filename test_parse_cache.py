@@ -0,0 +1,54 @@
+# test_parse_cache.py
+# Regressionstest: zweiter Aufruf kommt aus dem Parse-Cache (Treffer gezählt, gleiches DataFrame).
+# Aufruf: python -m pytest -q test_parse_cache.py   oder   python test_parse_cache.py
+
+import os
+import tempfile
+
+import pandas as pd
+
+from parse_cache import ParseCache
+
+
+def _write_log(path):
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("Zeile 1\nZeile 2\n")
+
+
+def test_warm_run_is_a_cache_hit():
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "scanner_bag.log")
+        _write_log(path)
+        cache = ParseCache(os.path.join(work_dir, "parse_cache"))
+        parsed = []
+
+        def parse():
+            parsed.append(1)
+            return pd.DataFrame({"Timestamp": pd.to_datetime(["2025-05-06 15:18:47", "2025-05-06 15:18:48"]),
+                                 "IATA": ["0123", "N/A"], "Line": [1, 2]})
+
+        cold = cache.cached(path, "test", 1, {}, parse)
+        warm = cache.cached(path, "test", 1, {}, parse)
+        assert (cache.misses, cache.hits) == (1, 1)
+        assert len(parsed) == 1
+        pd.testing.assert_frame_equal(cold, warm)
+
+
+def test_changed_file_is_a_miss():
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "scanner_bag.log")
+        _write_log(path)
+        cache = ParseCache(os.path.join(work_dir, "parse_cache"))
+        parse = lambda: pd.DataFrame({"Line": [1, 2]})
+        cache.cached(path, "test", 1, {}, parse)
+        with open(path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write("Zeile 3\n")
+        cache.cached(path, "test", 1, {}, parse)
+        assert (cache.misses, cache.hits) == (2, 0)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"OK: {name}")
@@ -36,7 +36,8 @@ class TimespanDialog(tk.Toplevel):
         ttk.Label(info_frame, text=f"Spätester Eintrag:").grid(row=1, column=0, sticky="w")
         ttk.Label(info_frame, text=f"{end_text}").grid(row=1, column=1, sticky="w", padx=5)
         ttk.Label(info_frame, text=f"Gefundene Einträge gesamt:").grid(row=2, column=0, sticky="w")
-        ttk.Label(info_frame, text=f"{self.total_entries:,}".replace(",", ".")).grid(row=2, column=1, sticky="w", padx=5)
+        total_text = f"{self.total_entries:,}".replace(",", ".") if self.total_entries is not None else "N/A"
+        ttk.Label(info_frame, text=total_text).grid(row=2, column=1, sticky="w", padx=5)
 
         self.start_frame = ttk.Frame(main_frame); self.start_frame.pack(fill=tk.X, pady=5)
         ttk.Label(self.start_frame, text="Start:").pack(side=tk.LEFT, padx=5)